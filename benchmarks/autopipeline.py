@@ -0,0 +1,77 @@
+#!/usr/bin/python
+"""
+Measures the throughput of many concurrent callers against a local Redis
+server (or cluster, with ``--cluster``), with a connection per in-flight
+command (the default) and with the commands multiplexed over a few
+connections (``autopipeline=True``).
+"""
+import asyncio
+import time
+from argparse import ArgumentParser
+
+import yaaredis
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument('-n', type=int, default=100000,
+                        help='Total number of requests (default 100000)')
+    parser.add_argument('-c', type=int, default=1000,
+                        help='Number of concurrent callers (default 1000)')
+    parser.add_argument('--connections', type=int, default=1,
+                        help='Connections shared by the callers in '
+                             'autopipeline mode (default 1)')
+    parser.add_argument('--cluster', metavar='HOST:PORT',
+                        help='Startup node of a cluster to run against')
+    args = parser.parse_args()
+    print(args)
+    return args
+
+
+async def bench(r, num, callers):
+    async def caller(count):
+        for i in range(count):
+            await r.set(f'autopipeline:{i % 100}', i)
+            await r.get(f'autopipeline:{i % 100}')
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(num // callers // 2) for _ in range(callers)))
+    return time.perf_counter() - start
+
+
+def count_connections(pool):
+    # pylint: disable=protected-access
+    if isinstance(pool, yaaredis.ClusterConnectionPool):
+        return sum(pool._created_connections_per_node.values())
+    return pool._created_connections
+
+
+async def run():
+    args = parse_args()
+    if args.cluster:
+        host, port = args.cluster.split(':')
+        kwargs = {'host': host, 'port': int(port), 'max_connections': 2 ** 31}
+        client_class = yaaredis.StrictRedisCluster
+    else:
+        kwargs = {}
+        client_class = yaaredis.StrictRedis
+    clients = (
+        ('connection per command', client_class(**kwargs)),
+        (f'autopipeline ({args.connections} connections)',
+         client_class(autopipeline=True,
+                      autopipeline_connections=args.connections, **kwargs)),
+    )
+    for name, r in clients:
+        if args.cluster:
+            await r.connection_pool.initialize()
+        duration = await bench(r, args.n, args.c)
+        print(f'{name} - {args.n} Requests')
+        print(f'Duration  = {duration}')
+        print(f'Rate = {args.n / duration}')
+        print(f'Connections = {count_connections(r.connection_pool)}')
+        print('')
+        r.connection_pool.disconnect()
+
+
+if __name__ == '__main__':
+    asyncio.get_event_loop().run_until_complete(run())
@@ -0,0 +1,60 @@
+#!/usr/bin/python
+"""
+Measures how long it takes to pack commands into the Redis protocol.
+
+Packs single commands with ``Connection.pack_command`` and a pipeline of SETs
+with ``Connection.pack_commands``, once with the C packer of
+``yaaredis.speedups`` (when it is built) and once with the pure Python one.
+No Redis server is needed.
+"""
+import time
+from argparse import ArgumentParser
+
+from yaaredis.connection import Connection
+from yaaredis.connection import SPEEDUPS_AVAILABLE
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument('-n', type=int, default=10000,
+                        help='Number of commands (default 10000)')
+    parser.add_argument('-s', type=int, default=2,
+                        help='Data size of SET values in bytes (default 2)')
+    args = parser.parse_args()
+    print(args)
+    return args
+
+
+def timer(name, count, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    duration = time.perf_counter() - start
+    print(f'{name} - {count} Commands')
+    print(f'Duration  = {duration}')
+    print(f'Rate = {count / duration}')
+    print('')
+
+
+def pack_each(connection, commands):
+    for args in commands:
+        connection.pack_command(*args)
+
+
+def run():
+    args = parse_args()
+    value = 'a' * args.s
+    commands = [('SET', f'key:{i}', value) for i in range(args.n)]
+
+    packers = [('python', False)]
+    if SPEEDUPS_AVAILABLE:
+        packers.append(('speedups', True))
+    for name, speedups in packers:
+        connection = Connection()
+        connection._speedups_packing = speedups  # pylint: disable=protected-access
+        timer(f'{name} pack_command', args.n, pack_each, connection, commands)
+        timer(f'{name} pack_commands', args.n, connection.pack_commands,
+              commands)
+
+
+if __name__ == '__main__':
+    run()
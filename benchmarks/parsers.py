@@ -0,0 +1,101 @@
+#!/usr/bin/python
+"""
+Compares the reply parsers of ``yaaredis.connection``.
+
+``PythonParser``, ``SpeedupsParser`` (the C extension) and ``HiredisParser``
+parse canned replies from an in-memory stream, so no Redis server is needed.
+Parsers whose backend is not installed are skipped.
+"""
+import asyncio
+import time
+from argparse import ArgumentParser
+
+from yaaredis.connection import HiredisParser
+from yaaredis.connection import PythonParser
+from yaaredis.connection import SpeedupsParser
+from yaaredis.exceptions import RedisError
+
+
+class MemoryStream:
+    """Stands in for an ``asyncio.StreamReader`` over a fixed payload"""
+
+    def __init__(self, payload):
+        self._payload = payload
+        self._offset = 0
+
+    async def read(self, size):
+        data = self._payload[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+
+class FakeConnection:
+    decode_responses = False
+    encoding = 'utf-8'
+
+    def __init__(self, payload):
+        self._reader = MemoryStream(payload)
+
+
+def small_replies():
+    return b'+OK\r\n'
+
+
+def large_bulk(size=1024 * 1024):
+    return b'$%d\r\n%s\r\n' % (size, b'x' * size)
+
+
+def multi_bulk(count=1000, size=16):
+    return b'*%d\r\n' % count + b'$%d\r\n%s\r\n' % (size, b'x' * size) * count
+
+
+def nested_array(depth=64):
+    # [1, [1, [1, ...]]]
+    return b'*2\r\n:1\r\n' * depth + b':1\r\n'
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument('-n', type=int, default=10000,
+                        help='Number of replies to parse (default 10000)')
+    parser.add_argument('-r', type=int, default=65535,
+                        help='Socket read size in bytes (default 65535)')
+    args = parser.parse_args()
+    print(args)
+    return args
+
+
+async def bench(parser_class, reply, replies, read_size):
+    try:
+        parser = parser_class(read_size)
+    except RedisError:
+        return None
+    parser.on_connect(FakeConnection(reply * replies))
+    start = time.perf_counter()
+    for _ in range(replies):
+        await parser.read_response()
+    return time.perf_counter() - start
+
+
+async def run():
+    args = parse_args()
+    workloads = (
+        ('small replies', small_replies(), args.n),
+        ('1MB bulk', large_bulk(), max(args.n // 100, 1)),
+        ('1000 element multi-bulk', multi_bulk(), max(args.n // 10, 1)),
+        ('nested arrays (depth 64)', nested_array(), args.n),
+    )
+    for name, reply, replies in workloads:
+        for parser_class in (PythonParser, SpeedupsParser, HiredisParser):
+            duration = await bench(parser_class, reply, replies, args.r)
+            if duration is None:
+                print(f'{parser_class.__name__} - {name}: not available')
+                continue
+            print(f'{parser_class.__name__} - {name} - {replies} replies')
+            print(f'Duration  = {duration}')
+            print(f'Rate = {replies / duration}')
+            print('')
+
+
+if __name__ == '__main__':
+    asyncio.get_event_loop().run_until_complete(run())
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+"""
+Compares ``Connection`` (streams) with ``ProtocolConnection`` (asyncio
+protocol) against a local Redis server.
+
+Measures the latency of sequential GETs, the throughput of concurrent GETs
+spread over the connection pool and the time it takes to read the replies of
+a large pipeline.
+"""
+import asyncio
+import time
+from argparse import ArgumentParser
+
+import yaaredis
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument('-n', type=int, default=20000,
+                        help='Total number of requests (default 20000)')
+    parser.add_argument('-c', type=int, default=50,
+                        help='Number of concurrent clients (default 50)')
+    parser.add_argument('-s', type=int, default=2,
+                        help='Data size of SET/GET value in bytes (default 2)')
+    parser.add_argument('--stream-timeout', type=float, default=None,
+                        help='stream_timeout of the connections')
+    args = parser.parse_args()
+    print(args)
+    return args
+
+
+def report(name, count, duration):
+    print(f'{name} - {count} Requests')
+    print(f'Duration  = {duration}')
+    print(f'Rate = {count / duration}')
+    print(f'Latency = {duration / count * 1e6:.1f}us')
+    print('')
+
+
+async def sequential(r, num):
+    start = time.perf_counter()
+    for _ in range(num):
+        await r.get('protocol_connection:key')
+    return time.perf_counter() - start
+
+
+async def concurrent(r, num, clients):
+    async def client(count):
+        for _ in range(count):
+            await r.get('protocol_connection:key')
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(num // clients) for _ in range(clients)))
+    return time.perf_counter() - start
+
+
+async def pipeline(r, num):
+    pipe = await r.pipeline(transaction=False)
+    for _ in range(num):
+        await pipe.get('protocol_connection:key')
+    start = time.perf_counter()
+    await pipe.execute()
+    return time.perf_counter() - start
+
+
+async def run():
+    args = parse_args()
+    for connection_class in (yaaredis.Connection,
+                             yaaredis.ProtocolConnection):
+        r = yaaredis.StrictRedis(connection_class=connection_class,
+                                 stream_timeout=args.stream_timeout)
+        await r.set('protocol_connection:key', 'a' * args.s)
+        name = connection_class.__name__
+        report(f'{name} sequential GET', args.n,
+               await sequential(r, args.n))
+        report(f'{name} concurrent GET ({args.c} clients)', args.n,
+               await concurrent(r, args.n, args.c))
+        report(f'{name} pipelined GET', args.n, await pipeline(r, args.n))
+        r.connection_pool.disconnect()
+
+
+if __name__ == '__main__':
+    asyncio.get_event_loop().run_until_complete(run())
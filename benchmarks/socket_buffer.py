@@ -0,0 +1,148 @@
+#!/usr/bin/python
+"""
+Microbenchmark of the pure Python parser's read buffer.
+
+Compares ``yaaredis.connection.SocketBuffer`` against the previous
+``BytesIO``-backed implementation by reading canned MGET/LRANGE style replies
+from an in-memory stream through the buffers' ``readline()``/``read()``
+interface, so no Redis server is needed.
+"""
+import asyncio
+import time
+from argparse import ArgumentParser
+from io import BytesIO
+
+from yaaredis.connection import ConnectionError  # pylint: disable=redefined-builtin
+from yaaredis.connection import SocketBuffer
+from yaaredis.connection import SYM_CRLF
+
+
+class BytesIOSocketBuffer:
+    """The ``BytesIO``-backed buffer which ``SocketBuffer`` replaced"""
+
+    def __init__(self, stream_reader, read_size):
+        self._stream = stream_reader
+        self.read_size = read_size
+        self._buffer = BytesIO()
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    @property
+    def length(self):
+        return self.bytes_written - self.bytes_read
+
+    async def _read_from_socket(self, length=None):
+        buf = self._buffer
+        buf.seek(self.bytes_written)
+        marker = 0
+        while True:
+            data = await self._stream.read(self.read_size)
+            if not data:
+                raise ConnectionError('Socket closed on remote end')
+            buf.write(data)
+            self.bytes_written += len(data)
+            marker += len(data)
+            if length is not None and length > marker:
+                continue
+            break
+
+    async def read(self, length):
+        length = length + 2
+        if length > self.length:
+            await self._read_from_socket(length - self.length)
+        self._buffer.seek(self.bytes_read)
+        data = self._buffer.read(length)
+        self.bytes_read += len(data)
+        if self.bytes_read == self.bytes_written:
+            self.purge()
+        return data[:-2]
+
+    async def readline(self):
+        buf = self._buffer
+        buf.seek(self.bytes_read)
+        data = buf.readline()
+        while not data.endswith(SYM_CRLF):
+            await self._read_from_socket()
+            buf.seek(self.bytes_read)
+            data = buf.readline()
+        self.bytes_read += len(data)
+        if self.bytes_read == self.bytes_written:
+            self.purge()
+        return data[:-2]
+
+    def purge(self):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    def close(self):
+        self.purge()
+        self._buffer.close()
+
+
+class MemoryStream:
+    """Stands in for an ``asyncio.StreamReader`` over a fixed payload"""
+
+    def __init__(self, payload):
+        self._payload = payload
+        self._offset = 0
+
+    async def read(self, size):
+        data = self._payload[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+
+def multi_bulk(count, size):
+    value = b'x' * size
+    item = b'$%d\r\n%s\r\n' % (size, value)
+    return b'*%d\r\n' % count + item * count
+
+
+def parse_args():
+    parser = ArgumentParser()
+    parser.add_argument('-n', type=int, default=1000,
+                        help='Number of replies to parse (default 1000)')
+    parser.add_argument('-c', type=int, default=100,
+                        help='Elements per multi-bulk reply (default 100)')
+    parser.add_argument('-s', type=int, default=64,
+                        help='Size of each element in bytes (default 64)')
+    parser.add_argument('-r', type=int, default=65535,
+                        help='Socket read size in bytes (default 65535)')
+    args = parser.parse_args()
+    print(args)
+    return args
+
+
+async def read_reply(buffer):
+    line = await buffer.readline()
+    byte, line = line[:1], line[1:]
+    if byte == b'$':
+        return await buffer.read(int(line))
+    if byte == b'*':
+        return [await read_reply(buffer) for _ in range(int(line))]
+    return line
+
+
+async def bench(buffer_class, payload, replies, read_size):
+    buffer = buffer_class(MemoryStream(payload * replies), read_size)
+    start = time.perf_counter()
+    for _ in range(replies):
+        await read_reply(buffer)
+    return time.perf_counter() - start
+
+
+async def run():
+    args = parse_args()
+    payload = multi_bulk(args.c, args.s)
+    for buffer_class in (BytesIOSocketBuffer, SocketBuffer):
+        duration = await bench(buffer_class, payload, args.n, args.r)
+        print(f'{buffer_class.__name__} - {args.n} replies')
+        print(f'Duration  = {duration}')
+        print(f'Rate = {args.n / duration}')
+        print('')
+
+
+if __name__ == '__main__':
+    asyncio.get_event_loop().run_until_complete(run())
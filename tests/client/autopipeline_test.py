@@ -0,0 +1,114 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+import yaaredis
+from yaaredis.autopipeline import is_multiplexable
+from yaaredis.exceptions import ConnectionError  # pylint: disable=redefined-builtin
+from yaaredis.exceptions import ResponseError
+
+
+@pytest.fixture()
+def ar(event_loop):
+    client = yaaredis.StrictRedis(loop=event_loop, autopipeline=True)
+    yield client
+    client.close()
+
+
+def test_is_multiplexable():
+    assert is_multiplexable(('GET', 'a'))
+    assert is_multiplexable(('XREAD', 'STREAMS', 's', '0'))
+    assert not is_multiplexable(('BLPOP', 'a', 0))
+    assert not is_multiplexable(('WATCH', 'a'))
+    assert not is_multiplexable(('XREAD', 'BLOCK', 0, 'STREAMS', 's', '0'))
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_concurrent_commands_share_one_write(ar):
+    await ar.set('a', 0)
+    connection = ar._autopipeline._connections[0].connection
+    writes = []
+    send_packed_command = connection.send_packed_command
+
+    async def counting_send_packed_command(command):
+        writes.append(command)
+        await send_packed_command(command)
+
+    connection.send_packed_command = counting_send_packed_command
+    results = await asyncio.gather(*(ar.incr('a') for _ in range(100)))
+    assert results == list(range(1, 101))
+    assert len(writes) == 1
+    assert ar.connection_pool._created_connections == 1
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_error_reply_goes_to_its_caller(ar):
+    await ar.set('a', 'foo')
+    results = await asyncio.gather(ar.get('a'), ar.hget('a', 'b'),
+                                   ar.get('a'), return_exceptions=True)
+    assert results[0] == results[2] == b'foo'
+    assert isinstance(results[1], ResponseError)
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_blocking_command_uses_dedicated_connection(ar):
+    await ar.delete('list')
+    blpop = asyncio.ensure_future(ar.blpop('list', timeout=1))
+    await asyncio.sleep(0.05)
+    assert await ar.rpush('list', 'a') == 1
+    assert await blpop == (b'list', b'a')
+    assert ar.connection_pool._created_connections == 2
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_cancelled_caller_does_not_desync(ar):
+    await ar.set('a', 'foo')
+    await ar.set('b', 'bar')
+    get_a = asyncio.ensure_future(ar.get('a'))
+    get_b = asyncio.ensure_future(ar.get('b'))
+    await asyncio.sleep(0)
+    get_a.cancel()
+    assert await get_b == b'bar'
+    assert await ar.get('a') == b'foo'
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_connection_loss_retries_in_flight_commands(ar):
+    await ar.set('a', 'foo')
+    connection = ar._autopipeline._connections[0].connection
+    in_flight = asyncio.ensure_future(ar.execute_command('DEBUG', 'SLEEP', 0.1))
+    await asyncio.sleep(0.01)
+    connection._writer.transport.abort()
+    # the shared connection reconnects and the command is sent again
+    assert await in_flight == b'OK'
+    assert await ar.get('a') == b'foo'
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_connection_loss_during_run(ar):
+    await ar.set('a', 0)
+    connection = ar._autopipeline._connections[0].connection
+    # the increments are in flight behind the sleep when the connection dies
+    sleep = asyncio.ensure_future(ar.execute_command('DEBUG', 'SLEEP', 0.1))
+    incrs = [asyncio.ensure_future(ar.incr('a')) for _ in range(100)]
+    await asyncio.sleep(0.01)
+    assert ar._autopipeline._connections[0].in_flight == 101
+    connection._writer.transport.abort()
+    assert await sleep == b'OK'
+    results = await asyncio.gather(*incrs)
+    assert len(set(results)) == 100
+    assert int(await ar.get('a')) >= 100
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_connection_loss_is_retried_once(ar):
+    await ar.set('a', 'foo')
+    connection = ar._autopipeline._connections[0].connection
+
+    async def failing_send_packed_command(command):
+        raise ConnectionError('lost')
+
+    connection.send_packed_command = failing_send_packed_command
+    with pytest.raises(ConnectionError):
+        await ar.get('a')
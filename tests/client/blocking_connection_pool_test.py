@@ -109,3 +109,36 @@ async def test_connection_idle_check():
 
     new_conn = await rs.connection_pool.get_connection()
     assert conn != new_conn
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_warm_up_opens_min_connections():
+    pool = yaaredis.BlockingConnectionPool(min_connections=3,
+                                           max_connections=5)
+    await pool.warm_up()
+    assert len(pool._idle_connections) == 3
+    assert all(conn.is_connected for conn in pool._idle_connections)
+    pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_stats_record_wait_time():
+    pool = get_pool(max_connections=1, timeout=0.05)
+    events = []
+    pool.register_stats_callback(
+        lambda event, node_name, value: events.append(event))
+    c1 = await pool.get_connection()
+    with pytest.raises(ConnectionError):
+        await pool.get_connection()
+
+    asyncio.get_event_loop().call_later(0.02, pool.release, c1)
+    assert await pool.get_connection() is c1
+
+    stats = pool.stats()
+    assert stats['in_use'] == 1
+    assert stats['checkouts'] == 2
+    assert stats['waits'] == 2
+    assert stats['timeouts'] == 1
+    assert stats['max_wait_time'] >= 0.05
+    assert stats['wait_time'] >= 0.07
+    assert events == ['created', 'checkout', 'timeout', 'checkout']
@@ -415,7 +415,9 @@ class TestRedisCommands:
         await r.flushdb()
         assert not await r.exists('a')
         await r.set('a', 'foo')
-        assert await r.exists('a')
+        assert await r.exists('a') is True
+        await r.set('b', 'bar')
+        assert await r.exists('a', 'b', 'c', 'a') == 3
 
     @pytest.mark.asyncio(forbid_global_loop=True)
     async def test_expire(self, r):
@@ -1,6 +1,7 @@
 # pylint: disable=protected-access
 import asyncio
 import os
+import time
 
 import pytest
 
@@ -93,3 +94,123 @@ async def test_connection_idle_check():
     assert len(rs.connection_pool._in_use_connections) == 0
     assert last_active_at == conn.last_active_at
     assert conn._writer is None and conn._reader is None
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_idle_connections_share_one_reaper():
+    pool = yaaredis.ConnectionPool(max_idle_time=0.2, idle_check_interval=0.1)
+    connections = [await pool.get_connection() for _ in range(3)]
+    for connection in connections:
+        pool.release(connection)
+    reaper = pool._idle_reaper
+    assert reaper is not None
+
+    await asyncio.sleep(0.1)
+    # using a connection moves it to the end of the idle list
+    conn = await pool.get_connection()
+    conn.last_active_at = time.time()
+    pool.release(conn)
+    assert pool._idle_reaper is reaper
+
+    await asyncio.sleep(0.2)
+    assert pool._available_connections == [conn]
+    assert pool._created_connections == 1
+
+    await asyncio.sleep(0.2)
+    assert not pool._available_connections
+    assert pool._created_connections == 0
+    assert reaper.done()
+    assert pool._idle_reaper is None
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_reset_stops_idle_reaper():
+    pool = yaaredis.ConnectionPool(max_idle_time=0.2, idle_check_interval=0.1)
+    pool.release(await pool.get_connection())
+    reaper = pool._idle_reaper
+    assert reaper is not None
+
+    pool.disconnect()
+    pool.reset()
+    await asyncio.sleep(0)
+    assert reaper.cancelled()
+    assert pool._idle_reaper is None
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_warm_up_opens_min_connections():
+    pool = yaaredis.ConnectionPool(min_connections=3)
+    await pool.warm_up()
+    assert pool._created_connections == 3
+    assert len(pool._available_connections) == 3
+    assert not pool._in_use_connections
+    assert all(conn.is_connected for conn in pool._available_connections)
+
+    # warming up an already warm pool does not open more connections
+    await pool.warm_up()
+    assert pool._created_connections == 3
+    pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_warm_up_releases_connections_on_error():
+    pool = yaaredis.ConnectionPool(min_connections=3)
+    get_connection = pool.get_connection
+    checked_out = []
+
+    async def failing_get_connection():
+        if len(checked_out) == 2:
+            raise ConnectionError('Too many connections')
+        checked_out.append(await get_connection())
+        return checked_out[-1]
+
+    pool.get_connection = failing_get_connection
+    with pytest.raises(ConnectionError):
+        await pool.warm_up()
+    assert not pool._in_use_connections
+    assert pool._available_connections == checked_out
+    pool.disconnect()
+
+
+def test_min_connections_over_max_connections():
+    with pytest.raises(ValueError):
+        yaaredis.ConnectionPool(max_connections=2, min_connections=3)
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_idle_reaper_keeps_min_connections():
+    pool = yaaredis.ConnectionPool(min_connections=2, max_idle_time=0.1,
+                                   idle_check_interval=0.05)
+    connections = [await pool.get_connection() for _ in range(3)]
+    for connection in connections:
+        pool.release(connection)
+
+    await asyncio.sleep(0.3)
+    assert pool._available_connections == connections[1:]
+    assert pool._created_connections == 2
+    assert pool._idle_reaper is None
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_stats():
+    pool = get_pool()
+    events = []
+    pool.register_stats_callback(
+        lambda event, node_name, value: events.append((event, node_name, value)))
+    c1 = await pool.get_connection()
+    c2 = await pool.get_connection()
+    pool.release(c1)
+    c2.awaiting_response = True
+    c2.disconnect = lambda: None
+    pool.release(c2)
+
+    stats = pool.stats()
+    assert stats['in_use'] == 0
+    assert stats['idle'] == 1
+    assert stats['created'] == 2
+    assert stats['discarded'] == 1
+    assert stats['checkouts'] == 2
+    assert stats['waits'] == 0
+    assert events == [('created', None, 1), ('checkout', None, 0.0),
+                      ('created', None, 1), ('checkout', None, 0.0),
+                      ('discarded', None, 1)]
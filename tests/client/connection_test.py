@@ -1,10 +1,28 @@
 # pylint: disable=protected-access
+import asyncio
 import socket
 import sys
 
 import pytest
 
 from yaaredis import Connection
+from yaaredis import ConnectionError  # pylint: disable=redefined-builtin
+from yaaredis import ConnectionPool
+from yaaredis import InvalidResponse
+from yaaredis import ProtocolConnection
+from yaaredis import ResponseError
+from yaaredis import StrictRedis
+from yaaredis import TimeoutError  # pylint: disable=redefined-builtin
+from yaaredis.connection import HIREDIS_AVAILABLE
+from yaaredis.connection import HiredisParser
+from yaaredis.connection import PythonParser
+from yaaredis.connection import SocketBuffer
+from yaaredis.connection import SPEEDUPS_AVAILABLE
+from yaaredis.connection import SpeedupsParser
+from yaaredis import utils
+from yaaredis.protocol import PythonReader
+from yaaredis.protocol import RedisProtocol
+from yaaredis.utils import Token
 
 
 @pytest.mark.asyncio(forbid_global_loop=True)
@@ -21,6 +39,190 @@ async def test_connect_tcp(event_loop):
     assert (conn._reader is None) and (conn._writer is None)
 
 
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_protocol_connection(event_loop):
+    conn = ProtocolConnection(loop=event_loop)
+    await conn.send_packed_command(conn.pack_commands([
+        ('SET', 'a', 1), ('INCR', 'a'), ('HGET', 'a', 'b')]))
+    assert await conn.read_response() == b'OK'
+    assert await conn.read_response() == 2
+    with pytest.raises(ResponseError):
+        await conn.read_response()
+    assert conn.is_connected
+    conn.disconnect()
+    assert not conn.is_connected
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_protocol_connection_closed_by_server(event_loop):
+    conn = ProtocolConnection(loop=event_loop)
+    await conn.send_command('QUIT')
+    assert await conn.read_response() == b'OK'
+    with pytest.raises(ConnectionError):
+        await conn.read_response()
+    conn.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_strict_redis_connection_class(event_loop):
+    r = StrictRedis(loop=event_loop, connection_class=ProtocolConnection)
+    assert r.connection_pool.connection_class is ProtocolConnection
+    await r.set('a', 'foo')
+    assert await r.get('a') == b'foo'
+    r.connection_pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_handshake_is_sent_in_one_write(event_loop):
+    conn = Connection(db=9, client_name='handshake', loop=event_loop)
+    writes = []
+    send_packed_command = conn.send_packed_command
+
+    async def counting_send_packed_command(command):
+        writes.append(command)
+        await send_packed_command(command)
+
+    conn.send_packed_command = counting_send_packed_command
+    await conn.connect()
+    assert len(writes) == 1
+    await conn.send_command('CLIENT GETNAME')
+    assert await conn.read_response() == b'handshake'
+    conn.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_handshake_failure(event_loop):
+    conn = Connection(db=100000, client_name='handshake', loop=event_loop)
+    with pytest.raises(ConnectionError) as excinfo:
+        await conn.connect()
+    assert isinstance(excinfo.value.__cause__, ResponseError)
+    conn.disconnect()
+
+
+async def kill_clients_named(name, event_loop):
+    r = StrictRedis(loop=event_loop)
+    for client in await r.client_list():
+        if client['name'] == name:
+            await r.client_kill(client['addr'])
+    r.connection_pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+@pytest.mark.parametrize('connection_class', [Connection, ProtocolConnection])
+async def test_health_check_reconnects_idle_connection(event_loop, connection_class):
+    r = StrictRedis(loop=event_loop, connection_class=connection_class,
+                    client_name='health-check', health_check_interval=0.05)
+    await r.set('a', 'foo')
+    await kill_clients_named('health-check', event_loop)
+    await asyncio.sleep(0.1)
+    assert await r.get('a') == b'foo'
+    assert r.connection_pool._created_connections == 1
+    r.connection_pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_health_check_not_due(event_loop):
+    r = StrictRedis(loop=event_loop, client_name='health-check',
+                    health_check_interval=10)
+    await r.set('a', 'foo')
+    await kill_clients_named('health-check', event_loop)
+    await asyncio.sleep(0.01)
+    with pytest.raises(ConnectionError):
+        await r.get('a')
+    r.connection_pool.disconnect()
+
+
+def test_python_reader_resumes_across_chunks():
+    reader = PythonReader()
+    payload = b'*2\r\n$3\r\nfoo\r\n-ERR bad\r\n'
+    for i in range(len(payload) - 1):
+        reader.feed(payload[i:i + 1])
+        assert reader.gets() is False
+    reader.feed(payload[-1:])
+    reply = reader.gets()
+    assert reply[0] == b'foo'
+    assert isinstance(reply[1], ResponseError)
+    assert reply[1].args == ('ERR bad',)
+    assert reader.gets() is False
+
+
+@pytest.mark.parametrize('payload', [
+    b'*2\r\n$3\r\nfoo\r\n$x\r\n',
+    b'*2\r\n:1\r\n!oops\r\n',
+])
+def test_python_reader_recovers_from_malformed_reply(payload):
+    reader = PythonReader()
+    reader.feed(payload)
+    with pytest.raises(InvalidResponse):
+        reader.gets()
+    reader.feed(b'+OK\r\n')
+    assert reader.gets() == b'OK'
+    assert reader.gets() is False
+
+
+class FakeTransport:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize('payload, exception_class', [
+    (b'$x\r\n', InvalidResponse),
+    (b'$2\r\n\xff\xfe\r\n', UnicodeDecodeError),
+])
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_protocol_fails_reads_on_malformed_reply(payload, exception_class):
+    protocol = RedisProtocol()
+    protocol.reader = PythonReader(encoding='utf-8')
+    protocol.connection_made(FakeTransport())
+    read = asyncio.ensure_future(protocol.read_reply())
+    await asyncio.sleep(0)
+    protocol.data_received(payload)
+    with pytest.raises(exception_class):
+        await read
+    assert protocol.transport.closed
+
+
+@pytest.mark.skipif(not SPEEDUPS_AVAILABLE, reason='C extension is not built')
+def test_speedups_reader_recovers_from_decode_error():
+    from yaaredis.speedups import Reader  # pylint: disable=import-outside-toplevel,no-name-in-module
+    reader = Reader(encoding='utf-8')
+    reader.feed(b'*3\r\n$3\r\nfoo\r\n$2\r\n\xff\xfe\r\n')
+    with pytest.raises(UnicodeDecodeError):
+        reader.gets()
+    reader.feed(b'*1\r\n$3\r\nbar\r\n')
+    assert reader.gets() == ['bar']
+    assert reader.gets() is False
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_read_response_timeout(event_loop):
+    conn = Connection(loop=event_loop, stream_timeout=0.1)
+    await conn.send_command('BLPOP', 'nonexistent-list', 1)
+    with pytest.raises(TimeoutError):
+        await conn.read_response()
+    assert not conn.is_connected
+    # the cancellation used to interrupt the read does not leak out
+    await asyncio.sleep(0)
+    await conn.send_command('PING')
+    assert await conn.read_response() == b'PONG'
+    conn.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_read_response_deadline_moves_with_each_read(event_loop):
+    conn = Connection(loop=event_loop, stream_timeout=0.4)
+    for _ in range(5):
+        await conn.send_command('BLPOP', 'nonexistent-list', 0.1)
+        assert await conn.read_response() is None
+    # consecutive reads share one timer
+    assert conn._deadline_handle is not None
+    conn.disconnect()
+    assert conn._deadline_handle is None
+
+
 @pytest.mark.asyncio(forbid_global_loop=True)
 @pytest.mark.xfail(sys.platform == 'darwin',
                    reason='OSX does not support TCP_KEEP* properties')
@@ -79,3 +281,140 @@ async def test_connect_tcp_wrong_socket_opt_raises(event_loop, option):
 #     assert (conn._reader is not None) and (conn._writer is not None)
 #     conn.disconnect()
 #     assert (conn._reader is None) and (conn._writer is None)
+
+
+class ChunkedStream:
+    def __init__(self, chunks):
+        self._chunks = list(chunks)
+
+    async def read(self, _size):
+        return self._chunks.pop(0) if self._chunks else b''
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_socket_buffer_reads_across_chunks():
+    buf = SocketBuffer(ChunkedStream([b'+OK\r', b'\n$5\r\nhel', b'lo\r\n:1\r\n']), 4)
+    assert await buf.readline() == b'+OK'
+    assert await buf.readline() == b'$5'
+    assert await buf.read(5) == b'hello'
+    assert await buf.readline() == b':1'
+    assert buf.length == 0
+    with pytest.raises(ConnectionError):
+        await buf.readline()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_socket_buffer_large_payload():
+    payload = b'x' * (SocketBuffer.MEMORYVIEW_THRESHOLD * 4)
+    chunks = [b'$%d\r\n' % len(payload), payload[:1000], payload[1000:] + b'\r\n']
+    buf = SocketBuffer(ChunkedStream(chunks), 1000)
+    assert await buf.readline() == b'$%d' % len(payload)
+    data = await buf.read(len(payload))
+    assert data == payload
+    assert isinstance(data, bytes)
+
+
+class FakeConnection:
+    decode_responses = False
+    encoding = 'utf-8'
+
+    def __init__(self, stream):
+        self._reader = stream
+
+
+@pytest.mark.parametrize('parser_class', [
+    PythonParser,
+    pytest.param(SpeedupsParser, marks=pytest.mark.skipif(
+        not SPEEDUPS_AVAILABLE, reason='C extension is not built')),
+    pytest.param(HiredisParser, marks=pytest.mark.skipif(
+        not HIREDIS_AVAILABLE, reason='hiredis is not installed')),
+])
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_parser_resumes_nested_reply_across_chunks(parser_class):
+    reply = (b'*3\r\n:1\r\n*2\r\n$3\r\nfoo\r\n-ERR bad\r\n*0\r\n'
+             b'+OK\r\n')
+    parser = parser_class(2)
+    parser.on_connect(FakeConnection(
+        ChunkedStream(reply[i:i + 2] for i in range(0, len(reply), 2))))
+    response = await parser.read_response()
+    assert response[0] == 1
+    assert response[1][0] == b'foo'
+    assert isinstance(response[1][1], ResponseError)
+    assert response[2] == []
+    assert await parser.read_response() == b'OK'
+
+
+@pytest.mark.parametrize('parser_class', [
+    PythonParser,
+    pytest.param(SpeedupsParser, marks=pytest.mark.skipif(
+        not SPEEDUPS_AVAILABLE, reason='C extension is not built')),
+])
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_parser_large_multi_bulk(event_loop, parser_class):
+    pool = ConnectionPool(parser_class=parser_class, loop=event_loop)
+    r = StrictRedis(connection_pool=pool)
+    await r.delete('a')
+    await r.rpush('a', *range(20000))
+    assert await r.lrange('a', 0, -1) == [str(i).encode() for i in range(20000)]
+    connection = await pool.get_connection()
+    assert isinstance(connection._parser, parser_class)
+    pool.release(connection)
+    pool.disconnect()
+
+
+class StrToken:
+    def __str__(self):
+        return 'tøken'
+
+
+PACK_COMMANDS = [
+    ('SET', 'foo', 'bar'),
+    ('CONFIG GET', 'maxmemory'),
+    ('SET', b'key', 1, 1.5, True, -2 ** 70, 'ünïcode', StrToken()),
+    ('SET', 'foo', 'bar', Token.get_token('EX'), 10),
+    ('SET', 'big', b'x' * 10000, 'y' * 7000),
+]
+
+
+@pytest.mark.skipif(not SPEEDUPS_AVAILABLE, reason='C extension is not built')
+@pytest.mark.parametrize('encoding', ['utf-8', 'latin-1'])
+def test_speedups_packer_matches_python_packer(encoding):
+    conn = Connection(encoding=encoding)
+    python_conn = Connection(encoding=encoding)
+    python_conn._speedups_packing = False
+    for args in PACK_COMMANDS:
+        assert (b''.join(conn.pack_command(*args))
+                == b''.join(python_conn.pack_command(*args)))
+    assert (b''.join(conn.pack_commands(PACK_COMMANDS))
+            == b''.join(python_conn.pack_commands(PACK_COMMANDS)))
+    assert all(isinstance(chunk, bytes)
+               for chunk in conn.pack_commands(PACK_COMMANDS))
+
+
+def test_python_pack_commands_matches_pack_command():
+    conn = Connection()
+    conn._speedups_packing = False
+    packed = conn.pack_commands(PACK_COMMANDS)
+    assert b''.join(packed) == b''.join(
+        b''.join(conn.pack_command(*args)) for args in PACK_COMMANDS)
+    # large values are not copied into the shared buffer
+    assert PACK_COMMANDS[-1][2] in packed
+
+
+def test_python_packer_writes_tokens():
+    conn = Connection()
+    conn._speedups_packing = False
+    assert conn.pack_command('SET', 'foo', 'bar', Token.get_token('EX'), 10) == [
+        b'*5\r\n$3\r\nSET\r\n$3\r\nfoo\r\n$3\r\nbar\r\n$2\r\nEX\r\n$2\r\n10\r\n']
+
+
+def test_python_packer_caches_headers_of_any_arity():
+    conn = Connection()
+    conn._speedups_packing = False
+    for nargs in range(1, utils.COMMAND_HEADER_CACHE_SIZE + 10):
+        assert conn.pack_command('MGET', *range(nargs))[0].startswith(
+            b'*%d\r\n$4\r\nMGET\r\n' % (nargs + 1))
+    # the calls with new arities did not fill the cache for the other commands
+    assert conn.pack_command('HGET', 'foo', 'bar') == [
+        b'*3\r\n$4\r\nHGET\r\n$3\r\nfoo\r\n$3\r\nbar\r\n']
+    assert 'HGET' in utils._command_words
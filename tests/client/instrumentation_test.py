@@ -0,0 +1,108 @@
+import pytest
+
+import yaaredis
+from yaaredis.exceptions import ResponseError
+from yaaredis.instrumentation import Histogram
+from yaaredis.instrumentation import HistogramCollector
+from yaaredis.instrumentation import Instrumentation
+
+
+class RecordingInstrumentation(Instrumentation):
+
+    def __init__(self):
+        self.records = []
+
+    def command_completed(self, record):
+        self.records.append(record)
+
+
+def test_histogram_percentiles():
+    histogram = Histogram()
+    for i in range(1, 1001):
+        histogram.add(i / 1000)
+    assert histogram.count == 1000
+    assert histogram.max == 1.0
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=0.01)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=0.01)
+    assert histogram.percentile(99.9) == pytest.approx(0.999, rel=0.01)
+    assert histogram.percentile(100) == 1.0
+    assert Histogram().percentile(50) is None
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_commands_are_recorded(event_loop):
+    instrumentation = RecordingInstrumentation()
+    r = yaaredis.StrictRedis(host='127.0.0.1', loop=event_loop,
+                             instrumentation=instrumentation)
+    await r.set('a', 'foo')
+    with pytest.raises(ResponseError):
+        await r.hget('a', 'b')
+
+    assert len(instrumentation.records) == 2
+    set_record = instrumentation.records[0]
+    hget_record = instrumentation.records[1]
+    assert set_record.command == 'SET'
+    assert set_record.node == '127.0.0.1:6379'
+    assert set_record.error is None
+    assert set_record.bytes_sent == len(b'*3\r\n$3\r\nSET\r\n$1\r\na\r\n$3\r\nfoo\r\n')
+    assert set_record.bytes_received == len(b'+OK\r\n')
+    assert (set_record.started_at <= set_record.sent_at
+            <= set_record.first_byte_at <= set_record.finished_at)
+    assert 0 < set_record.time_to_first_byte <= set_record.latency
+    assert hget_record.command == 'HGET'
+    assert isinstance(hget_record.error, ResponseError)
+    r.connection_pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_pipeline_is_recorded_once(event_loop):
+    instrumentation = RecordingInstrumentation()
+    r = yaaredis.StrictRedis(host='127.0.0.1', loop=event_loop,
+                             instrumentation=instrumentation)
+    async with await r.pipeline(transaction=False) as pipe:
+        await pipe.set('a', 1)
+        await pipe.get('a')
+    async with await r.pipeline() as pipe:
+        await pipe.incr('a')
+
+    assert [record.command for record in instrumentation.records] == [
+        'PIPELINE', 'TRANSACTION']
+    pipeline_record = instrumentation.records[0]
+    assert pipeline_record.node == '127.0.0.1:6379'
+    assert pipeline_record.bytes_received == len(b'+OK\r\n$1\r\n1\r\n')
+    r.connection_pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_protocol_connection_traffic(event_loop):
+    instrumentation = RecordingInstrumentation()
+    r = yaaredis.StrictRedis(host='127.0.0.1', loop=event_loop,
+                             connection_class=yaaredis.ProtocolConnection,
+                             instrumentation=instrumentation)
+    await r.set('a', 'foo')
+    assert await r.get('a') == b'foo'
+    get_record = instrumentation.records[1]
+    assert get_record.bytes_received == len(b'$3\r\nfoo\r\n')
+    assert get_record.time_to_first_byte > 0
+    r.connection_pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_histogram_collector(event_loop):
+    collector = HistogramCollector()
+    r = yaaredis.StrictRedis(host='127.0.0.1', loop=event_loop,
+                             instrumentation=collector)
+    await r.set('a', 'foo')
+    for _ in range(100):
+        await r.get('a')
+
+    stats = collector.snapshot()
+    assert set(stats) == {('SET', '127.0.0.1:6379'), ('GET', '127.0.0.1:6379')}
+    get_stats = stats[('GET', '127.0.0.1:6379')]
+    assert get_stats['count'] == 100
+    assert get_stats['errors'] == 0
+    assert 0 < get_stats['p50'] <= get_stats['p99'] <= get_stats['p999'] <= get_stats['max']
+    assert get_stats['bytes_received'] == 100 * len(b'$3\r\nfoo\r\n')
+    collector.reset()
+    assert not collector.snapshot()
+    r.connection_pool.disconnect()
@@ -0,0 +1,42 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from yaaredis import StrictRedisCluster
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_one_connection_per_node():
+    r = StrictRedisCluster(host='127.0.0.1', port=7000, autopipeline=True)
+    await r.connection_pool.initialize()
+    keys = [f'autopipeline:{i}' for i in range(100)]
+    assert all(await asyncio.gather(*(r.set(key, key) for key in keys)))
+    assert await asyncio.gather(*(r.get(key) for key in keys)) == [
+        key.encode() for key in keys]
+
+    pool = r.connection_pool
+    masters = {pool.get_master_node_by_slot(pool.nodes.keyslot(key))['name']
+               for key in keys}
+    assert set(r._autopipeline._nodes) == masters
+    assert all(count == 1
+               for count in pool._created_connections_per_node.values())
+    r.close()
+
+
+@pytest.mark.asyncio
+async def test_moved_redirection():
+    r = StrictRedisCluster(host='127.0.0.1', port=7000, autopipeline=True)
+    await r.set('foo', 'bar')
+
+    nodes = r.connection_pool.nodes
+    slot = nodes.keyslot('foo')
+    owner = nodes.slots[slot][0]
+    other = next(node for node in nodes.all_masters()
+                 if node['name'] != owner['name'])
+    nodes.move_slot(slot, other)
+
+    results = await asyncio.gather(*(r.get('foo') for _ in range(10)))
+    assert results == [b'bar'] * 10
+    assert nodes.slots[slot][0]['name'] == owner['name']
+    r.close()
@@ -0,0 +1,145 @@
+# pylint: disable=protected-access
+import asyncio
+
+import pytest
+
+from yaaredis import StrictRedisCluster
+from yaaredis.connection import ClusterConnection
+from yaaredis.exceptions import ConnectionError  # pylint: disable=redefined-builtin
+from yaaredis.pool import BlockingClusterConnectionPool
+
+
+NODE_7000 = {'host': '127.0.0.1', 'port': 7000}
+NODE_7001 = {'host': '127.0.0.1', 'port': 7001}
+
+
+def get_pool(max_connections=None, max_connections_per_node=False, timeout=20):
+    return BlockingClusterConnectionPool(
+        startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+        connection_class=ClusterConnection,
+        max_connections=max_connections,
+        max_connections_per_node=max_connections_per_node,
+        timeout=timeout)
+
+
+@pytest.mark.asyncio()
+async def test_waiters_are_served_in_order():
+    pool = get_pool(max_connections=1)
+    c1 = await pool.acquire_connection_by_node(dict(NODE_7000))
+    served = []
+
+    async def waiter(i):
+        connection = await pool.acquire_connection_by_node(dict(NODE_7000))
+        served.append(i)
+        pool.release(connection)
+
+    waiters = [asyncio.ensure_future(waiter(i)) for i in range(3)]
+    await asyncio.sleep(0.01)
+    assert not served
+
+    pool.release(c1)
+    await asyncio.gather(*waiters)
+    assert served == [0, 1, 2]
+    assert pool._created_connections_per_node == {'127.0.0.1:7000': 1}
+    assert not pool._waiters
+
+
+@pytest.mark.asyncio()
+async def test_wait_timeout():
+    pool = get_pool(max_connections=1, timeout=0.05)
+    await pool.acquire_connection_by_node(dict(NODE_7000))
+    with pytest.raises(ConnectionError):
+        await pool.acquire_connection_by_node(dict(NODE_7000))
+    assert not pool._waiters
+
+
+@pytest.mark.asyncio()
+async def test_max_connections_per_node():
+    pool = get_pool(max_connections=1, max_connections_per_node=True,
+                    timeout=0.05)
+    c1 = await pool.acquire_connection_by_node(dict(NODE_7000))
+    c2 = await pool.acquire_connection_by_node(dict(NODE_7001))
+    with pytest.raises(ConnectionError):
+        await pool.acquire_connection_by_node(dict(NODE_7000))
+
+    waiter = asyncio.ensure_future(
+        pool.acquire_connection_by_node(dict(NODE_7000)))
+    await asyncio.sleep(0.01)
+    # a connection to another node does not make room for this one
+    pool.release(c2)
+    await asyncio.sleep(0)
+    assert not waiter.done()
+    pool.release(c1)
+    assert await waiter is c1
+
+
+@pytest.mark.asyncio()
+async def test_idle_connection_to_another_node_makes_room():
+    pool = get_pool(max_connections=1, timeout=0.05)
+    c1 = await pool.acquire_connection_by_node(dict(NODE_7000))
+    waiter = asyncio.ensure_future(
+        pool.acquire_connection_by_node(dict(NODE_7001)))
+    await asyncio.sleep(0.01)
+
+    pool.release(c1)
+    c2 = await waiter
+    assert c2.node['name'] == '127.0.0.1:7001'
+    assert pool._created_connections_per_node == {
+        '127.0.0.1:7000': 0, '127.0.0.1:7001': 1}
+
+    pool.release(c2)
+    c3 = await pool.acquire_connection_by_node(dict(NODE_7000))
+    assert c3.node['name'] == '127.0.0.1:7000'
+
+
+@pytest.mark.asyncio()
+async def test_reset_fails_waiters():
+    pool = get_pool(max_connections=1)
+    await pool.acquire_connection_by_node(dict(NODE_7000))
+    waiter = asyncio.ensure_future(
+        pool.acquire_connection_by_node(dict(NODE_7000)))
+    await asyncio.sleep(0.01)
+    pool.reset()
+    with pytest.raises(ConnectionError):
+        await waiter
+
+
+@pytest.mark.asyncio()
+async def test_client_under_connection_budget():
+    pool = BlockingClusterConnectionPool(
+        startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+        max_connections=2, max_connections_per_node=True)
+    r = StrictRedisCluster(connection_pool=pool)
+    await r.set('foo', 'bar')
+    results = await asyncio.gather(*(r.get('foo') for _ in range(50)))
+    assert results == [b'bar'] * 50
+    assert all(count <= 2
+               for count in pool._created_connections_per_node.values())
+    pool.disconnect()
+
+
+@pytest.mark.asyncio()
+async def test_stats_per_node():
+    pool = get_pool(max_connections=1)
+    events = []
+    pool.register_stats_callback(
+        lambda event, node_name, value: events.append((event, node_name)))
+    c1 = await pool.acquire_connection_by_node(dict(NODE_7000))
+    waiter = asyncio.ensure_future(
+        pool.acquire_connection_by_node(dict(NODE_7001)))
+    await asyncio.sleep(0.01)
+    pool.release(c1)
+    await waiter
+
+    stats = pool.stats()
+    assert stats['127.0.0.1:7000']['created'] == 1
+    assert stats['127.0.0.1:7000']['idle_closed'] == 1
+    assert stats['127.0.0.1:7000']['in_use'] == 0
+    assert stats['127.0.0.1:7001']['in_use'] == 1
+    assert stats['127.0.0.1:7001']['waits'] == 1
+    assert stats['127.0.0.1:7001']['wait_time'] >= 0.01
+    assert events == [
+        ('created', '127.0.0.1:7000'), ('checkout', '127.0.0.1:7000'),
+        ('idle_closed', '127.0.0.1:7000'), ('created', '127.0.0.1:7001'),
+        ('checkout', '127.0.0.1:7001'),
+    ]
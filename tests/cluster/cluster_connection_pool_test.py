@@ -220,3 +220,47 @@ async def test_connection_idle_check():
     last_active_at = conn.last_active_at
     assert last_active_at == conn.last_active_at
     assert conn._writer is None and conn._reader is None
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_warm_up_opens_min_connections_per_node():
+    pool = ClusterConnectionPool(
+        startup_nodes=[{'host': '127.0.0.1', 'port': 7000}], min_connections=2)
+    await pool.warm_up()
+    masters = {node['name'] for node in pool.nodes.all_masters()}
+    assert set(pool._created_connections_per_node) == masters
+    assert all(count == 2
+               for count in pool._created_connections_per_node.values())
+    assert all(len(pool._available_connections[name]) == 2 for name in masters)
+    assert all(conn.is_connected
+               for name in masters
+               for conn in pool._available_connections[name])
+    pool.disconnect()
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_warm_up_over_max_connections():
+    pool = ClusterConnectionPool(
+        startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+        max_connections=2, min_connections=1)
+    with pytest.raises(RedisClusterException):
+        await pool.warm_up()
+    assert not pool._created_connections_per_node
+
+
+@pytest.mark.asyncio(forbid_global_loop=True)
+async def test_warm_up_releases_connections_on_error():
+    pool = ClusterConnectionPool(
+        startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+        max_connections=4, min_connections=1)
+    await pool.initialize()
+    first, *others = pool.nodes.all_masters()
+    held = [pool.get_connection_by_node(first) for _ in range(3)]
+    with pytest.raises(RedisClusterException):
+        await pool.warm_up()
+    assert all(not pool._in_use_connections.get(node['name'])
+               for node in others)
+    assert len(pool._available_connections[others[0]['name']]) == 1
+    for connection in held:
+        pool.release(connection)
+    pool.disconnect()
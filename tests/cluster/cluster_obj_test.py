@@ -1,3 +1,4 @@
+# pylint: disable=protected-access
 import asyncio
 from unittest.mock import patch
 
@@ -5,6 +6,9 @@ import pytest
 
 from yaaredis import StrictRedisCluster
 from yaaredis.exceptions import AskError
+from yaaredis.exceptions import ClusterDownError
+from yaaredis.exceptions import ClusterUnreachableError
+from yaaredis.exceptions import ConnectionError  # pylint: disable=redefined-builtin
 from yaaredis.pool import ClusterConnectionPool
 from yaaredis.utils import b
 
@@ -50,6 +54,46 @@ async def test_pipeline_ask_redirection():
         assert await p.execute() == ['MOCK_OK']
 
 
+@pytest.mark.asyncio
+async def test_cluster_down_with_unreachable_cluster():
+    """
+    Test that the client retries a CLUSTERDOWN error with the slots it knows
+    when the cluster can not be reached to initialize them again.
+    """
+    r = StrictRedisCluster(host='127.0.0.1', port=7000)
+    await r.connection_pool.initialize()
+    with patch.object(StrictRedisCluster, 'parse_response') as parse_response:
+
+        async def response(connection, *args, **options):
+            async def response(connection, *args, **options):
+                return 'MOCK_OK'
+
+            parse_response.side_effect = response
+            raise ClusterDownError('CLUSTERDOWN The cluster is down')
+
+        parse_response.side_effect = response
+        with patch.object(r.connection_pool.nodes, 'refresh',
+                          side_effect=ClusterUnreachableError('unreachable')):
+            assert await r.get('foo') == 'MOCK_OK'
+            assert r.cluster_down
+            assert not r.connection_pool.initialized
+
+    # the slots cache is initialized again once the cluster can be reached
+    assert await r.set('foo', 'bar')
+    assert not r.cluster_down
+    assert r.connection_pool.initialized
+    r.close()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_cluster_without_cluster_down():
+    r = StrictRedisCluster(host='127.0.0.1', port=7000)
+    with patch.object(r.connection_pool.nodes, 'refresh',
+                      side_effect=ClusterUnreachableError('unreachable')):
+        with pytest.raises(ClusterUnreachableError):
+            await r.get('foo')
+
+
 @pytest.mark.asyncio
 async def test_moved_redirection():
     """
@@ -165,3 +209,50 @@ async def test_access_correct_slave_with_readonly_mode_client(sr):
             readonly_client = StrictRedisCluster.from_url(
                 url='redis://127.0.0.1:7000/0', readonly=True)
             assert b('foo') == await readonly_client.get('foo16706')
+
+
+async def track_node_concurrency(r, monkeypatch, fail_on=None):
+    execute_command_on_node = r._execute_command_on_node
+    running = []
+    max_running = []
+
+    async def tracking_execute_command_on_node(node, *args, **kwargs):
+        running.append(node)
+        max_running.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(node)
+        if node['port'] == fail_on:
+            raise ConnectionError('node down')
+        return await execute_command_on_node(node, *args, **kwargs)
+
+    monkeypatch.setattr(r, '_execute_command_on_node',
+                        tracking_execute_command_on_node)
+    return max_running
+
+
+@pytest.mark.asyncio
+async def test_commands_on_all_nodes_run_concurrently(monkeypatch):
+    r = StrictRedisCluster(host='127.0.0.1', port=7000)
+    await r.connection_pool.initialize()
+    max_running = await track_node_concurrency(r, monkeypatch)
+    assert len(await r.ping()) == 6
+    assert max(max_running) == 6
+
+
+@pytest.mark.asyncio
+async def test_fanout_concurrency(monkeypatch):
+    r = StrictRedisCluster(host='127.0.0.1', port=7000, fanout_concurrency=1)
+    await r.connection_pool.initialize()
+    max_running = await track_node_concurrency(r, monkeypatch)
+    assert len(await r.ping()) == 6
+    assert max(max_running) == 1
+
+
+@pytest.mark.asyncio
+async def test_fanout_node_errors(monkeypatch):
+    r = StrictRedisCluster(host='127.0.0.1', port=7000)
+    await r.connection_pool.initialize()
+    await track_node_concurrency(r, monkeypatch, fail_on=7001)
+    with pytest.raises(ConnectionError) as excinfo:
+        await r.dbsize()
+    assert list(excinfo.value.node_errors) == ['127.0.0.1:7001']
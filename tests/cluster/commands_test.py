@@ -1,13 +1,16 @@
 import datetime
 import time
+from unittest.mock import patch
 
 import pytest
 
 from tests.cluster.conftest import skip_if_redis_py_version_lt
 from tests.cluster.conftest import skip_if_server_version_lt
+from yaaredis.cache import Cache
 from yaaredis.exceptions import RedisClusterException
 from yaaredis.exceptions import RedisError
 from yaaredis.exceptions import ResponseError
+from yaaredis.pool import ClusterConnectionPool
 from yaaredis.utils import b
 
 
@@ -236,6 +239,29 @@ async def test_delete_with_multiple_keys(r):
     assert await r.get('b') is None
 
 
+@pytest.mark.asyncio
+async def test_multi_key_commands_across_slots(r):
+    await r.flushdb()
+    keys = [f'key:{i}' for i in range(1000)]
+    await r.mset({key: 1 for key in keys[::2]})
+    assert await r.exists(*keys) == 500
+    assert await r.touch(keys) == 500
+    assert await r.unlink(*keys[:100]) == 50
+    assert await r.delete(*keys) == 450
+    assert await r.exists(*keys) == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_delete_pattern(r):
+    await r.flushdb()
+    await r.mset({f'cache:{i}': i for i in range(100)})
+    await r.set('other', 1)
+    cache = Cache(r, 'cache')
+    assert await cache.delete_pattern('cache:*', 10) == 100
+    assert await r.keys('cache:*') == []
+    assert await r.exists('other')
+
+
 @pytest.mark.asyncio
 async def test_delitem(r):
     await r.flushdb()
@@ -428,6 +454,30 @@ async def test_mget_hash_tags(r):
     assert await r.mget('a{foo}', 'other', 'b{foo}', 'c{bar}') == [b('1'), None, b('2'), b('3')]
 
 
+@pytest.mark.asyncio
+async def test_mget_many_keys(r):
+    await r.flushdb()
+    keys = [f'key:{i}' for i in range(1000)]
+    await r.mset({key: key for key in keys[::2]})
+    assert await r.mget(keys + keys[:10]) == [
+        b(key) if i % 2 == 0 else None
+        for i, key in enumerate(keys + keys[:10])]
+    # any iterable of keys is accepted
+    assert await r.mget(key for key in keys[:4]) == [
+        b(keys[0]), None, b(keys[2]), None]
+
+
+@pytest.mark.asyncio
+async def test_mget_follows_redirections(r):
+    await r.flushdb()
+    await r.mset({'a': 1, 'b': 2, 'c': 3})
+    node = {'host': '127.0.0.1', 'port': 7000, 'name': '127.0.0.1:7000',
+            'server_type': 'master'}
+    with patch.object(ClusterConnectionPool, 'get_node_by_slot',
+                      return_value=node):
+        assert await r.mget('a', 'b', 'c', 'd') == [b('1'), b('2'), b('3'), None]
+
+
 @pytest.mark.asyncio
 async def test_mset(r):
     await r.flushdb()
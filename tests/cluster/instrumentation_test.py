@@ -0,0 +1,54 @@
+import pytest
+
+from yaaredis import StrictRedisCluster
+from yaaredis.instrumentation import Instrumentation
+
+
+class RecordingInstrumentation(Instrumentation):
+
+    def __init__(self):
+        self.records = []
+
+    def command_completed(self, record):
+        self.records.append(record)
+
+
+@pytest.mark.asyncio
+async def test_commands_are_tagged_with_their_node():
+    instrumentation = RecordingInstrumentation()
+    r = StrictRedisCluster(host='127.0.0.1', port=7000,
+                           instrumentation=instrumentation)
+    await r.set('foo', 'bar')
+    await r.get('foo')
+    await r.dbsize()
+
+    pool = r.connection_pool
+    node = pool.get_master_node_by_slot(pool.nodes.keyslot('foo'))
+    assert len(instrumentation.records) == 3
+    set_record = instrumentation.records[0]
+    get_record = instrumentation.records[1]
+    dbsize_record = instrumentation.records[2]
+    assert (set_record.command, set_record.node) == ('SET', node['name'])
+    assert (get_record.command, get_record.node) == ('GET', node['name'])
+    assert get_record.bytes_received == len(b'$3\r\nbar\r\n')
+    assert (dbsize_record.command, dbsize_record.node) == ('DBSIZE', None)
+    pool.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_is_recorded_once():
+    instrumentation = RecordingInstrumentation()
+    r = StrictRedisCluster(host='127.0.0.1', port=7000,
+                           instrumentation=instrumentation)
+    await r.connection_pool.initialize()
+    async with await r.pipeline() as pipe:
+        for i in range(10):
+            await pipe.set(f'key:{i}', i)
+        await pipe.execute()
+
+    assert len(instrumentation.records) == 1
+    record = instrumentation.records[0]
+    assert record.command == 'PIPELINE'
+    assert record.node is None
+    assert record.bytes_received == 10 * len(b'+OK\r\n')
+    r.connection_pool.disconnect()
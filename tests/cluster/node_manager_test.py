@@ -1,3 +1,4 @@
+# pylint: disable=protected-access
 import asyncio
 import uuid
 from unittest.mock import Mock
@@ -11,7 +12,10 @@ from yaaredis import ConnectionError  # pylint: disable=redefined-builtin
 from yaaredis import RedisClusterException
 from yaaredis import StrictRedis
 from yaaredis import StrictRedisCluster
+from yaaredis import TimeoutError  # pylint: disable=redefined-builtin
 from yaaredis.nodemanager import NodeManager
+from yaaredis.nodemanager import SlotTable
+from yaaredis.pool import ClusterConnectionPool
 
 
 pytestmark = skip_if_server_version_lt('2.9.0')
@@ -316,6 +320,32 @@ def test_set_node():
     assert n.nodes == {expected['name']: expected}
 
 
+def test_slot_table():
+    master = {'host': '127.0.0.1', 'port': 7000, 'name': '127.0.0.1:7000'}
+    replica = {'host': '127.0.0.1', 'port': 7003, 'name': '127.0.0.1:7003'}
+    other = {'host': '127.0.0.1', 'port': 7001, 'name': '127.0.0.1:7001'}
+
+    table = SlotTable()
+    assert not table
+    assert not table.fill(0, 99, [master, replica])
+    assert table.fill(50, 199, [other]) == [(i, master) for i in range(50, 100)]
+    assert len(table) == 200
+    assert table[0] == (master, replica)
+    assert table.master(150) is other
+    assert 200 not in table
+    with pytest.raises(KeyError):
+        table.master(200)
+
+    moved = table.moved({0: other, 200: master})
+    assert moved.serving_nodes(0) == (other, replica)
+    assert moved.serving_nodes(1) == (master, replica)
+    assert moved.serving_nodes(200) == (master,)
+    # published tables are not modified
+    assert table.master(0) is master
+    with pytest.raises(TypeError):
+        table[0][0] = other
+
+
 @pytest.mark.asyncio
 async def test_reset():
     """
@@ -366,12 +396,12 @@ async def test_cluster_one_instance():
 
         assert len(n.slots) == 16384
         for i in range(0, 16384):
-            assert n.slots[i] == [{
+            assert n.slots[i] == ({
                 'host': '127.0.0.1',
                 'name': '127.0.0.1:7006',
                 'port': 7006,
                 'server_type': 'master',
-            }]
+            },)
 
 
 @pytest.mark.asyncio
@@ -399,3 +429,167 @@ async def test_init_with_down_node():
         with pytest.raises(ClusterUnreachableError) as e:
             await n.initialize()
         assert 'Redis Cluster cannot be connected' in str(e.value)
+
+
+@pytest.mark.asyncio
+async def test_init_with_hanging_node():
+    """
+    A startup node which does not reply should not delay the initialization
+    while another one does.
+    """
+    hanging = asyncio.Event()
+
+    def get_redis_link(host, port):
+        link = StrictRedis(host=host, port=port, decode_responses=True)
+        if port == 7000:
+            async def cluster_slots():
+                await hanging.wait()
+            link.cluster_slots = cluster_slots
+        return link
+
+    with patch.object(NodeManager, 'get_redis_link', side_effect=get_redis_link):
+        n = NodeManager(startup_nodes=[{'host': '127.0.0.1', 'port': 7000},
+                                       {'host': '127.0.0.1', 'port': 7001}])
+        await asyncio.wait_for(n.initialize(), 5)
+    assert len(n.slots) == NodeManager.RedisClusterHashSlots
+
+
+@pytest.mark.asyncio
+async def test_init_with_timed_out_node():
+    """
+    A startup node timing out is skipped like one which can not be reached.
+    """
+    def get_redis_link(host, port):
+        link = StrictRedis(host=host, port=port, decode_responses=True)
+        if port == 7000:
+            async def cluster_slots():
+                raise TimeoutError('mock timeout for 7000')
+            link.cluster_slots = cluster_slots
+        return link
+
+    with patch.object(NodeManager, 'get_redis_link', side_effect=get_redis_link):
+        n = NodeManager(startup_nodes=[{'host': '127.0.0.1', 'port': 7000},
+                                       {'host': '127.0.0.1', 'port': 7001}])
+        await n.initialize()
+    assert len(n.slots) == NodeManager.RedisClusterHashSlots
+
+
+@pytest.mark.asyncio
+async def test_init_quorum():
+    startup_nodes = [{'host': '127.0.0.1', 'port': 7000},
+                     {'host': '127.0.0.1', 'port': 7001}]
+    n = NodeManager(startup_nodes=startup_nodes, nodemanager_quorum=2)
+    await n.initialize()
+    assert len(n.slots) == NodeManager.RedisClusterHashSlots
+
+    def get_redis_link(host, port):
+        link = StrictRedis(host=host, port=port, decode_responses=True)
+        if port == 7001:
+            async def cluster_slots():
+                return {(0, 16383): [{'host': '127.0.0.1', 'port': 7001,
+                                      'server_type': 'master'}]}
+            link.cluster_slots = cluster_slots
+        return link
+
+    with patch.object(NodeManager, 'get_redis_link', side_effect=get_redis_link):
+        n = NodeManager(startup_nodes=startup_nodes, nodemanager_quorum=2)
+        with pytest.raises(RedisClusterException) as ex:
+            await n.initialize()
+    assert str(ex.value).startswith(
+        'startup_nodes could not agree on a valid slots cache.'), str(ex.value)
+
+
+@pytest.mark.asyncio
+async def test_full_coverage_config_is_cached():
+    checks = []
+
+    async def cluster_require_full_coverage(nodes_cache):
+        checks.append(nodes_cache)
+        return False
+
+    n = NodeManager(startup_nodes=[{'host': '127.0.0.1', 'port': 7000}])
+    n.cluster_require_full_coverage = cluster_require_full_coverage
+    await n.initialize()
+    # all the slots are covered
+    assert not checks
+
+    with patch.object(SlotTable, '__len__', return_value=100):
+        await n.initialize()
+        await n.initialize()
+    assert len(checks) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_single_flight():
+    n = NodeManager(startup_nodes=[{'host': '127.0.0.1', 'port': 7000}])
+    calls = []
+
+    async def initialize():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+
+    n.initialize = initialize
+    await asyncio.gather(*(n.refresh() for _ in range(10)))
+    assert len(calls) == 1
+    await n.refresh()
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_increment_reinitialize_counter():
+    n = NodeManager(startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+                    reinitialize_steps=3)
+    calls = []
+
+    async def initialize():
+        calls.append(None)
+
+    n.initialize = initialize
+    await n.increment_reinitialize_counter(2)
+    await asyncio.sleep(0)
+    assert not calls
+
+    await n.increment_reinitialize_counter(2)
+    # the refresh runs in the background
+    assert not calls
+    await asyncio.sleep(0)
+    assert len(calls) == 1
+
+    await n.increment_reinitialize_counter()
+    await n.increment_reinitialize_counter()
+    await asyncio.sleep(0)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_periodic_refresh():
+    n = NodeManager(startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+                    nodemanager_refresh_interval=0.05)
+    await n.initialize()
+    n.start_refresh_timer()
+    slots = n.slots
+    await asyncio.sleep(0.2)
+    assert n.slots is not slots
+    assert len(n.slots) == NodeManager.RedisClusterHashSlots
+
+    n.close()
+    # a refresh in flight completes, but no other one starts
+    await asyncio.sleep(0.1)
+    slots = n.slots
+    await asyncio.sleep(0.1)
+    assert n.slots is slots
+
+
+@pytest.mark.asyncio
+async def test_pool_starts_periodic_refresh():
+    pool = ClusterConnectionPool(
+        startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+        nodemanager_refresh_interval=0.05)
+    await pool.initialize()
+    assert pool.nodes._refresh_timer is not None
+    pool.disconnect()
+    assert pool.nodes._refresh_timer is None
+
+    # refreshing the slots again does not restart the periodic refreshes
+    await pool.nodes.refresh()
+    assert pool.nodes._refresh_timer is None
@@ -1,7 +1,13 @@
+# pylint: disable=protected-access
+from unittest.mock import patch
+
 import pytest
 
+from yaaredis.exceptions import RedisClusterException
 from yaaredis.exceptions import ResponseError
+from yaaredis.exceptions import TimeoutError  # pylint: disable=redefined-builtin
 from yaaredis.exceptions import WatchError
+from yaaredis.pool import ClusterConnectionPool
 from yaaredis.utils import b
 
 
@@ -238,6 +244,68 @@ class TestPipeline:
         result = await r.transaction(my_transaction, 'a', 'b')
         assert result == [True]
         assert await r.get('c') == b('4')
+
+    @pytest.mark.asyncio()
+    async def test_redirections_are_batched_per_node(self, r, monkeypatch):
+        await r.flushdb()
+        node = {'host': '127.0.0.1', 'port': 7000, 'name': '127.0.0.1:7000',
+                'server_type': 'master'}
+        async with await r.pipeline(transaction=False) as pipe:
+            send_node_commands = pipe._send_node_commands
+            rounds = []
+
+            async def counting_send_node_commands(attempt):
+                rounds.append(len(attempt))
+                return await send_node_commands(attempt)
+
+            monkeypatch.setattr(pipe, '_send_node_commands', counting_send_node_commands)
+            for i in range(100):
+                await pipe.set(f'key:{i}', i)
+            with patch.object(ClusterConnectionPool, 'get_node_by_slot',
+                              return_value=node):
+                assert await pipe.execute() == [True] * 100
+        # the commands moved to other nodes are retried in a single round
+        assert len(rounds) == 2
+        assert rounds[0] == 100
+        assert 0 < rounds[1] < 100
+        assert await r.mget(f'key:{i}' for i in range(100)) == [
+            b(str(i)) for i in range(100)]
+
+    @pytest.mark.asyncio()
+    async def test_node_timeout(self, r):
+        await r.flushdb()
+        await r.set('b', 1)
+        async with await r.pipeline(transaction=False, node_timeout=0.1) as pipe:
+            # 'a' and 'b' are on different nodes, 'a' blocks its node
+            await pipe.blpop('a', 1)
+            await pipe.get('b')
+            with pytest.raises(TimeoutError):
+                await pipe.execute()
+
+        async with await r.pipeline(transaction=False, node_timeout=0.1) as pipe:
+            await pipe.blpop('a', 1)
+            await pipe.get('b')
+            result = await pipe.execute(raise_on_error=False)
+            assert isinstance(result[0], TimeoutError)
+            assert result[1] == b('1')
+
+    @pytest.mark.asyncio()
+    async def test_multi_key_commands_in_one_slot(self, r):
+        await r.flushdb()
+        await r.mset({'{k}a': 1, '{k}b': 2, 'a': 1, 'b': 2})
+        async with await r.pipeline(transaction=False) as pipe:
+            for command in (pipe.exists, pipe.unlink):
+                with pytest.raises(RedisClusterException):
+                    await command('a', 'b', 'c')
+            with pytest.raises(RedisClusterException):
+                await pipe.touch(['a', 'b', 'c'])
+            assert len(pipe) == 0
+
+            await pipe.exists('{k}a', '{k}b', '{k}c')
+            await pipe.exists('{k}a')
+            await pipe.touch(['{k}a', '{k}b'])
+            await pipe.unlink('{k}a', '{k}b')
+            assert await pipe.execute() == [2, True, 2, 2]
 #
 #     def test_exec_error_in_no_transaction_pipeline(self, r):
 #         r['a'] = 1
@@ -1,15 +1,20 @@
 # python std lib
 # rediscluster imports
+from array import array
+
 import pytest
 
 from yaaredis.commands.cluster import parse_cluster_slots
 from yaaredis.exceptions import ClusterDownError
 from yaaredis.exceptions import RedisClusterException
+from yaaredis.nodemanager import NodeManager
+from yaaredis.utils import _hash_slots
 from yaaredis.utils import b
 from yaaredis.utils import blocked_command
 from yaaredis.utils import clusterdown_wrapper
 from yaaredis.utils import dict_merge
 from yaaredis.utils import first_key
+from yaaredis.utils import hash_slots
 from yaaredis.utils import list_keys_to_dict
 from yaaredis.utils import merge_result
 # 3rd party imports
@@ -160,3 +165,15 @@ async def test_clusterdown_wrapper():
         await bad_func()
     assert str(cex.value).startswith(
         'CLUSTERDOWN error. Unable to rebuild the cluster')
+
+
+@pytest.mark.parametrize('func', [hash_slots, _hash_slots])
+def test_hash_slots(func):
+    keys = ['foo', b'{foo}bar', '{foo}', 1337, 1337.1234, '大奖', b'', '{}a']
+    slots = func(keys)
+    assert isinstance(slots, array)
+    assert slots.typecode == 'H'
+    n = NodeManager([{}])
+    assert list(slots) == [n.keyslot(key) for key in keys]
+    assert list(func(key for key in keys)) == list(slots)
+    assert len(func([])) == 0
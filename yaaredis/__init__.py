@@ -31,15 +31,20 @@ from .exceptions import RedisError
 from .exceptions import ResponseError
 from .exceptions import TimeoutError  # pylint: disable=redefined-builtin
 from .exceptions import WatchError
+from .pool import BlockingClusterConnectionPool
 from .pool import BlockingConnectionPool
 from .pool import ClusterConnectionPool
 from .pool import ConnectionPool
+from .protocol import ClusterProtocolConnection
+from .protocol import ProtocolConnection
 
 
 __all__ = [
     'StrictRedis', 'StrictRedisCluster',
     'Connection', 'UnixDomainSocketConnection', 'ClusterConnection',
+    'ProtocolConnection', 'ClusterProtocolConnection',
     'ConnectionPool', 'ClusterConnectionPool', 'BlockingConnectionPool',
+    'BlockingClusterConnectionPool',
     'AuthenticationFailureError', 'AuthenticationRequiredError',
     'BusyLoadingError', 'CacheError', 'ClusterCrossSlotError',
     'ClusterDownError', 'ClusterDownException', 'ClusterError',
@@ -0,0 +1,237 @@
+import asyncio
+from collections import deque
+
+from .exceptions import ConnectionError  # pylint: disable=redefined-builtin
+from .exceptions import ResponseError
+from .exceptions import TimeoutError  # pylint: disable=redefined-builtin
+from .instrumentation import current_record
+from .instrumentation import detach_record
+
+
+# commands which block the connection, change its state or take it over, so
+# they can not share it with other callers
+DEDICATED_COMMANDS = {
+    'AUTH', 'BLMOVE', 'BLMPOP', 'BLPOP', 'BRPOP', 'BRPOPLPUSH', 'BZMPOP',
+    'BZPOPMAX', 'BZPOPMIN', 'CLIENT REPLY', 'CLIENT SETNAME', 'DISCARD',
+    'EXEC', 'HELLO', 'MONITOR', 'MULTI', 'PSUBSCRIBE', 'PUNSUBSCRIBE', 'QUIT',
+    'READONLY', 'READWRITE', 'RESET', 'SELECT', 'SUBSCRIBE', 'UNSUBSCRIBE',
+    'UNWATCH', 'WAIT', 'WATCH',
+}
+
+
+def is_multiplexable(args):
+    """
+    Returns whether the command can share a connection with other commands
+    """
+    command = args[0]
+    if command in DEDICATED_COMMANDS:
+        return False
+    return not (command in ('XREAD', 'XREADGROUP') and 'BLOCK' in args)
+
+
+def _settle(future, result=None, exc=None):
+    """Resolves the future of a command, unless its caller has given up"""
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+class MultiplexedConnection:
+    """
+    Sends the commands of many callers over one connection.
+
+    Commands queued during the same loop iteration are packed together and
+    written at once. Redis replies in order, so every reply resolves the
+    oldest command in flight.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        # (args, future) of the commands which have not been written yet
+        self._queued = []
+        # futures of the written commands, oldest first
+        self._in_flight = deque()
+        self._writer = None
+        self._reader = None
+
+    @property
+    def has_queued(self):
+        return bool(self._queued)
+
+    @property
+    def in_flight(self):
+        return len(self._in_flight)
+
+    def execute(self, args):
+        """Queues a command and returns a future resolved with its reply"""
+        record = current_record()
+        if record is not None and record.tag_node:
+            record.node = self.connection.node_name
+        future = asyncio.get_event_loop().create_future()
+        self._queued.append((args, future))
+        if self._writer is None:
+            self._writer = asyncio.ensure_future(self._write_queued())
+        return future
+
+    async def _write_queued(self):
+        # the traffic is shared by all the commands in flight, so it is not
+        # counted in the record of the command which started the task
+        detach_record()
+        connection = self.connection
+        try:
+            while self._queued:
+                # skip the commands whose callers have been cancelled
+                batch = [(args, future) for args, future in self._queued
+                         if not future.done()]
+                self._queued = []
+                if not batch:
+                    continue
+                try:
+                    if not connection.is_connected:
+                        if self._reader is not None:
+                            # let the reader fail the commands sent over the
+                            # lost connection before reconnecting
+                            await asyncio.wait({self._reader})
+                        await connection.connect()
+                    await connection.send_packed_command(
+                        connection.pack_commands([args for args, _ in batch]))
+                except Exception as exc:
+                    for _, future in batch:
+                        _settle(future, exc=exc)
+                    continue
+                self._in_flight.extend(future for _, future in batch)
+                connection.awaiting_response = True
+                if self._reader is None:
+                    self._reader = asyncio.ensure_future(self._read_replies())
+        finally:
+            self._writer = None
+
+    async def _read_replies(self):
+        detach_record()
+        connection = self.connection
+        in_flight = self._in_flight
+        try:
+            while in_flight:
+                try:
+                    response = await connection.read_response()
+                except ResponseError as exc:
+                    _settle(in_flight.popleft(), exc=exc)
+                else:
+                    _settle(in_flight.popleft(), response)
+                connection.awaiting_response = bool(in_flight)
+        except BaseException as exc:
+            # the connection is out of sync with the commands in flight
+            connection.disconnect()
+            while in_flight:
+                _settle(in_flight.popleft(), exc=exc)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+        finally:
+            self._reader = None
+
+    def close(self):
+        """Disconnects, failing the commands which have not been replied to"""
+        for task in (self._writer, self._reader):
+            if task is not None:
+                task.cancel()
+        self.connection.disconnect()
+
+
+class AutoPipeline:
+    """
+    Multiplexes the commands of a client over a few shared connections.
+
+    Commands issued during the same loop iteration are coalesced into one
+    write on one connection. A new batch goes to a connection without
+    commands in flight if there is one, or to a newly checked out connection
+    while fewer than ``max_connections`` are used. Otherwise, it is pipelined
+    behind the replies of the least busy connection.
+    """
+
+    def __init__(self, connection_pool, max_connections=1):
+        self.connection_pool = connection_pool
+        self.max_connections = max_connections
+        self._connections = []
+
+    async def execute(self, *args):
+        """Executes a command and returns its unparsed reply"""
+        multiplexed = await self._get_multiplexed_connection()
+        try:
+            return await multiplexed.execute(args)
+        except (ConnectionError, TimeoutError) as exc:
+            # the shared connection may have been lost under another caller,
+            # so the command is retried once like a plain connection's would
+            if (isinstance(exc, TimeoutError)
+                    and not multiplexed.connection.retry_on_timeout):
+                raise
+        multiplexed = await self._get_multiplexed_connection()
+        return await multiplexed.execute(args)
+
+    async def _get_multiplexed_connection(self):
+        connections = self._connections
+        for multiplexed in connections:
+            if multiplexed.has_queued:
+                return multiplexed
+        for multiplexed in connections:
+            if not multiplexed.in_flight:
+                return multiplexed
+        if len(connections) < self.max_connections:
+            connection = await self._get_connection()
+            if len(connections) < self.max_connections:
+                multiplexed = MultiplexedConnection(connection)
+                connections.append(multiplexed)
+                return multiplexed
+            # other callers got connections while the pool was waited on
+            self.connection_pool.release(connection)
+        return min(connections, key=lambda multiplexed: multiplexed.in_flight)
+
+    async def _get_connection(self):
+        return await self.connection_pool.get_connection()
+
+    def close(self):
+        """Closes the shared connections and hands them back to the pool"""
+        connections, self._connections = self._connections, []
+        for multiplexed in connections:
+            multiplexed.close()
+            self.connection_pool.release(multiplexed.connection)
+
+
+class NodeAutoPipeline(AutoPipeline):
+    """AutoPipeline over the connections to one node of a cluster"""
+
+    def __init__(self, connection_pool, node, max_connections=1):
+        super().__init__(connection_pool, max_connections)
+        self.node = node
+
+    async def _get_connection(self):
+        return await self.connection_pool.acquire_connection_by_node(self.node)
+
+
+class ClusterAutoPipeline:
+    """
+    Multiplexes the commands of a cluster client over a few shared
+    connections per node. The commands for each node are coalesced into one
+    write per loop iteration, see AutoPipeline.
+    """
+
+    def __init__(self, connection_pool, max_connections=1):
+        self.connection_pool = connection_pool
+        self.max_connections = max_connections
+        self._nodes = {}
+
+    async def execute(self, node, *args):
+        """Executes a command on ``node`` and returns its unparsed reply"""
+        autopipeline = self._nodes.get(node['name'])
+        if autopipeline is None:
+            autopipeline = self._nodes[node['name']] = NodeAutoPipeline(
+                self.connection_pool, node, self.max_connections)
+        return await autopipeline.execute(*args)
+
+    def close(self):
+        """Closes the shared connections and hands them back to the pool"""
+        nodes, self._nodes = self._nodes, {}
+        for autopipeline in nodes.values():
+            autopipeline.close()
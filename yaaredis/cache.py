@@ -179,12 +179,17 @@ class BasicCache:
         Deletes cache according to pattern in redis,
         delete `count` keys each time
         """
-        cursor = '0'
+        # scan_iter() scans every master of a cluster, and the cluster client
+        # deletes each batch with a DEL per slot, all the nodes at once
+        batch_size = count or 10
         count_deleted = 0
-        while cursor != 0:
-            cursor, identities = await self.client.scan(
-                cursor=cursor, match=pattern, count=count,
-            )
+        identities = []
+        async for identity in self.client.scan_iter(match=pattern, count=count):
+            identities.append(identity)
+            if len(identities) >= batch_size:
+                count_deleted += await self.client.delete(*identities)
+                identities = []
+        if identities:
             count_deleted += await self.client.delete(*identities)
         return count_deleted
 
@@ -1,6 +1,9 @@
 import asyncio
 import sys
 
+from .autopipeline import AutoPipeline
+from .autopipeline import ClusterAutoPipeline
+from .autopipeline import is_multiplexable
 from .commands.cluster import ClusterCommandMixin
 from .commands.connection import ClusterConnectionCommandMixin
 from .commands.connection import ConnectionCommandMixin
@@ -44,6 +47,8 @@ from .exceptions import MovedError
 from .exceptions import RedisClusterException
 from .exceptions import TimeoutError  # pylint: disable=redefined-builtin
 from .exceptions import TryAgainError
+from .instrumentation import current_record
+from .instrumentation import measured
 from .pool import ClusterConnectionPool
 from .pool import ConnectionPool
 from .utils import blocked_command
@@ -90,6 +95,10 @@ class StrictRedis(*mixins):
     RESPONSE_CALLBACKS = dict_merge(
         *(mixin.RESPONSE_CALLBACKS for mixin in mixins))
 
+    autopipeline_class = AutoPipeline
+    _autopipeline = None
+    instrumentation = None
+
     @classmethod
     def from_url(cls, url, db=None, **kwargs):
         """
@@ -127,8 +136,29 @@ class StrictRedis(*mixins):
                  ssl_keyfile=None, ssl_certfile=None,
                  ssl_cert_reqs=None, ssl_ca_certs=None,
                  max_connections=None, retry_on_timeout=False,
-                 max_idle_time=0, idle_check_interval=1,
-                 client_name=None, loop=None, **kwargs):
+                 max_idle_time=0, idle_check_interval=1, min_connections=0,
+                 health_check_interval=0, client_name=None, loop=None, connection_class=None,
+                 autopipeline=False, autopipeline_connections=1,
+                 instrumentation=None, **kwargs):
+        """
+        ``autopipeline`` multiplexes the commands of concurrent callers over
+        ``autopipeline_connections`` shared connections, see AutoPipeline.
+        Blocking and connection state commands still use connections of their
+        own, as do pipelines and pubsub.
+
+        ``min_connections`` connections are opened at once by
+        ``await client.connection_pool.warm_up()``, and are kept open when the
+        connections idle for more than ``max_idle_time`` are closed.
+
+        Connections idle for more than ``health_check_interval`` seconds send
+        a PING along with their next command, and are reconnected if the
+        server or a proxy closed them in the meantime.
+
+        ``instrumentation`` is a yaaredis.instrumentation.Instrumentation
+        measuring every command and pipeline the client executes, e.g., a
+        HistogramCollector. Its connections only count their traffic if they
+        are created after the client.
+        """
         # pylint: disable=too-many-locals
         if not connection_pool:
             kwargs = {
@@ -143,6 +173,8 @@ class StrictRedis(*mixins):
                 'decode_responses': decode_responses,
                 'max_idle_time': max_idle_time,
                 'idle_check_interval': idle_check_interval,
+                'min_connections': min_connections,
+                'health_check_interval': health_check_interval,
                 'client_name': client_name,
                 'loop': loop,
             }
@@ -158,6 +190,8 @@ class StrictRedis(*mixins):
                     'host': host,
                     'port': port,
                 })
+                if connection_class is not None:
+                    kwargs['connection_class'] = connection_class
                 if ssl_context is not None:
                     kwargs['ssl_context'] = ssl_context
                 elif ssl:
@@ -167,6 +201,12 @@ class StrictRedis(*mixins):
             connection_pool = ConnectionPool(**kwargs)
         self.connection_pool = connection_pool
         self._use_lua_lock = None
+        if autopipeline:
+            self._autopipeline = self.autopipeline_class(
+                connection_pool, autopipeline_connections)
+        if instrumentation is not None:
+            self.instrumentation = instrumentation
+            connection_pool.track_traffic = True
 
         self.response_callbacks = self.__class__.RESPONSE_CALLBACKS.copy()
 
@@ -177,11 +217,24 @@ class StrictRedis(*mixins):
         """Sets a custom Response Callback"""
         self.response_callbacks[command] = callback
 
+    def close(self):
+        """
+        Closes the connections shared by the autopipeline, if it is enabled,
+        and disconnects the connections of the pool
+        """
+        if self._autopipeline is not None:
+            self._autopipeline.close()
+        self.connection_pool.disconnect()
+
     # COMMAND EXECUTION AND PROTOCOL PARSING
+    @measured()
     async def execute_command(self, *args, **options):
         """Executes a command and returns a parsed response"""
         pool = self.connection_pool
         command_name = args[0]
+        if self._autopipeline is not None and is_multiplexable(args):
+            response = await self._autopipeline.execute(*args)
+            return self._handle_response(command_name, response, **options)
         connection = await pool.get_connection()
         try:
             await connection.send_command(*args)
@@ -206,6 +259,9 @@ class StrictRedis(*mixins):
     async def parse_response(self, connection, command_name, **options):
         """Parses a response from the Redis server"""
         response = await connection.read_response()
+        return self._handle_response(command_name, response, **options)
+
+    def _handle_response(self, command_name, response, **options):
         if command_name in self.response_callbacks:
             callback = self.response_callbacks[command_name]
             return callback(response, **options)
@@ -222,6 +278,7 @@ class StrictRedis(*mixins):
         from .pipeline import StrictPipeline  # pylint: disable=import-outside-toplevel
         pipeline = StrictPipeline(self.connection_pool, self.response_callbacks,
                                   transaction, shard_hint)
+        pipeline.instrumentation = self.instrumentation
         await pipeline.reset()
         return pipeline
 
@@ -239,10 +296,14 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
                                     for mixin in cluster_mixins
                                     if hasattr(mixin, 'RESULT_CALLBACKS')))
 
+    autopipeline_class = ClusterAutoPipeline
+
     def __init__(self, host=None, port=None, startup_nodes=None, max_connections=32,
                  max_connections_per_node=False, readonly=False,
                  reinitialize_steps=None, skip_full_coverage_check=False,
-                 nodemanager_follow_cluster=False, **kwargs):
+                 nodemanager_follow_cluster=False, nodemanager_quorum=1,
+                 nodemanager_refresh_interval=0, autopipeline=False, autopipeline_connections=1,
+                 instrumentation=None, fanout_concurrency=None, **kwargs):
         """
         :startup_nodes:
         List of nodes that initial bootstrapping can be done from
@@ -261,6 +322,31 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
         The node manager will during initialization try the last set of nodes that
         it was operating on. This will allow the client to drift along side the cluster
         if the cluster nodes move around alot.
+        :nodemanager_quorum:
+        Number of startup nodes which have to return the same slots for them to
+        be used. The startup nodes are asked at the same time, and the first
+        slots returned by that many of them are used.
+        :nodemanager_refresh_interval:
+        Seconds between the refreshes of the slots cache in the background.
+        The slots cache is otherwise refreshed in the background every
+        ``reinitialize_steps`` MOVED redirections.
+        :autopipeline:
+        Multiplexes the commands of concurrent callers over
+        ``autopipeline_connections`` shared connections per node. The commands
+        for each node are sent in one write per event loop iteration.
+        :min_connections:
+        Number of connections per node opened by ``connection_pool.warm_up()``
+        and kept open when idle connections are closed.
+        :health_check_interval:
+        Connections idle for more than this many seconds send a PING along
+        with their next command, and are reconnected if they were closed.
+        :instrumentation:
+        yaaredis.instrumentation.Instrumentation measuring every command and
+        pipeline, with the node they are sent to.
+        :fanout_concurrency:
+        Maximum number of nodes the commands sent to several nodes (e.g.,
+        KEYS, DBSIZE or INFO) are sent to at the same time. All of them by
+        default.
         :**kwargs:
         Extra arguments that will be sent into StrictRedis instance when created
         (See Official redis-py doc for supported kwargs
@@ -268,6 +354,7 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
         Some kwargs is not supported and will raise RedisClusterException
         - db (Redis do not support database SELECT in cluster mode)
         """
+        # pylint: disable=too-many-locals
         # Tweaks to StrictRedis client arguments when running in cluster mode
         if 'db' in kwargs:
             raise RedisClusterException(
@@ -288,14 +375,18 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
                 max_connections_per_node=max_connections_per_node,
                 skip_full_coverage_check=skip_full_coverage_check,
                 nodemanager_follow_cluster=nodemanager_follow_cluster,
+                nodemanager_quorum=nodemanager_quorum,
+                nodemanager_refresh_interval=nodemanager_refresh_interval,
                 readonly=readonly,
                 **kwargs,
             )
 
         super().__init__(
-            connection_pool=pool, **kwargs)
+            connection_pool=pool, autopipeline=autopipeline,
+            autopipeline_connections=autopipeline_connections,
+            instrumentation=instrumentation, **kwargs)
 
-        self.moved = False
+        self.fanout_concurrency = fanout_concurrency
         self.cluster_down = False
         self.nodes_flags = self.__class__.NODES_FLAGS.copy()
         self.result_callbacks = self.__class__.RESULT_CALLBACKS.copy()
@@ -380,6 +471,42 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
         # Default way to handle result
         return first_key(res)
 
+    # the commands are sent to many nodes
+    @measured(lambda client, command, *args, **kwargs: (command, False))
+    async def _execute_by_slot(self, command, keys, values=None):
+        """
+        Sends ``command`` once per slot with the keys hashing to it (each key
+        followed by its value in ``values``, if given), and returns the pairs
+        of the indexes in ``keys`` of the keys sent by each command and of its
+        reply. The replies are not parsed by the response callbacks, so that,
+        e.g., those of EXISTS are counts rather than booleans.
+
+        The commands are pipelined per node and sent to all the nodes at once.
+        Those answered by a MOVED or an ASK redirection are sent again to the
+        node they were redirected to.
+        """
+        slots = {}
+        for index, slot in enumerate(self.connection_pool.nodes.keyslots(keys)):
+            slots.setdefault(slot, []).append(index)
+
+        commands = []
+        for indexes in slots.values():
+            args = [command]
+            for index in indexes:
+                args.append(keys[index])
+                if values is not None:
+                    args.append(values[index])
+            commands.append(args)
+
+        if not commands:
+            return []
+        pipe = await self.pipeline(transaction=False)
+        pipe.response_callbacks.pop(command, None)
+        for args in commands:
+            await pipe.execute_command(*args)
+        replies = await pipe.execute()
+        return list(zip(slots.values(), replies))
+
     def determine_node(self, *args, **kwargs):
         """
         TODO: document
@@ -406,6 +533,8 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
             return [self.connection_pool.nodes.node_from_slot(slot)]
         return None
 
+    # measured outside of the CLUSTERDOWN retries
+    @measured()
     @clusterdown_wrapper
     async def execute_command(self, *args, **kwargs):
         """
@@ -413,7 +542,14 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
         """
         # pylint: disable=too-many-branches,too-many-statements,too-complex
         if not self.connection_pool.initialized:
-            await self.connection_pool.initialize()
+            try:
+                await self.connection_pool.initialize()
+                self.cluster_down = False
+            except ClusterUnreachableError:
+                if not self.cluster_down or not self.connection_pool.nodes.slots:
+                    raise
+                # implicitly pass if cluster_down and cluster not reachable,
+                # the next command tries to initialize the slots cache again
         if not args:
             raise RedisClusterException('Unable to determine command to use')
 
@@ -423,42 +559,42 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
         if node:
             return await self.execute_command_on_nodes(node, *args, **kwargs)
 
-        # rebuild slot->node mapping after a MovedError or ClusterDownError
-        if self.moved or self.cluster_down:
-            try:
-                await self.connection_pool.nodes.initialize()
-            except ClusterUnreachableError:
-                if self.moved:
-                    raise
-                # implicitly pass if cluster_down and cluster not reachable
-            self.cluster_down = False
-            self.moved = False
-
         redirect_addr = None
         asking = False
+        moved = False
 
         try_random_node = False
         slot = self._determine_slot(*args)
         ttl = int(self.RedisClusterRequestTTL)
+        autopipeline = None
+        if self._autopipeline is not None and is_multiplexable(args):
+            autopipeline = self._autopipeline
 
         while ttl > 0:
             ttl -= 1
 
             if asking:
                 node = self.connection_pool.nodes.nodes[redirect_addr]
-                r = self.connection_pool.get_connection_by_node(node)
+                r = await self.connection_pool.acquire_connection_by_node(node)
             elif try_random_node:
-                r = self.connection_pool.get_random_connection()
+                r = await self.connection_pool.acquire_random_connection()
                 try_random_node = False
             else:
-                if self.moved:
+                if moved:
                     # MOVED
                     node = self.connection_pool.get_master_node_by_slot(slot)
                 else:
                     node = self.connection_pool.get_node_by_slot(slot)
-                r = self.connection_pool.get_connection_by_node(node)
+                # the autopipeline writes the command, while ASK redirections
+                # and retries on random nodes use connections of their own
+                r = None
+                if autopipeline is None:
+                    r = await self.connection_pool.acquire_connection_by_node(node)
 
             try:
+                if r is None:
+                    response = await autopipeline.execute(node, *args)
+                    return self._handle_response(command, response, **kwargs)
                 if asking:
                     await r.send_command('ASKING')
                     await self.parse_response(r, 'ASKING', **kwargs)
@@ -474,61 +610,104 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
                 if ttl < self.RedisClusterRequestTTL / 2:
                     await asyncio.sleep(0.1)
             except ClusterDownError as e:
-                self.connection_pool.disconnect()
+                # the slots cache is initialized again by the next attempt
+                self.close()
                 self.connection_pool.reset()
                 self.cluster_down = True
 
                 raise e
             except MovedError as e:
-                # Reinitialize on ever x number of MovedError.
+                # The slot is patched right away, and the whole slots cache
+                # refreshed in the background on every x number of MovedError.
                 # This counter will increase faster when the same client object
-                # is shared between multiple threads. To reduce the frequency you
+                # is shared between multiple tasks. To reduce the frequency you
                 # can set the variable 'reinitialize_steps' in the constructor.
-                self.moved = True
-                await self.connection_pool.nodes.increment_reinitialize_counter()
-
+                moved = True
                 node = self.connection_pool.nodes.set_node(
                     e.host, e.port, server_type='master')
-                self.connection_pool.nodes.slots[e.slot_id][0] = node
+                self.connection_pool.nodes.move_slot(e.slot_id, node)
+                await self.connection_pool.nodes.increment_reinitialize_counter()
             except TryAgainError:
                 if ttl < self.RedisClusterRequestTTL / 2:
                     await asyncio.sleep(0.05)
             except AskError as e:
                 redirect_addr, asking = f'{e.host}:{e.port}', True
             finally:
-                self.connection_pool.release(r)
+                if r is not None:
+                    self.connection_pool.release(r)
 
         raise ClusterError('TTL exhausted.')
 
     async def execute_command_on_nodes(self, nodes, *args, **kwargs):
+        """
+        Sends the command to the nodes concurrently, at most
+        ``fanout_concurrency`` of them at a time if it is set, and merges their
+        replies with _merge_result(). If some nodes fail, the error of the
+        first of them is raised once all the nodes have replied, with the
+        errors of every failed node by name in its ``node_errors`` attribute.
+        """
         command = args[0]
+        nodes = list(nodes)
+        if len(nodes) == 1:
+            result = await self._execute_command_on_node(nodes[0], *args, **kwargs)
+            # the pool names the nodes it connects to
+            return self._merge_result(command, {nodes[0]['name']: result}, **kwargs)
+
+        record = current_record()
+        if record is not None:
+            # the command is sent to several nodes
+            record.tag_node = False
+
+        semaphore = None
+        if self.fanout_concurrency:
+            semaphore = asyncio.Semaphore(self.fanout_concurrency)
+
+        async def execute_on_node(node):
+            if semaphore is None:
+                return await self._execute_command_on_node(node, *args, **kwargs)
+            async with semaphore:
+                return await self._execute_command_on_node(node, *args, **kwargs)
+
+        results = await asyncio.gather(*(execute_on_node(node) for node in nodes),
+                                       return_exceptions=True)
         res = {}
+        node_errors = {}
+        for node, result in zip(nodes, results):
+            if isinstance(result, BaseException):
+                node_errors[node['name']] = result
+            else:
+                res[node['name']] = result
+        if node_errors:
+            error = next(iter(node_errors.values()))
+            error.node_errors = node_errors
+            raise error
+        return self._merge_result(command, res, **kwargs)
 
-        for node in nodes:
-            connection = self.connection_pool.get_connection_by_node(node)
+    async def _execute_command_on_node(self, node, *args, **kwargs):
+        command = args[0]
+        connection = await self.connection_pool.acquire_connection_by_node(node)
 
-            # copy from redis-py
-            try:
-                await connection.send_command(*args)
-                res[node['name']] = await self.parse_response(connection, command, **kwargs)
-            except CancelledError:
-                # do not retry when coroutine is cancelled
-                connection.disconnect()
-                raise
-            except (ConnectionError, TimeoutError) as e:
-                connection.disconnect()
+        # copy from redis-py
+        try:
+            await connection.send_command(*args)
+            return await self.parse_response(connection, command, **kwargs)
+        except CancelledError:
+            # do not retry when coroutine is cancelled
+            connection.disconnect()
+            raise
+        except (ConnectionError, TimeoutError) as e:
+            connection.disconnect()
 
-                if not connection.retry_on_timeout and isinstance(
-                        e, TimeoutError):
-                    raise
+            if not connection.retry_on_timeout and isinstance(
+                    e, TimeoutError):
+                raise
 
-                await connection.send_command(*args)
-                res[node['name']] = await self.parse_response(connection, command, **kwargs)
-            finally:
-                self.connection_pool.release(connection)
-        return self._merge_result(command, res, **kwargs)
+            await connection.send_command(*args)
+            return await self.parse_response(connection, command, **kwargs)
+        finally:
+            self.connection_pool.release(connection)
 
-    async def pipeline(self, transaction=None, shard_hint=None, watches=None):
+    async def pipeline(self, transaction=None, shard_hint=None, watches=None, node_timeout=None):
         """
         Cluster impl:
             Pipelines do not work in cluster mode the same way they do in
@@ -542,6 +721,11 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
 
         cluster transaction can only be run with commands in the same node,
         otherwise error will be raised.
+
+        The commands of a pipeline are sent to their nodes concurrently.
+        ``node_timeout`` is the number of seconds each node has to reply to
+        them, after which its commands fail with a TimeoutError, without
+        being retried.
         """
         await self.connection_pool.initialize()
         if shard_hint:
@@ -549,11 +733,14 @@ class StrictRedisCluster(StrictRedis, *cluster_mixins):
                 'shard_hint is deprecated in cluster mode')
 
         from .pipeline import StrictClusterPipeline  # pylint: disable=import-outside-toplevel
-        return StrictClusterPipeline(
+        pipeline = StrictClusterPipeline(
             connection_pool=self.connection_pool,
             startup_nodes=self.connection_pool.nodes.startup_nodes,
             result_callbacks=self.result_callbacks,
             response_callbacks=self.response_callbacks,
             transaction=transaction,
             watches=watches,
+            node_timeout=node_timeout,
         )
+        pipeline.instrumentation = self.instrumentation
+        return pipeline
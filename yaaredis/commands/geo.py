@@ -1,6 +1,7 @@
 from ..exceptions import RedisError
 from ..utils import b
 from ..utils import nativestr
+from ..utils import Token
 
 
 def parse_georadius_generic(response, **options):
@@ -159,7 +160,7 @@ class GeoCommandMixin:
                 pieces.append(b(token.upper()))
 
         if kwargs['count']:
-            pieces.extend([b('COUNT'), kwargs['count']])
+            pieces.extend([Token.get_token('COUNT'), kwargs['count']])
 
         if kwargs['sort'] and kwargs['sort'] not in ('ASC', 'DESC'):
             raise RedisError('GEORADIUS invalid sort')
@@ -171,9 +172,9 @@ class GeoCommandMixin:
                              ' together')
 
         if kwargs['store']:
-            pieces.extend([b('STORE'), kwargs['store']])
+            pieces.extend([Token.get_token('STORE'), kwargs['store']])
 
         if kwargs['store_dist']:
-            pieces.extend([b('STOREDIST'), kwargs['store_dist']])
+            pieces.extend([Token.get_token('STOREDIST'), kwargs['store_dist']])
 
         return await self.execute_command(command, *pieces, **kwargs)
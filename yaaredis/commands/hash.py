@@ -1,10 +1,10 @@
 from ..exceptions import DataError
-from ..utils import b
 from ..utils import dict_merge
 from ..utils import first_key
 from ..utils import list_or_args
 from ..utils import pairs_to_dict
 from ..utils import string_keys_to_dict
+from ..utils import Token
 
 
 def parse_hscan(response, **_options):
@@ -107,9 +107,9 @@ class HashCommandMixin:
         """
         pieces = [name, cursor]
         if match is not None:
-            pieces.extend([b('MATCH'), match])
+            pieces.extend([Token.get_token('MATCH'), match])
         if count is not None:
-            pieces.extend([b('COUNT'), count])
+            pieces.extend([Token.get_token('COUNT'), count])
         return await self.execute_command('HSCAN', *pieces)
 
     async def hstrlen(self, name, key):
@@ -1,5 +1,7 @@
 import asyncio
 
+from ..utils import Token
+
 
 class IterCommandMixin:
     """
@@ -91,11 +93,11 @@ class ClusterIterCommandMixin(IterCommandMixin):
             while cursor != 0:
                 pieces = [cursor]
                 if match is not None:
-                    pieces.extend(['MATCH', match])
+                    pieces.extend([Token.get_token('MATCH'), match])
                 if count is not None:
-                    pieces.extend(['COUNT', count])
+                    pieces.extend([Token.get_token('COUNT'), count])
                 if type is not None:
-                    pieces.extend(['TYPE', type])
+                    pieces.extend([Token.get_token('TYPE'), type])
                 response = await self.execute_command_on_nodes(
                     [node], 'SCAN', *pieces)
                 cursor, data = list(response.values())[0]
@@ -4,7 +4,6 @@ import time as mod_time
 from ..exceptions import DataError
 from ..exceptions import RedisError
 from ..exceptions import ResponseError
-from ..utils import b
 from ..utils import bool_ok
 from ..utils import dict_merge
 from ..utils import first_key
@@ -13,6 +12,7 @@ from ..utils import list_keys_to_dict
 from ..utils import merge_result
 from ..utils import NodeFlag
 from ..utils import string_keys_to_dict
+from ..utils import Token
 
 
 def sort_return_tuples(response, **options):
@@ -33,6 +33,16 @@ def parse_object(response, infotype):
     return response
 
 
+def parse_exists(response, **options):
+    """
+    Returns the number of keys which exist if ``count`` is specified in the
+    options, and whether the key exists otherwise
+    """
+    if options.get('count'):
+        return response
+    return bool(response)
+
+
 def parse_scan(response, **_options):
     cursor, r = response
     return int(cursor), r
@@ -42,11 +52,12 @@ class KeysCommandMixin:
     # pylint: disable=too-many-public-methods
     RESPONSE_CALLBACKS = dict_merge(
         string_keys_to_dict(
-            'EXISTS EXPIRE EXPIREAT '
+            'EXPIRE EXPIREAT '
             'MOVE PERSIST RENAMENX', bool,
         ),
         {
             'DEL': int,
+            'EXISTS': parse_exists,
             'SORT': sort_return_tuples,
             'OBJECT': parse_object,
             'RANDOMKEY': lambda r: r and r or None,
@@ -66,9 +77,12 @@ class KeysCommandMixin:
         """
         return await self.execute_command('DUMP', name)
 
-    async def exists(self, name):
-        """Returns a boolean indicating whether key ``name`` exists"""
-        return await self.execute_command('EXISTS', name)
+    async def exists(self, *names):
+        """
+        Returns a boolean indicating whether key ``name`` exists, or given
+        several names, the number of them that exist
+        """
+        return await self.execute_command('EXISTS', *names, count=len(names) > 1)
 
     async def expire(self, name, time):
         """
@@ -153,7 +167,7 @@ class KeysCommandMixin:
         """
         params = [name, ttl, value]
         if replace:
-            params.append('REPLACE')
+            params.append(Token.get_token('REPLACE'))
         return await self.execute_command('RESTORE', *params)
 
     async def sort(self, name, start=None, num=None, by=None, get=None,
@@ -189,10 +203,10 @@ class KeysCommandMixin:
 
         pieces = [name]
         if by is not None:
-            pieces.append(b('BY'))
+            pieces.append(Token.get_token('BY'))
             pieces.append(by)
         if start is not None and num is not None:
-            pieces.append(b('LIMIT'))
+            pieces.append(Token.get_token('LIMIT'))
             pieces.append(start)
             pieces.append(num)
         if get is not None:
@@ -201,18 +215,18 @@ class KeysCommandMixin:
             # values. We can't just iterate blindly because strings are
             # iterable.
             if isinstance(get, str):
-                pieces.append(b('GET'))
+                pieces.append(Token.get_token('GET'))
                 pieces.append(get)
             else:
                 for g in get:
-                    pieces.append(b('GET'))
+                    pieces.append(Token.get_token('GET'))
                     pieces.append(g)
         if desc:
-            pieces.append(b('DESC'))
+            pieces.append(Token.get_token('DESC'))
         if alpha:
-            pieces.append(b('ALPHA'))
+            pieces.append(Token.get_token('ALPHA'))
         if store is not None:
-            pieces.append(b('STORE'))
+            pieces.append(Token.get_token('STORE'))
             pieces.append(store)
 
         if groups:
@@ -266,11 +280,11 @@ class KeysCommandMixin:
         """
         pieces = [cursor]
         if match is not None:
-            pieces.extend([b('MATCH'), match])
+            pieces.extend([Token.get_token('MATCH'), match])
         if count is not None:
-            pieces.extend([b('COUNT'), count])
+            pieces.extend([Token.get_token('COUNT'), count])
         if type is not None:
-            pieces.extend([b('TYPE'), type])
+            pieces.extend([Token.get_token('TYPE'), type])
         return await self.execute_command('SCAN', *pieces)
 
 
@@ -326,17 +340,49 @@ class ClusterKeysCommandMixin(KeysCommandMixin):
         "Delete one or more keys specified by ``names``"
 
         Cluster impl:
-            Iterate all keys and send DELETE for each key.
-            This will go a lot slower than a normal delete call in StrictRedis.
+            Group the keys by slot and send a DEL for each slot. The DELs are
+            pipelined per node, and sent to all the nodes at once.
 
-            Operation is no longer atomic.
+            Operation is atomic only if all keys belong to a single slot.
+        """
+        return await self._count_by_slot('DEL', names)
+
+    async def unlink(self, *keys):
+        """
+        Removes the specified keys in a different thread, not blocking
+
+        Cluster impl:
+            Group the keys by slot and send an UNLINK for each slot, see
+            delete().
+        """
+        return await self._count_by_slot('UNLINK', keys)
+
+    async def exists(self, *names):
         """
-        count = 0
+        Returns a boolean indicating whether key ``name`` exists, or given
+        several names, the number of them that exist
 
-        for arg in names:
-            count += await self.execute_command('DEL', arg)
+        Cluster impl:
+            Given several names, check them with an EXISTS per slot, see
+            delete().
+        """
+        if len(names) == 1:
+            return await self.execute_command('EXISTS', names[0])
+        return await self._count_by_slot('EXISTS', names)
+
+    async def touch(self, keys):
+        """
+        Alters the last access time of a key(s).
+        A key is ignored if it does not exist.
+
+        Cluster impl:
+            Group the keys by slot and send a TOUCH for each slot, see
+            delete().
+        """
+        return await self._count_by_slot('TOUCH', keys)
 
-        return count
+    async def _count_by_slot(self, command, keys):
+        return sum(count for _, count in await self._execute_by_slot(command, list(keys)))
 
     async def renamenx(self, src, dst):
         """
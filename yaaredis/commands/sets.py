@@ -1,8 +1,8 @@
-from ..utils import b
 from ..utils import dict_merge
 from ..utils import first_key
 from ..utils import list_or_args
 from ..utils import string_keys_to_dict
+from ..utils import Token
 
 
 def parse_sscan(response, **_options):
@@ -128,9 +128,9 @@ class SetsCommandMixin:
         """
         pieces = [name, cursor]
         if match is not None:
-            pieces.extend([b('MATCH'), match])
+            pieces.extend([Token.get_token('MATCH'), match])
         if count is not None:
-            pieces.extend([b('COUNT'), count])
+            pieces.extend([Token.get_token('COUNT'), count])
         return await self.execute_command('SSCAN', *pieces)
 
 
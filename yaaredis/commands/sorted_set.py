@@ -1,10 +1,10 @@
 # pylint: disable=redefined-builtin
 from ..exceptions import RedisError
-from ..utils import b
 from ..utils import dict_merge
 from ..utils import first_key
 from ..utils import int_or_none
 from ..utils import string_keys_to_dict
+from ..utils import Token
 
 VALID_ZADD_OPTIONS = {'NX', 'XX', 'CH', 'INCR'}
 
@@ -162,7 +162,7 @@ class SortedSetCommandMixin:
                                         score_cast_func)
         pieces = ['ZRANGE', name, start, end]
         if withscores:
-            pieces.append(b('WITHSCORES'))
+            pieces.append(Token.get_token('WITHSCORES'))
         options = {
             'withscores': withscores,
             'score_cast_func': score_cast_func,
@@ -182,7 +182,7 @@ class SortedSetCommandMixin:
             raise RedisError('``start`` and ``num`` must both be specified')
         pieces = ['ZRANGEBYLEX', name, min, max]
         if start is not None and num is not None:
-            pieces.extend([b('LIMIT'), start, num])
+            pieces.extend([Token.get_token('LIMIT'), start, num])
         return await self.execute_command(*pieces)
 
     async def zrevrangebylex(self, name, max, min, start=None, num=None):
@@ -198,7 +198,7 @@ class SortedSetCommandMixin:
             raise RedisError('``start`` and ``num`` must both be specified')
         pieces = ['ZREVRANGEBYLEX', name, max, min]
         if start is not None and num is not None:
-            pieces.extend([b('LIMIT'), start, num])
+            pieces.extend([Token.get_token('LIMIT'), start, num])
         return await self.execute_command(*pieces)
 
     async def zrangebyscore(self, name, min, max, start=None, num=None,
@@ -220,9 +220,9 @@ class SortedSetCommandMixin:
             raise RedisError('``start`` and ``num`` must both be specified')
         pieces = ['ZRANGEBYSCORE', name, min, max]
         if start is not None and num is not None:
-            pieces.extend([b('LIMIT'), start, num])
+            pieces.extend([Token.get_token('LIMIT'), start, num])
         if withscores:
-            pieces.append(b('WITHSCORES'))
+            pieces.append(Token.get_token('WITHSCORES'))
         options = {
             'withscores': withscores,
             'score_cast_func': score_cast_func,
@@ -280,7 +280,7 @@ class SortedSetCommandMixin:
         """
         pieces = ['ZREVRANGE', name, start, end]
         if withscores:
-            pieces.append(b('WITHSCORES'))
+            pieces.append(Token.get_token('WITHSCORES'))
         options = {
             'withscores': withscores,
             'score_cast_func': score_cast_func,
@@ -306,9 +306,9 @@ class SortedSetCommandMixin:
             raise RedisError('``start`` and ``num`` must both be specified')
         pieces = ['ZREVRANGEBYSCORE', name, max, min]
         if start is not None and num is not None:
-            pieces.extend([b('LIMIT'), start, num])
+            pieces.extend([Token.get_token('LIMIT'), start, num])
         if withscores:
-            pieces.append(b('WITHSCORES'))
+            pieces.append(Token.get_token('WITHSCORES'))
         options = {
             'withscores': withscores,
             'score_cast_func': score_cast_func,
@@ -342,10 +342,10 @@ class SortedSetCommandMixin:
             weights = None
         pieces.extend(keys)
         if weights:
-            pieces.append(b('WEIGHTS'))
+            pieces.append(Token.get_token('WEIGHTS'))
             pieces.extend(weights)
         if aggregate:
-            pieces.append(b('AGGREGATE'))
+            pieces.append(Token.get_token('AGGREGATE'))
             pieces.append(aggregate)
         return await self.execute_command(*pieces)
 
@@ -363,9 +363,9 @@ class SortedSetCommandMixin:
         """
         pieces = [name, cursor]
         if match is not None:
-            pieces.extend([b('MATCH'), match])
+            pieces.extend([Token.get_token('MATCH'), match])
         if count is not None:
-            pieces.extend([b('COUNT'), count])
+            pieces.extend([Token.get_token('COUNT'), count])
         options = {'score_cast_func': score_cast_func}
         return await self.execute_command('ZSCAN', *pieces, **options)
 
@@ -1,6 +1,5 @@
 # pylint: disable=redefined-builtin
 import datetime
-from collections import defaultdict
 
 from ..exceptions import RedisError
 from ..utils import bool_ok
@@ -9,6 +8,7 @@ from ..utils import list_or_args
 from ..utils import nativestr
 from ..utils import NodeFlag
 from ..utils import string_keys_to_dict
+from ..utils import Token
 
 
 class BitField:
@@ -260,23 +260,23 @@ class StringsCommandMixin:
         """
         pieces = [name, value]
         if ex is not None:
-            pieces.append('EX')
+            pieces.append(Token.get_token('EX'))
             if isinstance(ex, datetime.timedelta):
                 ex = ex.seconds + ex.days * 24 * 3600
             pieces.append(ex)
         if px is not None:
-            pieces.append('PX')
+            pieces.append(Token.get_token('PX'))
             if isinstance(px, datetime.timedelta):
                 ms = int(px.microseconds / 1000)
                 px = (px.seconds + px.days * 24 * 3600) * 1000 + ms
             pieces.append(px)
 
         if keepttl:
-            pieces.append('KEEPTTL')
+            pieces.append(Token.get_token('KEEPTTL'))
         if nx:
-            pieces.append('NX')
+            pieces.append(Token.get_token('NX'))
         if xx:
-            pieces.append('XX')
+            pieces.append(Token.get_token('XX'))
         return await self.execute_command('SET', *pieces)
 
     async def setbit(self, name, offset, value):
@@ -334,55 +334,25 @@ class ClusterStringsCommandMixin(StringsCommandMixin):
         'BITOP': NodeFlag.BLOCKED,
     }
 
-    @staticmethod
-    def _get_hash_tag_from_key(key):
-        """
-        Returns the "hash tag" for a key or None if one does not exist.
-
-        For the spec, see the following documentation:
-        https://redis.io/topics/cluster-tutorial#redis-cluster-data-sharding
-        """
-        if key.count('{') != 1 or key.count('}') != 1:
-            # no hash tag
-            return None
-        if key.index('{') >= key.index('}'):
-            # invalid hash tag
-            return None
-        return key.split('{', 2)[1].split('}', 2)[0]
-
     async def mget(self, keys, *args):
         """
         Returns a list of values ordered identically to ``keys``
 
         Cluster impl:
-            Find groups of keys with the same hash tag and execute an MGET for
-            each group. Execute individual GETs for all other keys.
-
-            For a definition of "hash tags", see
-            https://redis.io/topics/cluster-tutorial#redis-cluster-data-sharding
+            Group the keys by slot and execute an MGET for each slot. The
+            MGETs are pipelined per node, and sent to all the nodes at once.
 
             Operation will be atomic only if all keys belong to a single
-            hash tag.
+            slot, e.g., if they share a hash tag. For a definition of "hash
+            tags", see
+            https://redis.io/topics/cluster-tutorial#redis-cluster-data-sharding
         """
-        ordered_keys = list_or_args(keys, args)
-        res_mapping = {}  # key -> res
-        hash_tag_slots = defaultdict(list)
-
-        for key in ordered_keys:
-            hash_tag = self._get_hash_tag_from_key(key)
-            if hash_tag is not None:
-                # enqueue this key to be fetched in a group later
-                hash_tag_slots[hash_tag].append(key)
-            else:
-                # a loose key without a hash tag, can't use MGET
-                res_mapping[key] = await self.get(key)
-
-        for mget_keys in hash_tag_slots.values():
-            mget_res = await self.execute_command('MGET', *mget_keys)
-            for key, res in zip(mget_keys, mget_res):
-                res_mapping[key] = res
-
-        return [res_mapping[k] for k in ordered_keys]
+        keys = list(list_or_args(keys, args))
+        values = [None] * len(keys)
+        for indexes, mget_res in await self._execute_by_slot('MGET', keys):
+            for index, value in zip(indexes, mget_res):
+                values[index] = value
+        return values
 
     async def mset(self, *args, **kwargs):
         """
@@ -390,34 +360,21 @@ class ClusterStringsCommandMixin(StringsCommandMixin):
         dictionary argument or as kwargs.
 
         Cluster impl:
-            Find groups of keys with the same hash tag and execute an MSET for
-            each group. Execute individual SETs for all other key/value pairs.
-
-            For a definition of "hash tags", see
-            https://redis.io/topics/cluster-tutorial#redis-cluster-data-sharding
+            Group the keys by slot and execute an MSET for each slot. The
+            MSETs are pipelined per node, and sent to all the nodes at once.
 
             Operation will be atomic only if all keys belong to a single
-            hash tag.
+            slot, e.g., if they share a hash tag. For a definition of "hash
+            tags", see
+            https://redis.io/topics/cluster-tutorial#redis-cluster-data-sharding
         """
         if args:
             if len(args) != 1 or not isinstance(args[0], dict):
                 raise RedisError('MSET requires **kwargs or a single dict arg')
             kwargs.update(args[0])
 
-        hash_tag_slots = defaultdict(list)
-        for pair in iter(kwargs.items()):
-            key, v = pair
-            hash_tag = self._get_hash_tag_from_key(key)
-            if hash_tag is not None:
-                # enqueue this key to be fetched in a group later
-                hash_tag_slots[hash_tag].extend(pair)
-            else:
-                # a loose key without a hash tag, can't use MSET
-                await self.set(key, v)
-
-        for mset_items in hash_tag_slots.values():
-            await self.execute_command('MSET', *mset_items)
-
+        if kwargs:
+            await self._execute_by_slot('MSET', list(kwargs), list(kwargs.values()))
         return True
 
     async def msetnx(self, *args, **kwargs):
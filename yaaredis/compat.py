@@ -7,3 +7,9 @@ try:
     from asyncio import CancelledError, TimeoutError
 except ImportError:
     from asyncio.futures import CancelledError, TimeoutError
+
+try:
+    from asyncio import current_task
+except ImportError:
+    from asyncio import Task
+    current_task = Task.current_task  # pylint: disable=no-member
@@ -5,7 +5,6 @@ import os
 import socket
 import ssl
 import time
-from io import BytesIO
 
 import yaaredis.compat
 from yaaredis.exceptions import AskError
@@ -25,8 +24,12 @@ from yaaredis.exceptions import RedisError
 from yaaredis.exceptions import ResponseError
 from yaaredis.exceptions import TimeoutError  # pylint: disable=redefined-builtin
 from yaaredis.exceptions import TryAgainError
+from yaaredis.instrumentation import TrafficCounter
+from yaaredis.instrumentation import TrafficStreamReader
 from yaaredis.utils import b
+from yaaredis.utils import command_header
 from yaaredis.utils import nativestr
+from yaaredis.utils import Token
 
 try:
     import hiredis
@@ -35,17 +38,32 @@ try:
 except ImportError:
     HIREDIS_AVAILABLE = False
 
+try:
+    # pylint: disable=no-name-in-module
+    from yaaredis.speedups import pack_command as speedups_pack_command
+    from yaaredis.speedups import pack_commands as speedups_pack_commands
+    from yaaredis.speedups import Reader as SpeedupsReader
+
+    SPEEDUPS_AVAILABLE = True
+except ImportError:
+    SPEEDUPS_AVAILABLE = False
+
 SYM_STAR = b('*')
 SYM_DOLLAR = b('$')
 SYM_CRLF = b('\r\n')
 SYM_LF = b('\n')
 SYM_EMPTY = b('')
 
+# sent ahead of the commands of connections due for a health check
+PING_COMMAND = b'*1\r\n$4\r\nPING\r\n'
+
 
 logger = logging.getLogger(__name__)
 
 
 async def exec_with_timeout(coroutine, timeout):
+    if timeout is None:
+        return await coroutine
     try:
         return await asyncio.wait_for(coroutine, timeout)
     except asyncio.TimeoutError as exc:
@@ -53,22 +71,38 @@ async def exec_with_timeout(coroutine, timeout):
 
 
 class SocketBuffer:
+    """
+    Read buffer for the pure Python parser.
+
+    Data read from the socket is appended to a single ``bytearray`` and
+    consumed by moving a read offset forward. Large payloads are sliced out of
+    the buffer through a ``memoryview`` so they are copied exactly once. Short
+    ones are sliced and then converted to ``bytes``, which copies them twice
+    but is still cheaper than setting up a view. The consumed prefix is
+    dropped before the buffer grows again (``bytearray`` deletes from the
+    front in O(1)), so it doesn't grow forever.
+    """
+
+    # payloads at least this long are copied out once through a memoryview,
+    # shorter ones are copied twice, which costs less than creating the view
+    MEMORYVIEW_THRESHOLD = 1024
+
     def __init__(self, stream_reader, read_size):
         self._stream = stream_reader
         self.read_size = read_size
-        self._buffer = BytesIO()
-        # number of bytes written to the buffer from the socket
-        self.bytes_written = 0
-        # number of bytes read from the buffer
-        self.bytes_read = 0
+        self._buffer = bytearray()
+        # offset of the first unread byte in the buffer
+        self._offset = 0
 
     @property
     def length(self):
-        return self.bytes_written - self.bytes_read
+        return len(self._buffer) - self._offset
 
-    async def _read_from_socket(self, length=None):
+    async def read_from_socket(self, length=None):
         buf = self._buffer
-        buf.seek(self.bytes_written)
+        if self._offset:
+            del buf[:self._offset]
+            self._offset = 0
         marker = 0
 
         try:
@@ -77,10 +111,8 @@ class SocketBuffer:
                 # an empty string indicates the server shutdown the socket
                 if isinstance(data, bytes) and len(data) == 0:
                     raise ConnectionError('Socket closed on remote end')
-                buf.write(data)
-                data_length = len(data)
-                self.bytes_written += data_length
-                marker += data_length
+                buf += data
+                marker += len(data)
 
                 if length is not None and length > marker:
                     continue
@@ -88,52 +120,63 @@ class SocketBuffer:
         except OSError as e:
             raise ConnectionError('Error reading from socket') from e
 
-    async def read(self, length):
-        length = length + 2  # make sure to read the \r\n terminator
-        # make sure we've read enough data from the socket
-        if length > self.length:
-            await self._read_from_socket(length - self.length)
+    def feed(self, data):
+        """Appends data which was received without read_from_socket()"""
+        buf = self._buffer
+        if self._offset:
+            del buf[:self._offset]
+            self._offset = 0
+        buf += data
 
-        self._buffer.seek(self.bytes_read)
-        data = self._buffer.read(length)
-        self.bytes_read += len(data)
+    def _consume(self, end):
+        """
+        Returns the unread data up to ``end`` and moves the read offset past
+        the \\r\\n terminator that follows it
+        """
+        buf = self._buffer
+        start = self._offset
+        if end - start < self.MEMORYVIEW_THRESHOLD:
+            data = bytes(buf[start:end])
+        else:
+            with memoryview(buf) as view:
+                data = bytes(view[start:end])
 
         # purge the buffer when we've consumed it all so it doesn't
         # grow forever
-        if self.bytes_read == self.bytes_written:
+        if end + 2 == len(buf):
             self.purge()
+        else:
+            self._offset = end + 2
+        return data
+
+    async def read(self, length):
+        # make sure we've read enough data from the socket, including the
+        # \r\n terminator
+        missing = length + 2 - (len(self._buffer) - self._offset)
+        if missing > 0:
+            await self.read_from_socket(missing)
 
-        return data[:-2]
+        return self._consume(self._offset + length)
 
     async def readline(self):
         buf = self._buffer
-        buf.seek(self.bytes_read)
-        data = buf.readline()
-        while not data.endswith(SYM_CRLF):
-            # there's more data in the socket that we need
-            await self._read_from_socket()
-            buf.seek(self.bytes_read)
-            data = buf.readline()
+        index = buf.find(SYM_CRLF, self._offset)
+        while index == -1:
+            # there's more data in the socket that we need. only the tail
+            # has to be scanned again, in case the \r\n straddles two reads
+            scanned = max(self.length - 1, 0)
+            await self.read_from_socket()
+            index = buf.find(SYM_CRLF, self._offset + scanned)
 
-        self.bytes_read += len(data)
-
-        # purge the buffer when we've consumed it all so it doesn't
-        # grow forever
-        if self.bytes_read == self.bytes_written:
-            self.purge()
-
-        return data[:-2]
+        return self._consume(index)
 
     def purge(self):
-        self._buffer.seek(0)
-        self._buffer.truncate()
-        self.bytes_written = 0
-        self.bytes_read = 0
+        self._buffer.clear()
+        self._offset = 0
 
     def close(self):
         try:
             self.purge()
-            self._buffer.close()
         except Exception:
             # issue #633 suggests the purge/close somehow raised a
             # BadFileDescriptor error. Perhaps the client ran out of
@@ -177,12 +220,23 @@ class BaseParser:
         return ResponseError(response)
 
 
+def _parse_int(value):
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidResponse(f'Protocol Error: {bytes(value)}') from None
+
+
 class PythonParser(BaseParser):
     def __init__(self, read_size):
         self._stream = None
         self._buffer = None
         self._read_size = read_size
         self.encoding = None
+        # multi-bulk replies being read, innermost last, as [items, remaining]
+        self._stack = []
+        # length of the bulk string whose header has already been read
+        self._bulk_length = None
 
     def __del__(self):
         try:
@@ -195,6 +249,8 @@ class PythonParser(BaseParser):
         # pylint: disable=protected-access
         self._stream = connection._reader
         self._buffer = SocketBuffer(self._stream, self._read_size)
+        self._stack = []
+        self._bulk_length = None
         if connection.decode_responses:
             self.encoding = connection.encoding
 
@@ -205,68 +261,138 @@ class PythonParser(BaseParser):
         if self._buffer is not None:
             self._buffer.close()
             self._buffer = None
+        self._stack = []
+        self._bulk_length = None
         self.encoding = None
 
     def can_read(self):
         return self._buffer and bool(self._buffer.length)
 
     async def read_response(self):
-        # pylint: disable=too-many-branches,too-complex
         if not self._buffer:
             raise ConnectionError('Socket closed on remote end')
-        response = await self._buffer.readline()
-        if not response:
-            raise ConnectionError('Socket closed on remote end')
-
-        byte, response = chr(response[0]), response[1:]
-
-        if byte not in ('-', '+', ':', '$', '*'):
-            raise InvalidResponse(f'Protocol Error: {byte}, {response}')
-
-        # server returned an error
-        if byte == '-':
-            response = response.decode()
-            error = self.parse_error(response)
-            # if the error is a ConnectionError, raise immediately so the user
-            # is notified
-            if isinstance(error, ConnectionError):
-                raise error
-            # otherwise, we're dealing with a ResponseError that might belong
-            # inside a pipeline response. the connection's read_response()
-            # and/or the pipeline's execute() will raise this error if
-            # necessary, so just return the exception instance here.
-            return error
-        # single value
-        if byte == '+':
-            pass
-        # int value
-        elif byte == ':':
-            response = int(response)
-        # bulk response
-        elif byte == '$':
-            length = int(response)
-            if length == -1:
-                return None
-            response = await self._buffer.read(length)
-        # multi-bulk response
-        elif byte == '*':
-            length = int(response)
-            if length == -1:
-                return None
-            response = []
-            for _ in range(length):
-                response.append(await self.read_response())
-        if isinstance(response, bytes) and self.encoding:
-            response = response.decode(self.encoding)
+        response = self.gets()
+        # only go back to the event loop when the buffered data does not
+        # contain a complete reply
+        while response is False:
+            await self._buffer.read_from_socket()
+            response = self.gets()
         return response
 
+    def gets(self):
+        """
+        Parses the next reply out of the buffered data without waiting on the
+        socket, or returns False if it has not been fully received yet.
+
+        Multi-bulk replies are parsed with an explicit stack rather than by
+        recursing per element. Elements parsed before running out of data are
+        kept in the stack, so the next call resumes where this one stopped.
+        """
+        # pylint: disable=protected-access,too-many-branches,too-complex
+        # pylint: disable=too-many-statements,too-many-nested-blocks
+        buffer = self._buffer
+        data = buffer._buffer
+        offset = buffer._offset
+        size = len(data)
+        stack = self._stack
+        encoding = self.encoding
+        try:
+            while True:
+                if self._bulk_length is not None:
+                    end = offset + self._bulk_length
+                    if end + 2 > size:
+                        return False
+                    if self._bulk_length < buffer.MEMORYVIEW_THRESHOLD:
+                        response = bytes(data[offset:end])
+                    else:
+                        with memoryview(data) as view:
+                            response = bytes(view[offset:end])
+                    offset = end + 2
+                    self._bulk_length = None
+                    if encoding:
+                        response = response.decode(encoding)
+                else:
+                    end = data.find(SYM_CRLF, offset)
+                    if end == -1:
+                        return False
+                    if end == offset:
+                        raise ConnectionError('Socket closed on remote end')
+                    byte = data[offset]
+                    response = data[offset + 1:end]
+                    offset = end + 2
+
+                    # bulk response
+                    if byte == 36:  # $
+                        length = _parse_int(response)
+                        if length != -1:
+                            self._bulk_length = length
+                            continue
+                        response = None
+                    # multi-bulk response
+                    elif byte == 42:  # *
+                        length = _parse_int(response)
+                        if length > 0:
+                            stack.append([[], length])
+                            continue
+                        response = None if length == -1 else []
+                    # int value
+                    elif byte == 58:  # :
+                        response = _parse_int(response)
+                    # single value
+                    elif byte == 43:  # +
+                        response = (response.decode(encoding) if encoding
+                                    else bytes(response))
+                    # server returned an error
+                    elif byte == 45:  # -
+                        response = self.parse_error(response.decode())
+                        # if the error is a ConnectionError, raise immediately
+                        # so the user is notified
+                        if isinstance(response, ConnectionError):
+                            raise response
+                        # otherwise, we're dealing with a ResponseError that
+                        # might belong inside a pipeline response. the
+                        # connection's read_response() and/or the pipeline's
+                        # execute() will raise this error if necessary, so
+                        # just return the exception instance here.
+                    else:
+                        raise InvalidResponse(
+                            f'Protocol Error: {chr(byte)}, {bytes(response)}')
+
+                # hand the value to the multi-bulk replies it completes
+                while stack:
+                    frame = stack[-1]
+                    frame[0].append(response)
+                    frame[1] -= 1
+                    if frame[1]:
+                        break
+                    stack.pop()
+                    response = frame[0]
+                else:
+                    return response
+        except BaseException:
+            # the rest of a malformed reply can not be told apart from the
+            # next reply, so the next call does not resume this one
+            self._stack = []
+            self._bulk_length = None
+            raise
+        finally:
+            # purge the buffer when we've consumed it all so it doesn't
+            # grow forever
+            if offset == size:
+                buffer.purge()
+            else:
+                buffer._offset = offset
+
 
 class HiredisParser(BaseParser):
     """Parser class for connections using Hiredis"""
 
+    reader_class = hiredis.Reader if HIREDIS_AVAILABLE else None
+    unavailable_message = 'Hiredis is not installed'
+
     def __init__(self, read_size):
-        if not HIREDIS_AVAILABLE:
-            raise RedisError('Hiredis is not installed')
+        if self.reader_class is None:
+            raise RedisError(self.unavailable_message)
         self._stream = None
         self._reader = None
         self._read_size = read_size
@@ -295,7 +421,7 @@ class HiredisParser(BaseParser):
         }
         if connection.decode_responses:
             kwargs['encoding'] = connection.encoding
-        self._reader = hiredis.Reader(**kwargs)
+        self._reader = self.reader_class(**kwargs)
 
     def on_disconnect(self):
         if self._stream is not None:
@@ -335,12 +461,26 @@ class HiredisParser(BaseParser):
         return response
 
 
+class SpeedupsParser(HiredisParser):
+    """
+    Parser class for connections using the RESP reader of the
+    ``yaaredis.speedups`` C extension, which has the same feed()/gets()
+    interface as the hiredis reader
+    """
+
+    reader_class = SpeedupsReader if SPEEDUPS_AVAILABLE else None
+    unavailable_message = 'yaaredis.speedups C extension is not available'
+
+
 if HIREDIS_AVAILABLE:
     DefaultParser = HiredisParser
+elif SPEEDUPS_AVAILABLE:
+    DefaultParser = SpeedupsParser
 else:
     DefaultParser = PythonParser
 
 
+
 class RedisSSLContext:
     def __init__(self, keyfile=None, certfile=None,
                  cert_reqs=None, ca_certs=None):
@@ -380,7 +520,7 @@ class BaseConnection:
     def __init__(self, retry_on_timeout=False, stream_timeout=None,
                  parser_class=DefaultParser, reader_read_size=65535,
                  encoding='utf-8', decode_responses=False,
-                 *, client_name=None, loop=None):
+                 *, client_name=None, health_check_interval=0, loop=None):
         self._parser = parser_class(reader_read_size)
         self._stream_timeout = stream_timeout
         self._reader = None
@@ -399,6 +539,21 @@ class BaseConnection:
         # flag to show if a connection is waiting for response
         self.awaiting_response = False
         self.last_active_at = time.time()
+        # read deadline, see _read_response_before_deadline()
+        self._deadline = None
+        self._deadline_handle = None
+        self._deadline_expired = False
+        self._reading_task = None
+        # TrafficCounter of the connection, see track_traffic()
+        self._traffic = None
+        # see check_health()
+        self.health_check_interval = health_check_interval
+        self._health_check_armed = False
+        self._health_check_command = None
+        # the C packer encodes arguments itself, so it can only be used when
+        # encode() has not been overridden
+        self._speedups_packing = (
+            SPEEDUPS_AVAILABLE and type(self).encode is BaseConnection.encode)
 
     def __repr__(self):
         return self.description.format(**self._description_args)
@@ -413,6 +568,48 @@ class BaseConnection:
     def is_connected(self):
         return bool(self._reader and self._writer)
 
+    @property
+    def node_name(self):
+        """Name of the server the connection is to, for instrumentation"""
+        return repr(self)
+
+    def track_traffic(self):
+        """
+        Counts the bytes sent and received over the connection, and when the
+        first byte of the replies arrives, into the record of the command being
+        measured (see yaaredis.instrumentation). Takes effect on connect.
+        """
+        self._traffic = TrafficCounter(self.node_name)
+
+    def _track_reader(self):
+        self._reader = TrafficStreamReader(self._reader, self._traffic)
+
+    def check_health(self):
+        """
+        Called by pools as they hand the connection out. If it has been idle
+        for more than ``health_check_interval`` seconds, e.g., long enough for
+        a load balancer or the server ``timeout`` to close it, a PING is sent
+        ahead of its next command, in the same write. When the PING finds the
+        connection closed, it is reconnected and the command sent again, before
+        its reply is read.
+        """
+        self._health_check_armed = bool(
+            self.health_check_interval
+            and time.time() - self.last_active_at > self.health_check_interval)
+
+    async def _read_health_check_reply(self):
+        command, self._health_check_command = self._health_check_command, None
+        try:
+            await self.read_response()
+        except ResponseError:
+            pass
+        except ConnectionError:
+            # the server did not get the command either
+            self.disconnect()
+            await self.connect()
+            await self.send_packed_command(command)
+        self.awaiting_response = True
+
     def register_connect_callback(self, callback):
         self._connect_callbacks.append(callback)
 
@@ -426,6 +623,8 @@ class BaseConnection:
         return self._parser.can_read()
 
     async def connect(self):
+        # a new connection needs no health check
+        self._health_check_armed = False
         try:
             await self._connect()
         except (TimeoutError, yaaredis.compat.CancelledError):
@@ -446,45 +645,121 @@ class BaseConnection:
     async def _connect(self):
         raise NotImplementedError
 
-    async def on_connect(self):
-        self._parser.on_connect(self)
-
+    def _handshake_commands(self):
+        """
+        Returns the commands initializing a new connection, as pairs of their
+        arguments and of the error message raised if they do not reply OK
+        """
+        commands = []
         # if a username and a password is specified, authenticate
         if self.username and self.password:
-            await self.send_command('AUTH', self.username, self.password)
-            if nativestr(await self.read_response()) != 'OK':
-                raise ConnectionError('Failed to set username or password')
+            commands.append((('AUTH', self.username, self.password),
+                             'Failed to set username or password'))
         # if a password is specified, authenticate
         elif self.password:
-            await self.send_command('AUTH', self.password)
-            if nativestr(await self.read_response()) != 'OK':
-                raise ConnectionError('Failed to set password')
+            commands.append((('AUTH', self.password), 'Failed to set password'))
 
         # if a database is specified, switch to it
         if self.db:
-            await self.send_command('SELECT', self.db)
-            if nativestr(await self.read_response()) != 'OK':
-                raise ConnectionError('Invalid Database')
+            commands.append((('SELECT', self.db), 'Invalid Database'))
 
         if self.client_name is not None:
-            await self.send_command('CLIENT SETNAME', self.client_name)
-            if nativestr(await self.read_response()) != 'OK':
-                raise ConnectionError('Failed to set client name')
+            commands.append((('CLIENT SETNAME', self.client_name),
+                             'Failed to set client name'))
+        return commands
+
+    async def on_connect(self):
+        if self._traffic is not None:
+            self._track_reader()
+        self._parser.on_connect(self)
+
+        # the handshake commands are sent in a single write, so that a new
+        # connection costs one round trip whatever their number. Their replies
+        # are all read before the first failure is raised.
+        commands = self._handshake_commands()
+        if commands:
+            await self.send_packed_command(
+                self.pack_commands([args for args, _ in commands]))
+            replies = []
+            for _ in commands:
+                try:
+                    replies.append(await self.read_response())
+                except (ConnectionError, TimeoutError):
+                    raise
+                except RedisError as exc:
+                    replies.append(exc)
+            for (_, message), reply in zip(commands, replies):
+                if not isinstance(reply, RedisError) and nativestr(reply) == 'OK':
+                    continue
+                # have the pool discard the connection on release
+                self.awaiting_response = True
+                if isinstance(reply, RedisError):
+                    raise reply
+                raise ConnectionError(message)
 
         self.last_active_at = time.time()
 
     async def read_response(self):
+        if self._health_check_command is not None:
+            await self._read_health_check_reply()
         try:
-            response = await exec_with_timeout(self._parser.read_response(), self._stream_timeout)
+            if self._stream_timeout is None:
+                response = await self._parser.read_response()
+            else:
+                response = await self._read_response_before_deadline()
             self.last_active_at = time.time()
         except TimeoutError:
             self.disconnect()
             raise
+        if self._traffic is not None:
+            self._traffic.reply_read()
         if isinstance(response, RedisError):
             raise response
         self.awaiting_response = False
         return response
 
+    async def _read_response_before_deadline(self):
+        """
+        Reads a reply, raising TimeoutError if it does not arrive within
+        ``stream_timeout`` seconds.
+
+        Rather than wrapping every read in ``asyncio.wait_for``, which creates
+        a task and a timer per reply, each read only pushes the connection's
+        deadline forward. A single timer is armed for it, and when the timer
+        fires, it is either re-armed for the new deadline or it cancels the
+        read. Consecutive reads, e.g., those of a pipeline, share one timer.
+        """
+        loop = asyncio.get_event_loop()
+        self._deadline = loop.time() + self._stream_timeout
+        if self._deadline_handle is None:
+            self._deadline_handle = loop.call_at(self._deadline,
+                                                 self._on_deadline)
+        self._reading_task = yaaredis.compat.current_task()
+        try:
+            return await self._parser.read_response()
+        except yaaredis.compat.CancelledError as exc:
+            if not self._deadline_expired:
+                raise
+            uncancel = getattr(self._reading_task, 'uncancel', None)
+            if uncancel is not None:
+                uncancel()
+            raise TimeoutError('Timeout reading from socket') from exc
+        finally:
+            self._reading_task = None
+            self._deadline_expired = False
+
+    def _on_deadline(self):
+        self._deadline_handle = None
+        if self._reading_task is None:
+            return
+        loop = asyncio.get_event_loop()
+        if self._deadline > loop.time():
+            self._deadline_handle = loop.call_at(
+                self._deadline, self._on_deadline)
+            return
+        self._deadline_expired = True
+        self._reading_task.cancel()
+
     async def send_packed_command(self, command):
         """Sends an already packed command to the Redis server"""
         if not self._writer:
@@ -492,7 +767,13 @@ class BaseConnection:
         try:
             if isinstance(command, str):
                 command = [command]
+            if self._health_check_armed:
+                self._health_check_armed = False
+                self._health_check_command = command
+                command = [PING_COMMAND, *command]
             self._writer.writelines(command)
+            if self._traffic is not None:
+                self._traffic.command_sent(command)
         except yaaredis.compat.TimeoutError as e:
             self.disconnect()
             raise TimeoutError('Timeout writing to socket') from e
@@ -536,6 +817,10 @@ class BaseConnection:
     def disconnect(self):
         """Disconnects from the Redis server"""
         self._parser.on_disconnect()
+        self._health_check_command = None
+        if self._deadline_handle is not None:
+            self._deadline_handle.cancel()
+            self._deadline_handle = None
         try:
             self._writer.close()
         except Exception:
@@ -545,53 +830,40 @@ class BaseConnection:
 
     def pack_command(self, *args):
         'Pack a series of arguments into the Redis protocol'
-        output = []
-        # the client might have included 1 or more literal arguments in
-        # the command name, e.g., 'CONFIG GET'. The Redis server expects these
-        # arguments to be sent separately, so split the first argument
-        # manually. All of these arguements get wrapped in the Token class
-        # to prevent them from being encoded.
-        command = args[0]
-        if ' ' in command:
-            args = tuple(b(s) for s in command.split()) + args[1:]
-        else:
-            args = (b(command),) + args[1:]
-
-        buff = SYM_EMPTY.join(
-            (SYM_STAR, b(str(len(args))), SYM_CRLF))
-        for arg in map(self.encode, args):
-            # to avoid large string mallocs, chunk the command into the
-            # output list if we're sending large values
-            if len(buff) > 6000 or len(arg) > 6000:
-                buff = SYM_EMPTY.join(
-                    (buff, SYM_DOLLAR, b(str(len(arg))), SYM_CRLF))
-                output.append(buff)
-                output.append(b(arg))
-                buff = SYM_CRLF
-            else:
-                buff = SYM_EMPTY.join((buff, SYM_DOLLAR, b(str(len(arg))),
-                                       SYM_CRLF, b(arg), SYM_CRLF))
-        output.append(buff)
-        return output
+        if self._speedups_packing:
+            return speedups_pack_command(args, self.encoding)
+        return self.pack_commands((args,))
 
     def pack_commands(self, commands):
         'Pack multiple commands into the Redis protocol'
-        output = []
-        pieces = []
-        buffer_length = 0
-
-        for cmd in commands:
-            for chunk in self.pack_command(*cmd):
-                pieces.append(chunk)
-                buffer_length += len(chunk)
-
-            if buffer_length > 6000:
-                output.append(SYM_EMPTY.join(pieces))
-                buffer_length = 0
-                pieces = []
+        if self._speedups_packing:
+            return speedups_pack_commands(commands, self.encoding)
 
-        if pieces:
-            output.append(SYM_EMPTY.join(pieces))
+        # walk all the commands once, serializing them into a single buffer.
+        # large values are handed over as separate chunks rather than being
+        # copied into the buffer.
+        output = []
+        buff = bytearray()
+        encode = self.encode
+        for args in commands:
+            buff += command_header(args[0], len(args) - 1)
+            for arg in args[1:]:
+                if arg.__class__ is Token:
+                    buff += arg.serialized
+                    continue
+                arg = encode(arg)
+                arg_length = len(arg)
+                buff += b'$%d\r\n' % arg_length
+                if arg_length > 6000:
+                    output.append(bytes(buff))
+                    output.append(arg)
+                    buff.clear()
+                else:
+                    buff += arg
+                buff += SYM_CRLF
+
+        if buff:
+            output.append(bytes(buff))
         return output
 
 
@@ -603,12 +875,14 @@ class Connection(BaseConnection):
                  db=0, retry_on_timeout=False, stream_timeout=None, connect_timeout=None,
                  ssl_context=None, parser_class=DefaultParser, reader_read_size=65535,
                  encoding='utf-8', decode_responses=False, socket_keepalive=None,
-                 socket_keepalive_options=None, *, client_name=None, loop=None):
+                 socket_keepalive_options=None, *, client_name=None,
+                 health_check_interval=0, loop=None):
         # pylint: disable=too-many-locals
         super().__init__(retry_on_timeout, stream_timeout,
                          parser_class, reader_read_size,
                          encoding, decode_responses,
-                         client_name=client_name, loop=loop)
+                         client_name=client_name,
+                         health_check_interval=health_check_interval, loop=loop)
         self.host = host
         self.port = port
         self.username = username
@@ -624,6 +898,10 @@ class Connection(BaseConnection):
         self.socket_keepalive = socket_keepalive
         self.socket_keepalive_options = socket_keepalive_options or {}
 
+    @property
+    def node_name(self):
+        return f'{self.host}:{self.port}'
+
     async def _connect(self):
         reader, writer = await exec_with_timeout(
             asyncio.open_connection(host=self.host,
@@ -633,7 +911,11 @@ class Connection(BaseConnection):
         )
         self._reader = reader
         self._writer = writer
-        sock = writer.transport.get_extra_info('socket')
+        self._set_socket_options(writer.transport)
+        await self.on_connect()
+
+    def _set_socket_options(self, transport):
+        sock = transport.get_extra_info('socket')
         if sock is not None:
             sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             try:
@@ -645,9 +927,8 @@ class Connection(BaseConnection):
             except (OSError, TypeError):
                 # `socket_keepalive_options` might contain invalid options
                 # causing an error. Do not leave the connection open.
-                writer.close()
+                transport.close()
                 raise
-        await self.on_connect()
 
 
 class UnixDomainSocketConnection(BaseConnection):
@@ -657,11 +938,14 @@ class UnixDomainSocketConnection(BaseConnection):
     def __init__(self, path='', username=None, password=None,
                  db=0, retry_on_timeout=False, stream_timeout=None, connect_timeout=None,
                  ssl_context=None, parser_class=DefaultParser, reader_read_size=65535,
-                 encoding='utf-8', decode_responses=False, *, client_name=None, loop=None):
+                 encoding='utf-8', decode_responses=False, *, client_name=None,
+                 health_check_interval=0, loop=None):
+        # pylint: disable=too-many-locals
         super().__init__(retry_on_timeout, stream_timeout,
                          parser_class, reader_read_size,
                          encoding, decode_responses,
-                         client_name=client_name, loop=loop)
+                         client_name=client_name,
+                         health_check_interval=health_check_interval, loop=loop)
         self.path = path
         self.db = db
         self.username = username
@@ -673,6 +957,10 @@ class UnixDomainSocketConnection(BaseConnection):
             'db': self.db,
         }
 
+    @property
+    def node_name(self):
+        return self.path
+
     async def _connect(self):
         reader, writer = await exec_with_timeout(
             asyncio.open_unix_connection(path=self.path,
@@ -692,17 +980,16 @@ class ClusterConnection(Connection):
         self.readonly = kwargs.pop('readonly', False)
         super().__init__(*args, **kwargs)
 
-    async def on_connect(self):
+    def _handshake_commands(self):
         """
-        Initialize the connection, authenticate and select a database and send READONLY if it is
-        set during object initialization.
+        Authenticate without selecting a database, which is not allowed in cluster mode, and send
+        READONLY if it is set during object initialization.
         """
         if self.db:
             logger.error('SELECT DB is not allowed in cluster mode')
             self.db = ''
 
-        await super().on_connect()
+        commands = super()._handshake_commands()
         if self.readonly:
-            await self.send_command('READONLY')
-            if nativestr(await self.read_response()) != 'OK':
-                raise ConnectionError('READONLY command failed')
+            commands.append((('READONLY',), 'READONLY command failed'))
+        return commands
@@ -0,0 +1,303 @@
+"""
+Instrumentation of the commands sent by the clients.
+
+A client created with ``instrumentation=...`` measures every command and
+pipeline it executes into a CommandRecord, and hands the record over to
+``instrumentation.command_completed()``. Clients without instrumentation only
+pay for a function call and an attribute check per command, the coroutine of
+the command being awaited directly.
+
+The connections of the client's pool count the bytes they send and receive,
+and the time the first byte of the replies arrives at, into the record of the
+command being measured. The record is looked up through a context variable,
+so the commands of concurrent tasks do not mix up. The traffic of commands
+multiplexed by an autopipeline is shared, and is not counted.
+"""
+import contextvars
+import math
+import time
+from functools import wraps
+
+
+_current_record = contextvars.ContextVar('yaaredis_command_record', default=None)
+
+
+def current_record():
+    """Returns the record of the command being measured in this context"""
+    return _current_record.get()
+
+
+def detach_record():
+    """
+    Stops attributing the traffic of the current context, e.g., that of a
+    task shared by many commands, to the command it was started by
+    """
+    _current_record.set(None)
+
+
+def _first_argument(obj, *args, **kwargs):
+    return (args[0] if args else None), True
+
+
+def measured(describe=_first_argument):
+    """
+    Decorates a coroutine method of a client or a pipeline, so that its calls
+    are measured by the ``instrumentation`` of the object, if it has one.
+
+    Calls made while a command is already being measured in the same context
+    are part of its measure. ``describe`` is called with the arguments of the
+    method, and returns the command name to record the call under along with
+    whether to record the node it is sent to, or None to not measure it.
+    """
+    def decorator(func):
+        # a plain function handing out the coroutine to await, so that calls
+        # which are not measured do not go through one more coroutine
+        @wraps(func)
+        def inner(obj, *args, **kwargs):
+            instrumentation = obj.instrumentation
+            if instrumentation is not None and not instrumentation.is_measuring():
+                measure_as = describe(obj, *args, **kwargs)
+                if measure_as is not None:
+                    return instrumentation.measure(
+                        measure_as[0], func(obj, *args, **kwargs), measure_as[1])
+            return func(obj, *args, **kwargs)
+        return inner
+    return decorator
+
+
+class CommandRecord:
+    """
+    Measures of a command or a pipeline. Times are ``time.perf_counter()``
+    values, and the ones which could not be measured (e.g., for connections
+    created before the instrumentation) are None.
+    """
+    # pylint: disable=too-many-instance-attributes
+    __slots__ = ('command', 'node', 'tag_node', 'started_at', 'sent_at',
+                 'first_byte_at', 'finished_at', 'bytes_sent',
+                 'bytes_received', 'error')
+
+    def __init__(self, command, tag_node=True):
+        self.command = command
+        # the node ('host:port') the command was last sent to
+        self.node = None
+        # whether the node the command is sent to should be recorded, which
+        # is not the case for commands sent to several nodes
+        self.tag_node = tag_node
+        self.started_at = time.perf_counter()
+        self.sent_at = None
+        self.first_byte_at = None
+        self.finished_at = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.error = None
+
+    @property
+    def latency(self):
+        """Seconds from the command being called to its reply being parsed"""
+        return self.finished_at - self.started_at
+
+    @property
+    def time_to_first_byte(self):
+        """Seconds from the command being written to its reply arriving"""
+        if self.sent_at is None or self.first_byte_at is None:
+            return None
+        return self.first_byte_at - self.sent_at
+
+
+class TrafficCounter:
+    """
+    Traffic of a connection, moved into the record of the command being
+    measured as the connection writes commands and reads replies
+    """
+    __slots__ = ('node', 'received', 'first_byte_at')
+
+    def __init__(self, node):
+        self.node = node
+        # bytes received, and when the first of them arrived, since the
+        # last command was written
+        self.received = 0
+        self.first_byte_at = None
+
+    def data_received(self, data):
+        if self.first_byte_at is None:
+            self.first_byte_at = time.perf_counter()
+        self.received += len(data)
+
+    def command_sent(self, chunks):
+        self.first_byte_at = None
+        record = _current_record.get()
+        if record is None:
+            return
+        record.sent_at = time.perf_counter()
+        record.bytes_sent += sum(map(len, chunks))
+        if record.tag_node:
+            record.node = self.node
+
+    def reply_read(self):
+        record = _current_record.get()
+        if record is None:
+            return
+        record.bytes_received += self.received
+        self.received = 0
+        if record.first_byte_at is None:
+            record.first_byte_at = self.first_byte_at
+
+
+class TrafficStreamReader:
+    """StreamReader wrapper counting the data read into a TrafficCounter"""
+
+    def __init__(self, stream, traffic):
+        self._stream = stream
+        self._traffic = traffic
+
+    async def read(self, n=-1):
+        data = await self._stream.read(n)
+        self._traffic.data_received(data)
+        return data
+
+
+class Instrumentation:
+    """
+    Base class of the instrumentations given to clients. Subclasses override
+    command_completed() to do something with the records.
+    """
+
+    @staticmethod
+    def is_measuring():
+        """
+        Returns whether a command is already being measured in this context,
+        in which case the commands it sends are part of its measure
+        """
+        return _current_record.get() is not None
+
+    async def measure(self, command, coroutine, tag_node=True):
+        """Awaits the coroutine executing the command and records it"""
+        record = CommandRecord(command, tag_node)
+        token = _current_record.set(record)
+        try:
+            return await coroutine
+        except Exception as exc:
+            record.error = exc
+            raise
+        finally:
+            _current_record.reset(token)
+            record.finished_at = time.perf_counter()
+            self.command_completed(record)
+
+    def command_completed(self, record):
+        """Called with the CommandRecord of every command and pipeline"""
+
+
+class Histogram:
+    """
+    Histogram of positive values with logarithmic buckets, which keeps
+    percentiles within ``precision`` of the actual values whatever their
+    magnitude, in constant memory per order of magnitude
+    """
+
+    def __init__(self, precision=0.01):
+        self._log_base = math.log1p(2 * precision)
+        self._buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        index = math.floor(math.log(value) / self._log_base) if value > 0 else None
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, percent):
+        """Returns the value below which ``percent`` % of the values fall"""
+        if not self.count:
+            return None
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        # the bucket of zero values comes first
+        buckets = sorted(self._buckets.items(),
+                         key=lambda item: -math.inf if item[0] is None else item[0])
+        for index, count in buckets:
+            seen += count
+            if seen < rank:
+                continue
+            if index is None:
+                return 0.0
+            # the middle of the bucket
+            return min(math.exp((index + 0.5) * self._log_base), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+
+class CommandStats:
+    """Latency histograms and counters of the records of one command and node"""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.time_to_first_byte = Histogram()
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def add(self, record):
+        self.latency.add(record.latency)
+        time_to_first_byte = record.time_to_first_byte
+        if time_to_first_byte is not None:
+            self.time_to_first_byte.add(time_to_first_byte)
+        if record.error is not None:
+            self.errors += 1
+        self.bytes_sent += record.bytes_sent
+        self.bytes_received += record.bytes_received
+
+    def snapshot(self):
+        latency = self.latency
+        return {
+            'count': latency.count,
+            'errors': self.errors,
+            'mean': latency.mean,
+            'p50': latency.percentile(50),
+            'p99': latency.percentile(99),
+            'p999': latency.percentile(99.9),
+            'max': latency.max,
+            'time_to_first_byte_p50': self.time_to_first_byte.percentile(50),
+            'time_to_first_byte_p99': self.time_to_first_byte.percentile(99),
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+        }
+
+
+class HistogramCollector(Instrumentation):
+    """
+    Collects the latency of the commands in histograms per command name and
+    node::
+
+        >>> collector = HistogramCollector()
+        >>> client = StrictRedis(instrumentation=collector)
+        >>> ...
+        >>> collector.snapshot()[('GET', '127.0.0.1:6379')]['p99']
+    """
+
+    def __init__(self):
+        self._stats = {}  # Dict((command, node), CommandStats)
+
+    def command_completed(self, record):
+        key = (record.command, record.node)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = CommandStats()
+        stats.add(record)
+
+    def snapshot(self):
+        """
+        Returns the count, error count, latency percentiles (in seconds) and
+        byte counts per (command, node)
+        """
+        return {key: stats.snapshot() for key, stats in self._stats.items()}
+
+    def reset(self):
+        self._stats = {}
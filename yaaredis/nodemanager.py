@@ -1,19 +1,141 @@
+import asyncio
+import logging
 import random
+from array import array
+from collections.abc import Mapping
+from itertools import islice
 
 from .exceptions import ClusterUnreachableError
 from .exceptions import ConnectionError  # pylint: disable=redefined-builtin
 from .exceptions import RedisClusterException
+from .exceptions import TimeoutError  # pylint: disable=redefined-builtin
 from .utils import b
 from .utils import hash_slot
+from .utils import hash_slots
+
+
+logger = logging.getLogger(__name__)
+
+HASH_SLOTS = 16384
+# index of the slots which are not served by any node
+UNASSIGNED = 0xFFFF
+
+
+class SlotTable(Mapping):
+    """
+    Maps every hash slot to the tuple of nodes serving it, master first.
+
+    The slots are stored as an array of 16384 small indexes into a table of
+    the distinct node lists, which are shared by all the slots of a range.
+    Tables are filled while being built, and are not modified once
+    published: a topology change builds a new table and swaps it in.
+    """
+
+    def __init__(self):
+        self._indexes = array('H', [UNASSIGNED]) * HASH_SLOTS
+        self._node_lists = []
+        self._node_list_indexes = {}  # Dict(tuple of node names, index)
+
+    @classmethod
+    def _from_arrays(cls, indexes, node_lists, node_list_indexes):
+        """Returns a table over the arrays of another one, see moved()"""
+        table = cls.__new__(cls)
+        table._indexes = indexes
+        table._node_lists = node_lists
+        table._node_list_indexes = node_list_indexes
+        return table
+
+    def __getitem__(self, slot):
+        if isinstance(slot, int) and slot < 0:
+            raise KeyError(slot)
+        return self.serving_nodes(slot)
+
+    def __iter__(self):
+        for slot, index in enumerate(self._indexes):
+            if index != UNASSIGNED:
+                yield slot
+
+    def __len__(self):
+        return HASH_SLOTS - self._indexes.count(UNASSIGNED)
+
+    def serving_nodes(self, slot):
+        """Returns the tuple of nodes serving the slot, master first"""
+        try:
+            index = self._indexes[slot]
+        except (IndexError, TypeError):
+            raise KeyError(slot) from None
+        if index == UNASSIGNED:
+            raise KeyError(slot)
+        return self._node_lists[index]
+
+    def master(self, slot):
+        return self.serving_nodes(slot)[0]
+
+    def _node_list_index(self, nodes):
+        names = tuple(node['name'] for node in nodes)
+        index = self._node_list_indexes.get(names)
+        if index is None:
+            index = self._node_list_indexes[names] = len(self._node_lists)
+            self._node_lists.append(tuple(nodes))
+        return index
+
+    def fill(self, min_slot, max_slot, nodes):
+        """
+        Assigns the slots of the range which are not assigned yet to the
+        nodes, and returns the (slot, master) of the others whose master is
+        not the same. Only meant for tables which are not published yet.
+        """
+        index = self._node_list_index(nodes)
+        assigned = self._indexes[min_slot:max_slot + 1]
+        if assigned.count(UNASSIGNED) == len(assigned):
+            self._indexes[min_slot:max_slot + 1] = array('H', [index]) * len(assigned)
+            return []
+
+        conflicts = []
+        master_name = nodes[0]['name']
+        for slot, assigned_index in enumerate(assigned, min_slot):
+            if assigned_index == UNASSIGNED:
+                self._indexes[slot] = index
+            else:
+                master = self._node_lists[assigned_index][0]
+                if master['name'] != master_name:
+                    conflicts.append((slot, master))
+        return conflicts
+
+    def assign(self, slot, node):
+        """
+        Assigns the slot to the master ``node``, along with the replicas
+        already serving it. Only meant for tables which are not published yet.
+        """
+        try:
+            replicas = self.serving_nodes(slot)[1:]
+        except KeyError:
+            replicas = ()
+        self._indexes[slot] = self._node_list_index((node,) + replicas)
+
+    def moved(self, moves):
+        """
+        Returns a copy of the table in which the slots of ``moves`` are served
+        by the master nodes they map to, e.g., after MOVED redirections
+        """
+        table = self._from_arrays(array('H', self._indexes),
+                                  list(self._node_lists),
+                                  dict(self._node_list_indexes))
+        for slot, node in moves.items():
+            table.assign(slot, node)
+        return table
 
 
 class NodeManager:
-    # pylint: disable=too-many-instance-attributes
-    RedisClusterHashSlots = 16384
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    RedisClusterHashSlots = HASH_SLOTS
+    # number of startup nodes asked for the slots at the same time
+    StartupNodesConcurrency = 3
 
     def __init__(self, startup_nodes=None, reinitialize_steps=None,
                  skip_full_coverage_check=False,
-                 nodemanager_follow_cluster=False, **connection_kwargs):
+                 nodemanager_follow_cluster=False, nodemanager_quorum=1,
+                 nodemanager_refresh_interval=0, **connection_kwargs):
         """
         :skip_full_coverage_check:
             Skips the check of cluster-require-full-coverage config, useful for clusters
@@ -22,15 +144,27 @@ class NodeManager:
             The node manager will during initialization try the last set of nodes that
             it was operating on. This will allow the client to drift along side the cluster
             if the cluster nodes move around a slot.
+        :nodemanager_quorum:
+            Number of startup nodes which have to return the same slots for them
+            to be used.
+        :nodemanager_refresh_interval:
+            Seconds between the refreshes of the slots cache in the background,
+            which is only refreshed after MOVED redirections by default.
         """
         self.connection_kwargs = connection_kwargs
         self.nodes = {}
-        self.slots = {}
+        self.slots = SlotTable()
         self.startup_nodes = [] if startup_nodes is None else startup_nodes
         self.orig_startup_nodes = self.startup_nodes[:]
         self.reinitialize_counter = 0
         self.reinitialize_steps = reinitialize_steps or 25
         self._skip_full_coverage_check = skip_full_coverage_check
+        # cached cluster-require-full-coverage config of the cluster
+        self._require_full_coverage = None
+        self.quorum = nodemanager_quorum
+        self.refresh_interval = nodemanager_refresh_interval
+        self._refresh_task = None
+        self._refresh_timer = None
         self.nodemanager_follow_cluster = nodemanager_follow_cluster
 
         if not self.startup_nodes:
@@ -59,8 +193,13 @@ class NodeManager:
         key = self.encode(key)
         return hash_slot(key)
 
+    @staticmethod
+    def keyslots(keys):
+        """Calculates the keyslots of a sequence of keys, in an array"""
+        return hash_slots(keys)
+
     def node_from_slot(self, slot):
-        for node in self.slots[slot]:
+        for node in self.slots.serving_nodes(slot):
             if node['server_type'] == 'master':
                 return node
         return None
@@ -103,23 +242,15 @@ class NodeManager:
 
     async def initialize(self):
         """
-        Initializes the slots cache by asking all startup nodes what the
+        Initializes the slots cache by asking the startup nodes what the
         current cluster configuration is.
 
-        TODO: Currently the last node will have the last say about how the
-        configuration is setup. Maybe it should stop to try after it have
-        correctly covered all slots or when one node is reached and it could
-        execute CLUSTER SLOTS command.
+        Up to ``StartupNodesConcurrency`` startup nodes are asked at the same
+        time, and the first configuration returned by ``nodemanager_quorum``
+        of them which covers all the slots (or as many as the cluster
+        requires) is used. When none does, the configurations returned by all
+        the startup nodes are merged.
         """
-        # pylint: disable=too-many-locals,too-many-nested-blocks,too-complex
-        # pylint: disable=too-many-branches,too-many-statements
-        nodes_cache = {}
-        tmp_slots = {}
-
-        all_slots_covered = False
-        disagreements = []
-        startup_nodes_reachable = False
-
         nodes = self.orig_startup_nodes
 
         # With this option the client will attempt to connect to any of the
@@ -127,20 +258,176 @@ class NodeManager:
         if self.nodemanager_follow_cluster:
             nodes = self.startup_nodes
 
-        for node in nodes:
-            try:
-                r = self.get_redis_link(host=node['host'], port=node['port'])
-                cluster_slots = await r.cluster_slots()
-                startup_nodes_reachable = True
-            except ConnectionError:
-                continue
-            except Exception as e:
+        answers = {}  # Dict(startup node index, (startup node, cluster slots))
+        votes = {}  # Dict(configuration, number of startup nodes)
+        accepted = await self._poll_startup_nodes(nodes, answers, votes)
+
+        if accepted is None:
+            if not answers:
+                raise ClusterUnreachableError(
+                    'Redis Cluster cannot be connected. Please provide at '
+                    'least one reachable node.')
+
+            if max(votes.values()) < self.quorum:
                 raise RedisClusterException(
-                    'ERROR sending "cluster slots" command to redis '
-                    f'server: {node}') from e
+                    'startup_nodes could not agree on a valid slots cache. '
+                    f'Fewer than {self.quorum} of them returned the same '
+                    'slots.')
 
-            all_slots_covered = True
+            tmp_slots, nodes_cache = self._build_slots(
+                [answers[i] for i in sorted(answers)])
+            if not await self._is_covered(tmp_slots, nodes_cache):
+                raise RedisClusterException(
+                    'Not all slots are covered after query all startup_nodes. '
+                    f'{len(tmp_slots)} of {self.RedisClusterHashSlots} '
+                    'covered...')
+            accepted = tmp_slots, nodes_cache
+
+        self.populate_startup_nodes()
+        # Set the tmp variables to the real variables, at once
+        self.slots, self.nodes = accepted
+        self.reinitialize_counter = 0
+
+    async def _poll_startup_nodes(self, nodes, answers, votes):
+        """
+        Asks up to ``StartupNodesConcurrency`` startup nodes at a time for the
+        slots, recording their answers and votes, and returns the (slots
+        table, nodes cache) accepted by a quorum of them, or None
+        """
+        concurrency = max(self.quorum, self.StartupNodesConcurrency)
+        startup_nodes = iter(enumerate(nodes))
+        pending = {}  # Dict(task, (startup node index, startup node))
+        try:
+            while True:
+                for i, node in islice(startup_nodes, concurrency - len(pending)):
+                    pending[asyncio.ensure_future(
+                        self._ask_cluster_slots(node))] = (i, node)
+                if not pending:
+                    return None
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i, node = pending.pop(task)
+                    cluster_slots = task.result()
+                    if cluster_slots is None:
+                        continue
+                    answers[i] = (node, cluster_slots)
+                    accepted = await self._vote(answers[i], votes)
+                    if accepted is not None:
+                        return accepted
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _vote(self, answer, votes):
+        """
+        Counts the vote of a startup node for the slots it returned, and
+        returns the (slots table, nodes cache) built from them once a quorum
+        of startup nodes returned the same slots, if they cover the cluster
+        """
+        configuration = frozenset(
+            (slots, slot_nodes[0]['host'], slot_nodes[0]['port'])
+            for slots, slot_nodes in answer[1].items())
+        votes[configuration] = votes.get(configuration, 0) + 1
+        if votes[configuration] < self.quorum:
+            return None
+        tmp_slots, nodes_cache = self._build_slots([answer])
+        if await self._is_covered(tmp_slots, nodes_cache):
+            return tmp_slots, nodes_cache
+        return None
+
+    def schedule_refresh(self):
+        """
+        Starts reinitializing the slots cache in the background, unless it is
+        already being reinitialized, and returns the task doing it. The
+        commands keep using the current slots cache in the meantime.
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._refresh_done)
+        return self._refresh_task
+
+    async def refresh(self):
+        """
+        Reinitializes the slots cache. Concurrent callers wait for the same
+        reinitialization.
+        """
+        await asyncio.shield(self.schedule_refresh())
 
+    async def _refresh(self):
+        try:
+            await self.initialize()
+        finally:
+            self._refresh_task = None
+
+    @staticmethod
+    def _refresh_done(task):
+        # the errors of the refreshes nobody waits for are only logged
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning('Could not refresh the cluster slots: %r',
+                           task.exception())
+
+    def start_refresh_timer(self):
+        """
+        Starts refreshing the slots cache every ``nodemanager_refresh_interval``
+        seconds, unless it is already done. Called by the connection pool
+        once it is initialized.
+        """
+        if self._refresh_timer is None and self.refresh_interval > 0:
+            # do not await the future
+            self._refresh_timer = asyncio.ensure_future(
+                self._refresh_periodically())
+
+    async def _refresh_periodically(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:  # pylint: disable=broad-except
+                # logged by _refresh_done(), and tried again next time
+                pass
+
+    def close(self):
+        """
+        Stops the periodic refreshes of the slots cache, until
+        start_refresh_timer() is called again. A refresh already running is
+        left to complete.
+        """
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+    async def _ask_cluster_slots(self, node):
+        """
+        Returns the slots of the cluster according to the startup node, or
+        None if it can not be reached
+        """
+        try:
+            r = self.get_redis_link(host=node['host'], port=node['port'])
+            try:
+                return await r.cluster_slots()
+            finally:
+                r.connection_pool.disconnect()
+        except (ConnectionError, TimeoutError):
+            return None
+        except Exception as e:
+            raise RedisClusterException(
+                'ERROR sending "cluster slots" command to redis '
+                f'server: {node}') from e
+
+    def _build_slots(self, answers):
+        """
+        Builds the slots table and nodes cache from the (startup node,
+        cluster slots) returned by the startup nodes. The first ones have the
+        last say about slots the others do not agree on, which is an error
+        when it happens more than 5 times.
+        """
+        nodes_cache = {}
+        tmp_slots = SlotTable()
+        disagreements = []
+
+        for node, cluster_slots in answers:
             # If there's only one server in the cluster, its ``host`` is ''
             # Fix it to the host in startup_nodes
             if len(cluster_slots) == 1 and len(self.startup_nodes) == 1:
@@ -152,94 +439,72 @@ class NodeManager:
 
             # No need to decode response because StrictRedis should handle that
             # for us...
-            for min_slot, max_slot in cluster_slots:
-                nodes = cluster_slots.get((min_slot, max_slot))
-                master_node, slave_nodes = nodes[0], nodes[1:]
-
-                if master_node['host'] == '':
-                    master_node['host'] = node['host']
-                self.set_node_name(master_node)
-                nodes_cache[master_node['name']] = master_node
-
-                for i in range(min_slot, max_slot + 1):
-                    if i not in tmp_slots:
-                        tmp_slots[i] = [master_node]
-
-                        for slave_node in slave_nodes:
-                            self.set_node_name(slave_node)
-                            nodes_cache[slave_node['name']] = slave_node
-                            tmp_slots[i].append(slave_node)
-                    else:
-                        # Validate that 2 nodes want to use the same slot cache
-                        # setup
-                        if tmp_slots[i][0]['name'] != node['name']:
-                            disagreements.append(
-                                f'{tmp_slots[i][0]["name"]} vs {node["name"]} '
-                                'on slot: {i}')
-
-                            if len(disagreements) > 5:
-                                raise RedisClusterException(
-                                    'startup_nodes could not agree on a valid '
-                                    f'slots cache. {", ".join(disagreements)}')
-
-                self.populate_startup_nodes()
-
-            if self._skip_full_coverage_check:
-                need_full_slots_coverage = False
-            else:
-                need_full_slots_coverage = (
-                    await self.cluster_require_full_coverage(nodes_cache))
-
-            # Validate if all slots are covered or if we should try next
-            # startup node
-            for i in range(0, self.RedisClusterHashSlots):
-                if i not in tmp_slots and need_full_slots_coverage:
-                    all_slots_covered = False
-
-            if all_slots_covered:
-                # All slots are covered and application can continue to execute
-                break
-
-        if not startup_nodes_reachable:
-            raise ClusterUnreachableError(
-                'Redis Cluster cannot be connected. Please provide at least '
-                'one reachable node.')
-
-        if not all_slots_covered:
-            raise RedisClusterException(
-                'Not all slots are covered after query all startup_nodes. '
-                f'{len(tmp_slots)} of {self.RedisClusterHashSlots} covered...')
-
-        # Set the tmp variables to the real variables
-        self.slots = tmp_slots
-        self.nodes = nodes_cache
-        self.reinitialize_counter = 0
+            for (min_slot, max_slot), nodes in cluster_slots.items():
+                # the master comes first, then its replicas
+                if nodes[0]['host'] == '':
+                    nodes[0]['host'] = node['host']
+                for slot_node in nodes:
+                    self.set_node_name(slot_node)
+                    nodes_cache[slot_node['name']] = slot_node
+
+                # Validate that 2 nodes want to use the same slot cache setup
+                for i, master in tmp_slots.fill(min_slot, max_slot, nodes):
+                    disagreements.append(
+                        f'{master["name"]} vs {nodes[0]["name"]} '
+                        f'on slot: {i}')
+
+                    if len(disagreements) > 5:
+                        raise RedisClusterException(
+                            'startup_nodes could not agree on a valid '
+                            f'slots cache. {", ".join(disagreements)}')
+
+        return tmp_slots, nodes_cache
+
+    async def _is_covered(self, tmp_slots, nodes_cache):
+        """
+        Returns whether the slots table covers all the slots, or the cluster
+        does not require it. The cluster config is only asked for once.
+        """
+        if len(tmp_slots) == self.RedisClusterHashSlots:
+            return True
+        if self._skip_full_coverage_check:
+            return True
+        if self._require_full_coverage is None:
+            self._require_full_coverage = (
+                await self.cluster_require_full_coverage(nodes_cache))
+        return not self._require_full_coverage
 
     async def increment_reinitialize_counter(self, ct=1):
-        for _ in range(1, ct):
-            self.reinitialize_counter += 1
-            if self.reinitialize_counter % self.reinitialize_steps == 0:
-                await self.initialize()
+        """
+        Counts ``ct`` redirections, and refreshes the slots cache in the
+        background every ``reinitialize_steps`` of them
+        """
+        counter = self.reinitialize_counter
+        self.reinitialize_counter += ct
+        if (self.reinitialize_counter // self.reinitialize_steps
+                > counter // self.reinitialize_steps):
+            self.schedule_refresh()
 
     async def cluster_require_full_coverage(self, nodes_cache):
         """
         If exists 'cluster-require-full-coverage no' config on redis servers,
         then even all slots are not covered, cluster still will be able to
-        respond
+        respond. The nodes are asked at the same time.
         """
         nodes = nodes_cache or self.nodes
 
         async def node_require_full_coverage(node):
             r_node = self.get_redis_link(host=node['host'], port=node['port'])
-            node_config = await r_node.config_get(
-                'cluster-require-full-coverage')
+            try:
+                node_config = await r_node.config_get(
+                    'cluster-require-full-coverage')
+            finally:
+                r_node.connection_pool.disconnect()
             return 'yes' in node_config.values()
 
         # at least one node should have cluster-require-full-coverage yes
-        for node in nodes.values():
-            if await node_require_full_coverage(node):
-                return True
-        return False
+        return any(await asyncio.gather(*(
+            node_require_full_coverage(node) for node in nodes.values())))
 
     @staticmethod
     def set_node_name(n):
@@ -252,6 +517,17 @@ class NodeManager:
         if 'name' not in n:
             n['name'] = f'{n["host"]}:{n["port"]}'
 
+    def move_slot(self, slot, node):
+        """Points the slot to the master ``node`` it was moved to"""
+        self.move_slots({slot: node})
+
+    def move_slots(self, moves):
+        """
+        Points each slot of ``moves`` to the master node it was moved to, in
+        a single swap of the slots table
+        """
+        self.slots = self.slots.moved(moves)
+
     def set_node(self, host, port, server_type=None):
         """Updates data for a node"""
         node_name = f'{host}:{port}'
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 import sys
 from itertools import chain
@@ -16,6 +17,7 @@ from .exceptions import ResponseError
 from .exceptions import TimeoutError  # pylint: disable=redefined-builtin
 from .exceptions import TryAgainError
 from .exceptions import WatchError
+from .instrumentation import measured
 from .utils import clusterdown_wrapper
 from .utils import dict_merge
 
@@ -23,6 +25,24 @@ ERRORS_ALLOW_RETRY = (ConnectionError, TimeoutError,
                       MovedError, AskError, TryAgainError)
 
 
+def _measure_pipeline_as(pipeline, *args, **kwargs):
+    # empty pipelines are not measured
+    if not pipeline.command_stack:
+        return None
+    if pipeline.transaction or pipeline.explicit_transaction:
+        return 'TRANSACTION', True
+    return 'PIPELINE', True
+
+
+def _measure_cluster_pipeline_as(pipeline, *args, **kwargs):
+    if not pipeline.command_stack:
+        return None
+    # a transaction goes to a single node, a pipeline to many
+    if pipeline.transaction:
+        return 'TRANSACTION', True
+    return 'PIPELINE', False
+
+
 class BasePipeline:
     """
     Pipelines provide a way to transmit multiple commands to the Redis server
@@ -45,6 +65,9 @@ class BasePipeline:
 
     UNWATCH_COMMANDS = {'DISCARD', 'EXEC', 'UNWATCH'}
 
+    # set by the client creating the pipeline
+    instrumentation = None
+
     def __init__(self, connection_pool, response_callbacks, transaction,
                  shard_hint):
         self.connection_pool = connection_pool
@@ -281,6 +304,7 @@ class BasePipeline:
                 if not exist:
                     s.sha = await immediate('SCRIPT LOAD', s.script)
 
+    @measured(_measure_pipeline_as)
     async def execute(self, raise_on_error=True):
         """Executes all the commands in the current pipeline"""
         stack = self.command_stack
@@ -341,7 +365,7 @@ class StrictClusterPipeline(StrictRedisCluster):
     # pylint: disable=too-many-instance-attributes
     def __init__(self, connection_pool, result_callbacks=None,
                  response_callbacks=None, startup_nodes=None,
-                 transaction=False, watches=None):
+                 transaction=False, watches=None, node_timeout=None):
         # pylint: disable=super-init-not-called
         self.command_stack = []
         self.connection_pool = connection_pool
@@ -356,6 +380,9 @@ class StrictClusterPipeline(StrictRedisCluster):
         self.explicit_transaction = False
         self.moved = False
         self.cluster_down = False
+        # seconds each node has to reply to its commands, see
+        # StrictRedisCluster.pipeline()
+        self.node_timeout = node_timeout
 
     def __repr__(self):
         return f'{type(self).__name__}'
@@ -392,6 +419,22 @@ class StrictClusterPipeline(StrictRedisCluster):
 
         return self.connection_pool.nodes.keyslot(key)
 
+    def _determine_slots(self, commands):
+        """
+        Figures out the slots of the commands, hashing the keys of those
+        with a single key at once
+        """
+        slots = [None] * len(commands)
+        keyed = [i for i, c in enumerate(commands)
+                 if len(c.args) > 1 and c.args[0] not in ('EVAL', 'EVALSHA')]
+        keys = [commands[i].args[1] for i in keyed]
+        for i, slot in zip(keyed, self.connection_pool.nodes.keyslots(keys)):
+            slots[i] = slot
+        for i, c in enumerate(commands):
+            if slots[i] is None:
+                slots[i] = self._determine_slot(*c.args)
+        return slots
+
     async def execute_command(self, *args, **kwargs):
         return self.pipeline_execute_command(*args, **kwargs)
 
@@ -414,6 +457,7 @@ class StrictClusterPipeline(StrictRedisCluster):
                f'error: {exception.args[1:]}')
         exception.args = (msg,) + exception.args[1:]
 
+    @measured(_measure_cluster_pipeline_as)
     async def execute(self, raise_on_error=True):
         await self.connection_pool.initialize()
         stack = self.command_stack
@@ -466,7 +510,7 @@ class StrictClusterPipeline(StrictRedisCluster):
                     raise ClusterTransactionError(
                         "Keys in request don't hash to the same node")
             node = hashed_node
-        conn = self.connection_pool.get_connection_by_node(node)
+        conn = await self.connection_pool.acquire_connection_by_node(node)
         if self.watches:
             await self._watch(node, conn, self.watches)
         node_commands = NodeCommands(
@@ -503,49 +547,91 @@ class StrictClusterPipeline(StrictRedisCluster):
         `allow_redirections` If the pipeline should follow `ASK` & `MOVED` responses
         automatically. If set to false it will raise RedisClusterException.
         """
-        # pylint: disable=too-complex
         # the first time sending the commands we send all of the commands that were queued up.
         # if we have to run through it again, we only retry the commands that
         # failed.
         attempt = sorted(stack, key=lambda x: x.position)
+        for c in attempt:
+            c.node = None
+            c.asking = False
+
+        ttl = int(self.RedisClusterRequestTTL)
+        while True:
+            ttl -= 1
+            timed_out = await self._send_node_commands(attempt)
+
+            # if the response isn't an exception it is a valid response from the node
+            # we're all done with that command, YAY!
+            # if we have more commands to attempt, we've run into problems.
+            # collect all the commands we are allowed to retry.
+            # (MOVED, ASK, or connection errors or timeout errors, but those of
+            # the nodes which did not reply within node_timeout)
+            attempt = [c for c in attempt
+                       if isinstance(c.result, ERRORS_ALLOW_RETRY) and c not in timed_out]
+            if not attempt or not allow_redirections or ttl <= 0:
+                break
 
+            # RETRY MAGIC HAPPENS HERE!
+            # the commands to retry are batched per node again, following their
+            # redirections, and pipelined like the first time. Those failing
+            # again are retried until the TTL is exhausted, after which their
+            # errors are their results.
+            #
+            # If a lot of commands have failed, we'll be setting the
+            # flag to rebuild the slots table from scratch. So MOVED errors should
+            # correct themselves fairly quickly.
+            await self.connection_pool.nodes.increment_reinitialize_counter(len(attempt))
+            if await self._redirect(attempt) and ttl < self.RedisClusterRequestTTL / 2:
+                await asyncio.sleep(0.1)
+
+        # turn the response back into a simple flat array that corresponds
+        # to the sequence of commands issued in the stack in pipeline.execute()
+        response = [c.result for c in sorted(stack, key=lambda x: x.position)]
+
+        if raise_on_error:
+            self.raise_first_error(stack)
+
+        return response
+
+    async def _send_node_commands(self, attempt):
+        """
+        Sends the commands pipelined per node, and returns those of the nodes
+        which did not reply within node_timeout
+        """
         # build a list of node objects based on node names we need to
         nodes = {}
 
         # as we move through each command that still needs to be processed,
         # we figure out the slot number that command maps to, then from the
-        # slot determine the node.
+        # slot determine the node, unless the command was redirected.
+        slots = iter(self._determine_slots([c for c in attempt if c.node is None]))
         for c in attempt:
-            # refer to our internal node -> slot table that tells us where a given
-            # command should route to.
-            slot = self._determine_slot(*c.args)
-            node = self.connection_pool.get_node_by_slot(slot)
+            node = c.node
+            if node is None:
+                # refer to our internal node -> slot table that tells us where a given
+                # command should route to.
+                slot = next(slots)
+                node = self.connection_pool.get_node_by_slot(slot)
 
-            # little hack to make sure the node name is populated. probably
-            # could clean this up.
-            self.connection_pool.nodes.set_node_name(node)
+                # little hack to make sure the node name is populated. probably
+                # could clean this up.
+                self.connection_pool.nodes.set_node_name(node)
 
             # now that we know the name of the node ( it's just a string in the form of host:port )
             # we can build a list of commands for each node.
             node_name = node['name']
             if node_name not in nodes:
                 nodes[node_name] = NodeCommands(
-                    self.parse_response, self.connection_pool.get_connection_by_node(node))
+                    self.parse_response,
+                    await self.connection_pool.acquire_connection_by_node(node))
 
+            if c.asking:
+                nodes[node_name].append(PipelineCommand(('ASKING',)))
             nodes[node_name].append(c)
 
-        # send the commands in sequence.
-        # we  write to all the open sockets for each node first, before reading anything
-        # this allows us to flush all the requests out across the network essentially in parallel
-        # so that we can read them all in parallel as they come back.
-        # we dont' multiplex on the sockets as they come available, but that
-        # shouldn't make too much difference.
-        node_commands = nodes.values()
-        for n in node_commands:
-            await n.write()
-
-        for n in node_commands:
-            await n.read()
+        # each node is written to and read from concurrently, so that a slow
+        # node does not delay reading the replies of the others
+        results = await asyncio.gather(*(self._execute_node_commands(n) for n in nodes.values()))
 
         # release all of the redis connections we allocated earlier back into the connection pool.
         # we used to do this step as part of a try/finally block, but it is really dangerous to
@@ -559,49 +645,55 @@ class StrictClusterPipeline(StrictRedisCluster):
         # command and every single request after to that connection will always get
         # a mismatched result. (not just theoretical, I saw this happen on
         # production x.x).
-        for n in nodes.values():
+        timed_out = set()
+        for n, in_time in zip(nodes.values(), results):
             self.connection_pool.release(n.connection)
+            if not in_time:
+                timed_out.update(n.commands)
+        return timed_out
 
-        # if the response isn't an exception it is a valid response from the node
-        # we're all done with that command, YAY!
-        # if we have more commands to attempt, we've run into problems.
-        # collect all the commands we are allowed to retry.
-        # (MOVED, ASK, or connection errors or timeout errors)
-        attempt = sorted((c for c in attempt if isinstance(c.result, ERRORS_ALLOW_RETRY)),
-                         key=lambda x: x.position)
-        if attempt and allow_redirections:
-            # RETRY MAGIC HAPPENS HERE!
-            # send these remaing comamnds one at a time using `execute_command`
-            # in the main client. This keeps our retry logic in one place mostly,
-            # and allows us to be more confident in correctness of behavior.
-            # at this point any speed gains from pipelining have been lost
-            # anyway, so we might as well make the best attempt to get the correct
-            # behavior.
-            #
-            # The client command will handle retries for each individual command
-            # sequentially as we pass each one into `execute_command`. Any exceptions
-            # that bubble out should only appear once all retries have been exhausted.
-            #
-            # If a lot of commands have failed, we'll be setting the
-            # flag to rebuild the slots table from scratch. So MOVED errors should
-            # correct themselves fairly quickly.
-            await self.connection_pool.nodes.increment_reinitialize_counter(len(attempt))
-            for c in attempt:
-                try:
-                    # send each command individually like we do in the main
-                    # client.
-                    c.result = await super().execute_command(*c.args, **c.options)
-                except RedisError as e:
-                    c.result = e
-
-        # turn the response back into a simple flat array that corresponds
-        # to the sequence of commands issued in the stack in pipeline.execute()
-        response = [c.result for c in sorted(stack, key=lambda x: x.position)]
-
-        if raise_on_error:
-            self.raise_first_error(stack)
+    async def _execute_node_commands(self, node_commands):
+        await node_commands.write()
+        if self.node_timeout is None:
+            await node_commands.read()
+            return True
+        try:
+            await asyncio.wait_for(node_commands.read(), self.node_timeout)
+        except asyncio.TimeoutError:
+            # the replies left are unread, so the connection cannot be reused
+            node_commands.connection.disconnect()
+            error = TimeoutError(f'Timeout reading from {node_commands.connection.node_name}')
+            for c in node_commands.commands:
+                c.result = error
+            return False
+        return True
 
-        return response
+    async def _redirect(self, attempt):
+        """
+        Points the commands answered with a redirection to the node they were
+        redirected to, and returns whether some of the others have to wait
+        for the node they failed on to come back
+        """
+        nodes = self.connection_pool.nodes
+        wait = False
+        moves = {}  # Dict(slot, node)
+        for c in attempt:
+            e = c.result
+            c.asking = False
+            if isinstance(e, MovedError):
+                c.node = moves[e.slot_id] = nodes.set_node(e.host, e.port, server_type='master')
+            elif isinstance(e, AskError):
+                c.node = nodes.nodes.get(f'{e.host}:{e.port}') or nodes.set_node(e.host, e.port)
+                c.asking = True
+            else:
+                # connection errors, timeouts and TRYAGAIN are retried on the
+                # node serving the slot
+                c.node = None
+                wait = True
+        if moves:
+            # the slots table is swapped once for all the slots moved
+            nodes.move_slots(moves)
+        return wait
 
     @staticmethod
     def _fail_on_redirect(allow_redirections):
@@ -659,6 +751,31 @@ class StrictClusterPipeline(StrictRedisCluster):
 
         return self.execute_command('DEL', names[0])
 
+    def unlink(self, *keys):
+        """Unlinks the keys specified by ``keys``, which must share a slot"""
+        self._check_same_slot('UNLINK', keys)
+        return self.execute_command('UNLINK', *keys)
+
+    def exists(self, *names):
+        """
+        Returns whether the key ``names`` exists, or the number of keys of
+        ``names`` which exist when given several names sharing a slot
+        """
+        self._check_same_slot('EXISTS', names)
+        return self.execute_command('EXISTS', *names, count=len(names) > 1)
+
+    def touch(self, keys):
+        """Touches the keys specified by ``keys``, which must share a slot"""
+        self._check_same_slot('TOUCH', keys)
+        return self.execute_command('TOUCH', *keys)
+
+    def _check_same_slot(self, command, keys):
+        # the command is queued as a single command, which fails with
+        # CROSSSLOT for keys in several slots
+        if len({self.connection_pool.nodes.keyslot(key) for key in keys}) > 1:
+            raise RedisClusterException(
+                f'{command} of keys in several slots is not implemented in pipeline command')
+
 
 def block_pipeline_command(func):
     """
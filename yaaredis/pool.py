@@ -3,11 +3,14 @@ import os
 import random
 import threading
 import time
+from collections import defaultdict
+from collections import deque
 from itertools import chain
 from urllib.parse import parse_qs
 from urllib.parse import unquote
 from urllib.parse import urlparse
 
+from .compat import CancelledError
 from .connection import ClusterConnection
 from .connection import Connection
 from .connection import RedisSSLContext
@@ -15,6 +18,8 @@ from .connection import UnixDomainSocketConnection
 from .exceptions import ConnectionError  # pylint: disable=redefined-builtin
 from .exceptions import RedisClusterException
 from .nodemanager import NodeManager
+from .stats import PoolStats
+from .stats import PoolStatsMixin
 
 FALSE_STRINGS = ('0', 'F', 'FALSE', 'N', 'NO')
 
@@ -29,19 +34,25 @@ def to_bool(value):
 
 URL_QUERY_ARGUMENT_PARSERS = {
     'connect_timeout': float,
+    'health_check_interval': float,
     'idle_check_interval': int,
     'max_connections': int,
     'max_idle_time': int,
+    'min_connections': int,
     'reader_read_size': int,
     'retry_on_timeout': to_bool,
     'stream_timeout': float,
 }
 
 
-class ConnectionPool:
+class ConnectionPool(PoolStatsMixin):
     """Generic connection pool"""
     # pylint: disable=too-many-instance-attributes
 
+    # whether the connections created count their traffic for the
+    # instrumentation of clients, see BaseConnection.track_traffic()
+    track_traffic = False
+
     @classmethod
     def from_url(cls, url, db=None, decode_components=False, **kwargs):
         """
@@ -157,7 +168,7 @@ class ConnectionPool:
         return cls(**kwargs)
 
     def __init__(self, connection_class=Connection, max_connections=None,
-                 max_idle_time=0, idle_check_interval=1,
+                 max_idle_time=0, idle_check_interval=1, min_connections=0,
                  **connection_kwargs):
         """
         Creates a connection pool. If max_connections is set, then this
@@ -166,19 +177,30 @@ class ConnectionPool:
         By default, TCP connections are created connection_class is specified.
         Use redis.UnixDomainSocketConnection for unix sockets.
 
+        warm_up() opens min_connections connections ahead of the first
+        commands, and connections closed for being idle for more than
+        max_idle_time never take the pool below min_connections.
+
         Any additional keyword arguments are passed to the constructor of
         connection_class.
         """
         max_connections = max_connections or 2 ** 31
         if not isinstance(max_connections, int) or max_connections < 0:
             raise ValueError('"max_connections" must be a positive integer')
+        if not isinstance(min_connections, int) or not 0 <= min_connections <= max_connections:
+            raise ValueError('"min_connections" must be a positive integer '
+                             'not greater than "max_connections"')
 
         self.connection_class = connection_class
         self.connection_kwargs = connection_kwargs
         self.max_connections = max_connections
+        self.min_connections = min_connections
         self.max_idle_time = max_idle_time
         self.idle_check_interval = idle_check_interval
         self.loop = self.connection_kwargs.get('loop')
+        self._stats = PoolStats()
+        self._stats_callbacks = []
+        self._idle_reaper = None
 
         self.reset()
 
@@ -186,24 +208,67 @@ class ConnectionPool:
         x = self.connection_class.description.format(**self.connection_kwargs)
         return f'{type(self).__name__}<{x}>'
 
-    async def disconnect_on_idle_time_exceeded(self, connection):
+    def stats(self):
+        """Returns a snapshot of the pool counters and of the connections in use and idle"""
+        return self._stats.snapshot(len(self._in_use_connections),
+                                    len(self._available_connections))
+
+    def _check_health(self, connection):
+        # only connections given a health_check_interval need check_health()
+        if self.connection_kwargs.get('health_check_interval'):
+            connection.check_health()
+
+    def _start_idle_reaper(self):
+        """
+        Starts the task closing the connections left idle for more than
+        max_idle_time, unless it is already running
+        """
+        if self._idle_reaper is None and self.max_idle_time > self.idle_check_interval > 0:
+            # do not await the future
+            self._idle_reaper = asyncio.ensure_future(self._reap_idle_connections())
+
+    def _stop_idle_reaper(self):
+        """Cancels the task closing the idle connections, if it is running"""
+        if self._idle_reaper is not None:
+            self._idle_reaper.cancel()
+            self._idle_reaper = None
+
+    async def _reap_idle_connections(self):
+        # a single task sweeps the whole pool every idle_check_interval until
+        # no idle connection can be closed (release() starts it again)
         while True:
-            if (time.time() - connection.last_active_at > self.max_idle_time
-                    and not connection.awaiting_response):
-                connection.disconnect()
-                try:
-                    self._available_connections.remove(connection)
-                except ValueError:
-                    pass
-                self._created_connections -= 1
-                break
             await asyncio.sleep(self.idle_check_interval)
+            if not self.disconnect_idle_connections():
+                break
+        self._idle_reaper = None
+
+    def disconnect_idle_connections(self):
+        """
+        Closes the available connections idle for more than max_idle_time,
+        keeping at least min_connections connections, and returns whether some
+        idle connections could still be closed later on
+        """
+        expired_before = time.time() - self.max_idle_time
+        connections = self._available_connections
+        closable = min(len(connections),
+                       self._created_connections - self.min_connections)
+        # released connections are appended, so the expired ones come first
+        expired = 0
+        while expired < closable and connections[expired].last_active_at < expired_before:
+            connections[expired].disconnect()
+            expired += 1
+        del connections[:expired]
+        self._created_connections -= expired
+        if expired:
+            self._record('idle_closed', None, expired)
+        return closable > expired
 
     def reset(self):
         self.pid = os.getpid()
         self._created_connections = 0
         self._available_connections = []
         self._in_use_connections = set()
+        self._stop_idle_reaper()
         self._check_lock = threading.Lock()
 
     def _checkpid(self):
@@ -225,19 +290,53 @@ class ConnectionPool:
             if self._created_connections >= self.max_connections:
                 raise ConnectionError('Too many connections') from e
             connection = self.make_connection()
+        else:
+            self._check_health(connection)
         self._in_use_connections.add(connection)
+        self._record('checkout', None, 0.0)
         return connection
 
     def make_connection(self):
         """Creates a new connection"""
         self._created_connections += 1
+        self._record('created', None, 1)
         connection = self.connection_class(**self.connection_kwargs)
-        if self.max_idle_time > self.idle_check_interval > 0:
-            # do not await the future
-            asyncio.ensure_future(
-                self.disconnect_on_idle_time_exceeded(connection))
+        if self.track_traffic:
+            connection.track_traffic()
         return connection
 
+    async def warm_up(self):
+        """
+        Opens connections concurrently until min_connections of them are
+        connected, so that the first commands do not pay for connecting
+        """
+        count = self.min_connections - len(self._in_use_connections)
+
+        async def check_out(connections):
+            for _ in range(count):
+                connections.append(await self.get_connection())
+
+        await self._connect_and_release(check_out)
+
+    async def _connect_and_release(self, check_out):
+        connections = []
+        try:
+            await check_out(connections)
+        except BaseException:
+            # e.g., connections of other callers take the pool to its limit
+            for connection in connections:
+                self.release(connection)
+            raise
+        results = await asyncio.gather(
+            *(connection.connect() for connection in connections
+              if not connection.is_connected),
+            return_exceptions=True)
+        for connection in connections:
+            self.release(connection)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
     def release(self, connection):
         """Releases the connection back to the pool"""
         self._checkpid()
@@ -248,11 +347,14 @@ class ConnectionPool:
         if connection.awaiting_response:
             connection.disconnect()
             self._created_connections -= 1
+            self._record('discarded', None, 1)
         else:
             self._available_connections.append(connection)
+            self._start_idle_reaper()
 
     def disconnect(self):
         """Closes all connections in the pool"""
+        self._stop_idle_reaper()
         all_conns = chain(self._available_connections,
                           self._in_use_connections)
         for connection in all_conns:
@@ -296,7 +398,7 @@ class BlockingConnectionPool(ConnectionPool):
 
     def __init__(self, connection_class=Connection, queue_class=asyncio.LifoQueue,
                  max_connections=None, timeout=20, max_idle_time=0, idle_check_interval=1,
-                 **connection_kwargs):
+                 min_connections=0, **connection_kwargs):
 
         self.timeout = timeout
         self.queue_class = queue_class
@@ -306,19 +408,41 @@ class BlockingConnectionPool(ConnectionPool):
         super().__init__(
             connection_class=connection_class, max_connections=max_connections,
             max_idle_time=max_idle_time, idle_check_interval=idle_check_interval,
-            **connection_kwargs)
+            min_connections=min_connections, **connection_kwargs)
 
-    async def disconnect_on_idle_time_exceeded(self, connection):
-        while True:
-            if (time.time() - connection.last_active_at > self.max_idle_time
-                    and not connection.awaiting_response):
-                # Unlike the non blocking pool, we don't free the connection object,
-                # but always reuse it
-                connection.disconnect()
+    def disconnect_idle_connections(self):
+        """
+        Closes the pooled connections idle for more than max_idle_time,
+        keeping at least min_connections connections open, and returns
+        whether some idle connections could still be closed later on
+        """
+        expired_before = time.time() - self.max_idle_time
+        closable = min(
+            len(self._idle_connections),
+            len(self._idle_connections) + len(self._in_use_connections) - self.min_connections)
+        expired = []
+        # the idle connections are kept in the order they were released in
+        for connection in self._idle_connections:
+            if len(expired) == closable or connection.last_active_at >= expired_before:
                 break
-            await asyncio.sleep(self.idle_check_interval)
+            expired.append(connection)
+        for connection in expired:
+            # Unlike the non blocking pool, we don't free the connection object,
+            # but always reuse it
+            connection.disconnect()
+            del self._idle_connections[connection]
+        if expired:
+            self._record('idle_closed', None, len(expired))
+        return closable > len(expired)
+
+    def stats(self):
+        """Returns a snapshot of the pool counters and of the connections in use and idle"""
+        return self._stats.snapshot(len(self._in_use_connections),
+                                    len(self._idle_connections))
 
     def reset(self):
+        # connections in the queue that are still connected, in release order
+        self._idle_connections = {}
         self._pool = self.queue_class(self.max_connections)
         while True:
             try:
@@ -333,6 +457,8 @@ class BlockingConnectionPool(ConnectionPool):
         self._checkpid()
 
         connection = None
+        waits = self._pool.empty()
+        started_at = time.perf_counter()
 
         try:
             connection = await asyncio.wait_for(
@@ -340,12 +466,19 @@ class BlockingConnectionPool(ConnectionPool):
                 self.timeout,
             )
         except asyncio.TimeoutError as e:
+            wait_time = time.perf_counter() - started_at
+            self._record('timeout', None, wait_time)
             raise ConnectionError('No connection available.') from e
 
         if connection is None:
             connection = self.make_connection()
+        else:
+            self._idle_connections.pop(connection, None)
+            self._check_health(connection)
 
         self._in_use_connections.add(connection)
+        wait_time = time.perf_counter() - started_at if waits else 0.0
+        self._record('checkout', None, wait_time)
         return connection
 
     def release(self, connection):
@@ -358,15 +491,21 @@ class BlockingConnectionPool(ConnectionPool):
         if connection.awaiting_response:
             connection.disconnect()
             connection = None
+            self._record('discarded', None, 1)
 
         try:
             self._pool.put_nowait(connection)
         except asyncio.QueueFull:
             # perhaps the pool have been reset() ?
-            pass
+            return
+
+        if connection is not None:
+            self._idle_connections[connection] = None
+            self._start_idle_reaper()
 
     def disconnect(self):
         """Closes all connections in the pool"""
+        self._stop_idle_reaper()
         pooled_connections = []
         while True:
             try:
@@ -380,6 +519,7 @@ class BlockingConnectionPool(ConnectionPool):
             except asyncio.QueueFull:
                 pass
 
+        self._idle_connections.clear()
         all_conns = chain(pooled_connections,
                           self._in_use_connections)
         for connection in all_conns:
@@ -395,7 +535,7 @@ class ClusterConnectionPool(ConnectionPool):
     def __init__(self, startup_nodes=None, connection_class=ClusterConnection,
                  max_connections=None, max_connections_per_node=False, reinitialize_steps=None,
                  skip_full_coverage_check=False, nodemanager_follow_cluster=False, readonly=False,
-                 max_idle_time=0, idle_check_interval=1,
+                 nodemanager_quorum=1, nodemanager_refresh_interval=0, max_idle_time=0, idle_check_interval=1, min_connections=0,
                  **connection_kwargs):
         """
         :skip_full_coverage_check:
@@ -405,9 +545,19 @@ class ClusterConnectionPool(ConnectionPool):
             The node manager will during initialization try the last set of nodes that
             it was operating on. This will allow the client to drift along side the cluster
             if the cluster nodes move around alot.
+        :nodemanager_quorum:
+            Number of startup nodes which have to return the same slots for them
+            to be used. The startup nodes are asked at the same time.
+        :nodemanager_refresh_interval:
+            Seconds between the refreshes of the slots cache in the background,
+            besides the ones after MOVED redirections. Never by default.
+        :min_connections:
+            Number of connections per node opened by warm_up() and kept open
+            when idle connections are closed.
         """
         super().__init__(
-            connection_class=connection_class, max_connections=max_connections)
+            connection_class=connection_class, max_connections=max_connections,
+            min_connections=min_connections)
 
         # Special case to make from_url method compliant with cluster setting.
         # from_url method will send in the ip and port through a different variable then the
@@ -427,6 +577,8 @@ class ClusterConnectionPool(ConnectionPool):
             skip_full_coverage_check=skip_full_coverage_check,
             max_connections=self.max_connections,
             nodemanager_follow_cluster=nodemanager_follow_cluster,
+            nodemanager_quorum=nodemanager_quorum,
+            nodemanager_refresh_interval=nodemanager_refresh_interval,
             **connection_kwargs,
         )
         self.initialized = False
@@ -437,6 +589,7 @@ class ClusterConnectionPool(ConnectionPool):
         self.readonly = readonly
         self.max_idle_time = max_idle_time
         self.idle_check_interval = idle_check_interval
+        self._stats = defaultdict(PoolStats)  # Dict(Node, PoolStats)
         self.reset()
 
         if 'stream_timeout' not in self.connection_kwargs:
@@ -453,23 +606,43 @@ class ClusterConnectionPool(ConnectionPool):
 
     async def initialize(self):
         if not self.initialized:
-            await self.nodes.initialize()
+            # concurrent callers share the same initialization
+            await self.nodes.refresh()
+            self.nodes.start_refresh_timer()
             self.initialized = True
 
-    async def disconnect_on_idle_time_exceeded(self, connection):
-        while True:
-            if (time.time() - connection.last_active_at > self.max_idle_time
-                    and not connection.awaiting_response):
-                connection.disconnect()
-                node = connection.node
-                try:
-                    self._available_connections[node['name']].remove(
-                        connection)
-                except ValueError:
-                    pass
-                self._created_connections_per_node[node['name']] -= 1
-                break
-            await asyncio.sleep(self.idle_check_interval)
+    def disconnect_idle_connections(self):
+        """
+        Closes the available connections idle for more than max_idle_time on
+        every node, keeping at least min_connections connections per node, and
+        returns whether some idle connections could still be closed later on
+        """
+        expired_before = time.time() - self.max_idle_time
+        closable_left = False
+        for name, connections in self._available_connections.items():
+            closable = min(len(connections),
+                           self._created_connections_per_node[name] - self.min_connections)
+            expired = 0
+            while expired < closable and connections[expired].last_active_at < expired_before:
+                connections[expired].disconnect()
+                expired += 1
+            if expired:
+                del connections[:expired]
+                self._created_connections_per_node[name] -= expired
+                self._record('idle_closed', name, expired)
+            closable_left = closable_left or closable > expired
+        return closable_left
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool counters for every node, along with the
+        number of connections to the node in use and idle
+        """
+        return {
+            name: stats.snapshot(len(self._in_use_connections.get(name, ())),
+                                 len(self._available_connections.get(name, ())))
+            for name, stats in self._stats.items()
+        }
 
     def reset(self):
         """Resets the connection pool back to a clean state"""
@@ -477,6 +650,7 @@ class ClusterConnectionPool(ConnectionPool):
         self._created_connections_per_node = {}  # Dict(Node, Int)
         self._available_connections = {}  # Dict(Node, List)
         self._in_use_connections = {}  # Dict(Node, Set)
+        self._stop_idle_reaper()
         self._check_lock = threading.Lock()
         self.initialized = False
 
@@ -505,19 +679,7 @@ class ClusterConnectionPool(ConnectionPool):
         node = self.get_master_node_by_slot(slot)
 
         self._checkpid()
-
-        try:
-            connection = self._available_connections.get(
-                node['name'], []).pop()
-        except IndexError:
-            connection = self.make_connection(node)
-
-        if node['name'] not in self._in_use_connections:
-            self._in_use_connections[node['name']] = set()
-
-        self._in_use_connections[node['name']].add(connection)
-
-        return connection
+        return self._checkout(node)
 
     def make_connection(self, node):
         """Creates a new connection"""
@@ -532,18 +694,35 @@ class ClusterConnectionPool(ConnectionPool):
 
         self._created_connections_per_node.setdefault(node['name'], 0)
         self._created_connections_per_node[node['name']] += 1
+        self._record('created', node['name'], 1)
         connection = self.connection_class(host=node['host'],
                                            port=node['port'],
                                            **self.connection_kwargs)
 
         # Must store node in the connection to make it eaiser to track
         connection.node = node
-        if self.max_idle_time > self.idle_check_interval > 0:
-            # do not await the future
-            asyncio.ensure_future(
-                self.disconnect_on_idle_time_exceeded(connection))
+        if self.track_traffic:
+            connection.track_traffic()
         return connection
 
+    async def warm_up(self):
+        """
+        Opens connections to every node serving slots concurrently, until
+        min_connections of them are connected per node
+        """
+        await self.initialize()
+        nodes = list(self.nodes.all_nodes() if self.readonly else self.nodes.all_masters())
+        if not self.max_connections_per_node and self.min_connections * len(nodes) > self.max_connections:
+            raise RedisClusterException('Too many connections to open min_connections per node')
+
+        async def check_out(connections):
+            for node in nodes:
+                in_use = len(self._in_use_connections.get(node['name'], ()))
+                for _ in range(self.min_connections - in_use):
+                    connections.append(self.get_connection_by_node(node))
+
+        await self._connect_and_release(check_out)
+
     def release(self, connection):
         """Releases the connection back to the pool"""
         self._checkpid()
@@ -565,12 +744,19 @@ class ClusterConnectionPool(ConnectionPool):
             # error raised
             if self._created_connections_per_node.get(connection.node['name']):
                 self._created_connections_per_node[connection.node['name']] -= 1
+            self._record('discarded', connection.node['name'], 1)
         else:
             self._available_connections.setdefault(
                 connection.node['name'], []).append(connection)
+            self._start_idle_reaper()
 
     def disconnect(self):
-        """Closes all connectins in the pool"""
+        """
+        Closes all connectins in the pool, and stops the periodic refreshes
+        of the slots cache until it is initialized again
+        """
+        self.nodes.close()
+        self._stop_idle_reaper()
         all_conns = chain(
             self._available_connections.values(),
             self._in_use_connections.values(),
@@ -593,7 +779,9 @@ class ClusterConnectionPool(ConnectionPool):
             conn_list = self._available_connections[node_name]
             # check it in case of empty connection list
             if conn_list:
-                return conn_list.pop()
+                connection = conn_list.pop()
+                self._check_health(connection)
+                return connection
         for node in self.nodes.random_startup_node_iter():
             connection = self.get_connection_by_node(node)
 
@@ -625,23 +813,184 @@ class ClusterConnectionPool(ConnectionPool):
         """Gets a connection by node"""
         self._checkpid()
         self.nodes.set_node_name(node)
+        return self._checkout(node)
 
+    def _checkout(self, node, wait_time=0.0):
         try:
             # Try to get connection from existing pool
             connection = self._available_connections.get(
                 node['name'], []).pop()
         except IndexError:
             connection = self.make_connection(node)
+        else:
+            self._check_health(connection)
 
         self._in_use_connections.setdefault(
             node['name'], set()).add(connection)
+        self._record('checkout', node['name'], wait_time)
 
         return connection
 
     def get_master_node_by_slot(self, slot):
-        return self.nodes.slots[slot][0]
+        return self.nodes.slots.master(slot)
 
     def get_node_by_slot(self, slot):
         if self.readonly:
-            return random.choice(self.nodes.slots[slot])
+            return random.choice(self.nodes.slots.serving_nodes(slot))
         return self.get_master_node_by_slot(slot)
+
+    async def acquire_connection_by_node(self, node):
+        """
+        Gets a connection by node, waiting for one to be available in pools
+        that block when their limit is reached
+        """
+        return self.get_connection_by_node(node)
+
+    async def acquire_random_connection(self):
+        """
+        Gets a connection to a random node, waiting for one to be available
+        in pools that block when their limit is reached
+        """
+        return self.get_random_connection()
+
+
+class BlockingClusterConnectionPool(ClusterConnectionPool):
+    """
+    Blocking connection pool for rediscluster::
+
+        >>> from yaaredis import StrictRedisCluster
+        >>> pool = BlockingClusterConnectionPool(
+        ...     startup_nodes=[{'host': '127.0.0.1', 'port': 7000}],
+        ...     max_connections=32)
+        >>> client = StrictRedisCluster(connection_pool=pool)
+
+    When ``max_connections`` (or ``max_connections_per_node``) connections are
+    in use, rather than raising a
+    :py:class:`~yaaredis.RedisClusterException`, the clients wait for a
+    connection to be released, in the order they asked for one to each node.
+
+    Use ``timeout`` to tell it either how many seconds to wait for a connection
+    to become available, or to block forever:
+
+        >>> # Block forever.
+        >>> pool = BlockingClusterConnectionPool(timeout=None)
+
+        >>> # Raise a ``ConnectionError`` after five seconds if a connection is
+        >>> # not available.
+        >>> pool = BlockingClusterConnectionPool(timeout=5)
+    """
+
+    def __init__(self, startup_nodes=None, timeout=20, **kwargs):
+        self.timeout = timeout
+        # Dict(Node name, (Node, Deque((Future, wait start time)))) of the
+        # clients waiting for a connection to each node
+        self._waiters = {}
+
+        super().__init__(startup_nodes=startup_nodes, **kwargs)
+
+    def reset(self):
+        waiters, self._waiters = self._waiters, {}
+        for _, node_waiters in waiters.values():
+            for waiter, _ in node_waiters:
+                if not waiter.done():
+                    waiter.set_exception(ConnectionError('Connection pool was reset.'))
+
+        super().reset()
+
+    async def acquire_connection_by_node(self, node):
+        """
+        Gets a connection by node, waiting up to timeout seconds for one to be
+        released when the pool is full
+        """
+        self._checkpid()
+        self.nodes.set_node_name(node)
+
+        if node['name'] not in self._waiters and self._make_room(node):
+            return self.get_connection_by_node(node)
+
+        waiter = asyncio.get_event_loop().create_future()
+        started_at = time.perf_counter()
+        self._waiters.setdefault(node['name'], (node, deque()))[1].append(
+            (waiter, started_at))
+        try:
+            return await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError as e:
+            wait_time = time.perf_counter() - started_at
+            self._record('timeout', node['name'], wait_time)
+            raise ConnectionError('No connection available.') from e
+        except CancelledError:
+            # the connection may have been handed over right before
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self.release(waiter.result())
+            raise
+        finally:
+            self._remove_waiter(node, waiter)
+
+    async def acquire_random_connection(self):
+        """Gets a connection to a random startup node, see acquire_connection_by_node"""
+        return await self.acquire_connection_by_node(
+            next(self.nodes.random_startup_node_iter()))
+
+    def release(self, connection):
+        """
+        Releases the connection, handing it over to the oldest client waiting
+        for a connection to its node if any
+        """
+        super().release(connection)
+        if connection.pid != self.pid or not self._waiters:
+            return
+
+        self._serve_waiters(connection.node)
+        if self.max_connections_per_node:
+            return
+        # the limit is shared by all nodes, so clients waiting for the other
+        # nodes are served with the room left by this connection
+        for node, _ in list(self._waiters.values()):
+            if self._make_room(node):
+                self._serve_waiters(node)
+
+    def _has_room(self, node):
+        return bool(self._available_connections.get(node['name'])
+                    or self.count_all_num_connections(node) < self.max_connections)
+
+    def _make_room(self, node):
+        """
+        Returns whether a connection to the node can be got without going over
+        the limits, closing an idle connection to another node to make room
+        for it if needed
+        """
+        if self._has_room(node) or self.max_connections_per_node:
+            return self._has_room(node)
+        for name, connections in self._available_connections.items():
+            if connections:
+                connections.pop(0).disconnect()
+                self._created_connections_per_node[name] -= 1
+                self._record('idle_closed', name, 1)
+                return True
+        return False
+
+    def _remove_waiter(self, node, waiter):
+        if node['name'] not in self._waiters:
+            return
+        waiters = self._waiters[node['name']][1]
+        for entry in waiters:
+            if entry[0] is waiter:
+                waiters.remove(entry)
+                break
+        else:
+            # already served
+            return
+        if not waiters:
+            del self._waiters[node['name']]
+
+    def _serve_waiters(self, node):
+        if node['name'] not in self._waiters:
+            return
+        waiters = self._waiters[node['name']][1]
+        while waiters and self._has_room(node):
+            waiter, started_at = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(
+                    self._checkout(node, time.perf_counter() - started_at))
+        if not waiters:
+            del self._waiters[node['name']]
@@ -0,0 +1,192 @@
+import asyncio
+from collections import deque
+
+from yaaredis.connection import BaseParser
+from yaaredis.connection import ClusterConnection
+from yaaredis.connection import Connection
+from yaaredis.connection import exec_with_timeout
+from yaaredis.connection import HIREDIS_AVAILABLE
+from yaaredis.connection import PythonParser
+from yaaredis.connection import SocketBuffer
+from yaaredis.connection import SPEEDUPS_AVAILABLE
+from yaaredis.exceptions import ConnectionError  # pylint: disable=redefined-builtin
+from yaaredis.exceptions import InvalidResponse
+from yaaredis.exceptions import ResponseError
+
+if HIREDIS_AVAILABLE:
+    import hiredis
+if SPEEDUPS_AVAILABLE:
+    # pylint: disable=no-name-in-module
+    from yaaredis.speedups import Reader as SpeedupsReader
+
+
+class PythonReader(PythonParser):
+    """
+    Pure Python counterpart of ``hiredis.Reader``, i.e., a PythonParser which
+    is fed data instead of reading it from a stream.
+
+    Like the hiredis reader, it returns error replies as plain instances of
+    ``replyError``, leaving it to the caller to map them to exception classes.
+    """
+
+    def __init__(self, protocolError=InvalidResponse, replyError=ResponseError,
+                 encoding=None):
+        # pylint: disable=invalid-name,unused-argument
+        super().__init__(0)
+        self._buffer = SocketBuffer(None, 0)
+        self._reply_error = replyError
+        self.encoding = encoding
+
+    def feed(self, data):
+        self._buffer.feed(data)
+
+    def parse_error(self, response):
+        return self._reply_error(response)
+
+
+class RedisProtocol(asyncio.Protocol):
+    """
+    Receives the replies for a ProtocolConnection.
+
+    Data is fed to the reader as soon as the transport receives it, and each
+    complete reply resolves the oldest pending read. Replies nobody waits for
+    yet, e.g., pubsub messages, are queued until they are read.
+    """
+
+    def __init__(self):
+        self.reader = None
+        self.transport = None
+        self._waiters = deque()
+        self._replies = deque()
+        self._exception = None
+        # TrafficCounter of the connection, if it tracks its traffic
+        self.traffic = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        reader = self.reader
+        waiters = self._waiters
+        if self.traffic is not None:
+            self.traffic.data_received(data)
+        reader.feed(data)
+        try:
+            response = reader.gets()
+            while response is not False:
+                # reads which have been cancelled are not waiting anymore
+                while waiters and waiters[0].done():
+                    waiters.popleft()
+                if waiters:
+                    waiters.popleft().set_result(response)
+                else:
+                    self._replies.append(response)
+                response = reader.gets()
+        except Exception as exc:
+            # fail the pending reads rather than the transport's callback
+            self._set_exception(exc)
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self._set_exception(ConnectionError('Socket closed on remote end'))
+
+    def _set_exception(self, exc):
+        if self._exception is None:
+            self._exception = exc
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(self._exception)
+
+    def has_reply(self):
+        return bool(self._replies)
+
+    async def read_reply(self):
+        if self._replies:
+            return self._replies.popleft()
+        if self._exception is not None:
+            raise self._exception
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append(waiter)
+        return await waiter
+
+
+class ProtocolParser(BaseParser):
+    """
+    Parser class for ProtocolConnection. The replies are parsed by the
+    connection's RedisProtocol, using the hiredis reader if it is installed,
+    then the one of the ``yaaredis.speedups`` C extension and PythonReader
+    otherwise.
+    """
+
+    if HIREDIS_AVAILABLE:
+        reader_class = hiredis.Reader
+    elif SPEEDUPS_AVAILABLE:
+        reader_class = SpeedupsReader
+    else:
+        reader_class = PythonReader
+
+    def __init__(self, read_size):
+        # pylint: disable=unused-argument
+        # the transport decides how much data it reads at once
+        self._protocol = None
+
+    def on_connect(self, connection):
+        # pylint: disable=protected-access
+        self._protocol = connection._reader
+        kwargs = {
+            'protocolError': InvalidResponse,
+            'replyError': ResponseError,
+        }
+        if connection.decode_responses:
+            kwargs['encoding'] = connection.encoding
+        self._protocol.reader = self.reader_class(**kwargs)
+
+    def on_disconnect(self):
+        self._protocol = None
+
+    def can_read(self):
+        if self._protocol is None:
+            raise ConnectionError('Socket closed on remote end')
+        return self._protocol.has_reply()
+
+    async def read_response(self):
+        if self._protocol is None:
+            raise ConnectionError('Socket closed on remote end')
+        response = await self._protocol.read_reply()
+        if isinstance(response, ResponseError):
+            response = self.parse_error(response.args[0])
+        return response
+
+
+class ProtocolConnection(Connection):
+    """
+    TCP connection built on an ``asyncio.Protocol`` instead of streams.
+
+    Replies are parsed as soon as the transport receives data, without going
+    through a StreamReader's buffer and a coroutine per chunk, and they
+    resolve the pending reads in FIFO order. Its ``parser_class`` has to be a
+    ProtocolParser.
+    """
+
+    def __init__(self, *args, parser_class=ProtocolParser, **kwargs):
+        super().__init__(*args, parser_class=parser_class, **kwargs)
+
+    def _track_reader(self):
+        self._reader.traffic = self._traffic
+
+    async def _connect(self):
+        transport, protocol = await exec_with_timeout(
+            asyncio.get_event_loop().create_connection(
+                RedisProtocol, host=self.host, port=self.port,
+                ssl=self.ssl_context),
+            self._connect_timeout,
+        )
+        self._reader = protocol
+        self._writer = transport
+        self._set_socket_options(transport)
+        await self.on_connect()
+
+
+class ClusterProtocolConnection(ProtocolConnection, ClusterConnection):
+    'ClusterConnection built on an asyncio.Protocol, see ProtocolConnection'
@@ -1,6 +1,8 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <limits.h>
 #include <stdint.h>
+#include <string.h>
 
 static const uint16_t crc16tab[256]= {
     0x0000,0x1021,0x2042,0x3063,0x4084,0x50a5,0x60c6,0x70e7,
@@ -123,10 +125,741 @@ static PyObject* hash_slot(PyObject* self, PyObject* args) {
 }
 
 
+/* RESP reply reader
+ *
+ * Incrementally parses RESP2 replies with the same feed()/gets() interface as
+ * hiredis.Reader: feed() appends raw socket data to an internal buffer and
+ * gets() returns the next complete reply, or False when more data is needed.
+ * Partially read multi-bulk replies are kept on an explicit stack so gets()
+ * resumes where it stopped instead of parsing the reply again.
+ */
+
+typedef struct {
+    PyObject *items;    /* list being filled, its size is the element count */
+    Py_ssize_t index;   /* number of elements already set */
+} ReaderTask;
+
+typedef struct {
+    PyObject_HEAD
+    char *buf;
+    Py_ssize_t pos;     /* offset of the first unread byte */
+    Py_ssize_t len;     /* number of bytes in the buffer */
+    Py_ssize_t cap;
+    ReaderTask *stack;
+    Py_ssize_t depth;
+    Py_ssize_t stack_cap;
+    Py_ssize_t bulk_length;     /* -1 unless a bulk header was already read */
+    PyObject *protocol_error;
+    PyObject *reply_error;
+    char *encoding;
+    char *errors;
+} Reader;
+
+
+static void Reader_clear_stack(Reader *self) {
+    while (self->depth > 0) {
+        self->depth--;
+        Py_CLEAR(self->stack[self->depth].items);
+    }
+    self->bulk_length = -1;
+}
+
+
+static void Reader_dealloc(Reader *self) {
+    Reader_clear_stack(self);
+    PyMem_Free(self->stack);
+    PyMem_Free(self->buf);
+    PyMem_Free(self->encoding);
+    PyMem_Free(self->errors);
+    Py_XDECREF(self->protocol_error);
+    Py_XDECREF(self->reply_error);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+
+static char *copy_string(const char *value) {
+    size_t size = strlen(value) + 1;
+    char *copy = PyMem_Malloc(size);
+    if (copy == NULL) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+    memcpy(copy, value, size);
+    return copy;
+}
+
+
+static int Reader_init(Reader *self, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {"protocolError", "replyError", "encoding",
+                             "errors", NULL};
+    PyObject *protocol_error = NULL;
+    PyObject *reply_error = NULL;
+    const char *encoding = NULL;
+    const char *errors = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OOzz", kwlist,
+                                     &protocol_error, &reply_error,
+                                     &encoding, &errors)) {
+        return -1;
+    }
+
+    if (protocol_error == NULL || protocol_error == Py_None) {
+        protocol_error = PyExc_RuntimeError;
+    }
+    if (reply_error == NULL || reply_error == Py_None) {
+        reply_error = PyExc_Exception;
+    }
+    if (!PyCallable_Check(protocol_error) || !PyCallable_Check(reply_error)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "protocolError and replyError must be callable");
+        return -1;
+    }
+    Py_INCREF(protocol_error);
+    Py_XSETREF(self->protocol_error, protocol_error);
+    Py_INCREF(reply_error);
+    Py_XSETREF(self->reply_error, reply_error);
+
+    PyMem_Free(self->encoding);
+    self->encoding = NULL;
+    PyMem_Free(self->errors);
+    self->errors = NULL;
+    if (encoding != NULL && (self->encoding = copy_string(encoding)) == NULL) {
+        return -1;
+    }
+    if (errors != NULL && (self->errors = copy_string(errors)) == NULL) {
+        return -1;
+    }
+
+    Reader_clear_stack(self);
+    self->pos = 0;
+    self->len = 0;
+    return 0;
+}
+
+
+static PyObject *Reader_feed(Reader *self, PyObject *args) {
+    Py_buffer data;
+    Py_ssize_t unread, needed;
+
+    if (!PyArg_ParseTuple(args, "y*", &data)) {
+        return NULL;
+    }
+
+    /* drop the consumed prefix before growing the buffer */
+    unread = self->len - self->pos;
+    if (self->pos > 0) {
+        if (unread > 0) {
+            memmove(self->buf, self->buf + self->pos, unread);
+        }
+        self->pos = 0;
+        self->len = unread;
+    }
+
+    needed = unread + data.len;
+    if (needed > self->cap) {
+        Py_ssize_t cap = self->cap ? self->cap : 4096;
+        char *buf;
+        while (cap < needed) {
+            cap *= 2;
+        }
+        buf = PyMem_Realloc(self->buf, cap);
+        if (buf == NULL) {
+            PyBuffer_Release(&data);
+            return PyErr_NoMemory();
+        }
+        self->buf = buf;
+        self->cap = cap;
+    }
+
+    memcpy(self->buf + self->len, data.buf, data.len);
+    self->len += data.len;
+    PyBuffer_Release(&data);
+    Py_RETURN_NONE;
+}
+
+
+/* Drops the partially read reply and the buffered data after an error:
+ * the stream is out of sync, nothing buffered can be trusted anymore */
+static PyObject *Reader_abort(Reader *self) {
+    Reader_clear_stack(self);
+    self->pos = 0;
+    self->len = 0;
+    return NULL;
+}
+
+
+static PyObject *Reader_protocol_error(Reader *self, const char *message) {
+    PyObject *error = PyObject_CallFunction(self->protocol_error, "s", message);
+    if (error != NULL) {
+        PyErr_SetObject((PyObject *)Py_TYPE(error), error);
+        Py_DECREF(error);
+    }
+    return Reader_abort(self);
+}
+
+
+static int parse_length(const char *p, Py_ssize_t len, long long *value) {
+    int negative = 0;
+    unsigned long long result = 0;
+    Py_ssize_t i = 0;
+
+    if (len > 0 && p[0] == '-') {
+        negative = 1;
+        i = 1;
+    }
+    if (i == len || len - i > 19) {
+        return -1;
+    }
+    for (; i < len; i++) {
+        if (p[i] < '0' || p[i] > '9') {
+            return -1;
+        }
+        result = result * 10 + (p[i] - '0');
+    }
+    if (result > (unsigned long long)LLONG_MAX + negative) {
+        return -1;
+    }
+    *value = negative ? (long long)(0 - result) : (long long)result;
+    return 0;
+}
+
+
+static PyObject *Reader_make_string(Reader *self, const char *p,
+                                    Py_ssize_t len) {
+    if (self->encoding != NULL) {
+        return PyUnicode_Decode(p, len, self->encoding, self->errors);
+    }
+    return PyBytes_FromStringAndSize(p, len);
+}
+
+
+static PyObject *Reader_make_error(Reader *self, const char *p,
+                                   Py_ssize_t len) {
+    PyObject *message = PyUnicode_DecodeUTF8(p, len, "replace");
+    PyObject *error;
+    if (message == NULL) {
+        return NULL;
+    }
+    error = PyObject_CallFunctionObjArgs(self->reply_error, message, NULL);
+    Py_DECREF(message);
+    return error;
+}
+
+
+static int Reader_push(Reader *self, Py_ssize_t size) {
+    PyObject *items;
+    if (self->depth == self->stack_cap) {
+        Py_ssize_t cap = self->stack_cap ? self->stack_cap * 2 : 8;
+        ReaderTask *stack = PyMem_Realloc(self->stack,
+                                          cap * sizeof(ReaderTask));
+        if (stack == NULL) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        self->stack = stack;
+        self->stack_cap = cap;
+    }
+    items = PyList_New(size);
+    if (items == NULL) {
+        return -1;
+    }
+    self->stack[self->depth].items = items;
+    self->stack[self->depth].index = 0;
+    self->depth++;
+    return 0;
+}
+
+
+static PyObject *Reader_gets(Reader *self, PyObject *Py_UNUSED(ignored)) {
+    PyObject *reply;
+
+    for (;;) {
+        if (self->bulk_length >= 0) {
+            Py_ssize_t length = self->bulk_length;
+            if (self->len - self->pos < length + 2) {
+                Py_RETURN_FALSE;
+            }
+            reply = Reader_make_string(self, self->buf + self->pos, length);
+            if (reply == NULL) {
+                return Reader_abort(self);
+            }
+            self->pos += length + 2;
+            self->bulk_length = -1;
+        } else {
+            const char *start = self->buf + self->pos;
+            const char *end = self->buf + self->len;
+            const char *line, *cr;
+            long long value;
+            char type;
+
+            /* find the \r\n terminating the line */
+            cr = start;
+            for (;;) {
+                cr = memchr(cr, '\r', end - cr);
+                if (cr == NULL || cr + 1 >= end) {
+                    Py_RETURN_FALSE;
+                }
+                if (cr[1] == '\n') {
+                    break;
+                }
+                cr++;
+            }
+            if (cr == start) {
+                return Reader_protocol_error(self, "Protocol error, got "
+                                             "an empty line");
+            }
+
+            type = start[0];
+            line = start + 1;
+            self->pos = cr + 2 - self->buf;
+
+            switch (type) {
+            case '$':
+            case '*':
+                if (parse_length(line, cr - line, &value) < 0 || value < -1
+                        || value > PY_SSIZE_T_MAX - 2) {
+                    return Reader_protocol_error(self, "Protocol error, "
+                                                 "invalid length");
+                }
+                if (value == -1) {
+                    Py_INCREF(Py_None);
+                    reply = Py_None;
+                } else if (type == '$') {
+                    self->bulk_length = (Py_ssize_t)value;
+                    continue;
+                } else if (value > 0) {
+                    if (Reader_push(self, (Py_ssize_t)value) < 0) {
+                        return Reader_abort(self);
+                    }
+                    continue;
+                } else {
+                    reply = PyList_New(0);
+                }
+                break;
+            case ':':
+                if (parse_length(line, cr - line, &value) < 0) {
+                    return Reader_protocol_error(self, "Protocol error, "
+                                                 "invalid integer");
+                }
+                reply = PyLong_FromLongLong(value);
+                break;
+            case '+':
+                reply = Reader_make_string(self, line, cr - line);
+                break;
+            case '-':
+                reply = Reader_make_error(self, line, cr - line);
+                break;
+            default:
+                {
+                    char message[64];
+                    PyOS_snprintf(message, sizeof(message), "Protocol error, "
+                                  "got \"%c\" as reply type byte", type);
+                    return Reader_protocol_error(self, message);
+                }
+            }
+            if (reply == NULL) {
+                return Reader_abort(self);
+            }
+        }
+
+        /* hand the reply to the multi-bulk replies it completes */
+        while (self->depth > 0) {
+            ReaderTask *task = &self->stack[self->depth - 1];
+            PyList_SET_ITEM(task->items, task->index, reply);
+            task->index++;
+            if (task->index < PyList_GET_SIZE(task->items)) {
+                reply = NULL;
+                break;
+            }
+            reply = task->items;
+            task->items = NULL;
+            self->depth--;
+        }
+        if (reply != NULL) {
+            if (self->pos == self->len) {
+                self->pos = 0;
+                self->len = 0;
+            }
+            return reply;
+        }
+    }
+}
+
+
+static PyObject *Reader_len(Reader *self, PyObject *Py_UNUSED(ignored)) {
+    return PyLong_FromSsize_t(self->len - self->pos);
+}
+
+
+static PyObject *Reader_has_data(Reader *self,
+                                 PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(self->len > self->pos);
+}
+
+
+static PyMethodDef Reader_methods[] = {
+    {"feed", (PyCFunction)Reader_feed, METH_VARARGS,
+     "append raw data received from the socket"},
+    {"gets", (PyCFunction)Reader_gets, METH_NOARGS,
+     "parse the next reply, returns False if it is incomplete"},
+    {"len", (PyCFunction)Reader_len, METH_NOARGS,
+     "number of unparsed bytes in the buffer"},
+    {"has_data", (PyCFunction)Reader_has_data, METH_NOARGS,
+     "whether there are unparsed bytes in the buffer"},
+    {NULL, NULL, 0, NULL}
+};
+
+
+static PyTypeObject ReaderType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "yaaredis.speedups.Reader",
+    .tp_doc = "Incremental RESP reply reader",
+    .tp_basicsize = sizeof(Reader),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = PyType_GenericNew,
+    .tp_init = (initproc)Reader_init,
+    .tp_dealloc = (destructor)Reader_dealloc,
+    .tp_methods = Reader_methods,
+};
+
+
+
+/* Command packer
+ *
+ * Serializes commands into the RESP protocol. Arguments are encoded straight
+ * into one growing buffer; arguments larger than PACK_LARGE_ARG are handed
+ * over as separate chunks so their data isn't copied. The result is a list of
+ * bytes chunks that can be passed to the connection's writelines().
+ */
+
+#define PACK_LARGE_ARG 6000
+
+typedef struct {
+    char *buf;
+    Py_ssize_t len;
+    Py_ssize_t cap;
+    PyObject *chunks;
+} Packer;
+
+
+static int packer_reserve(Packer *packer, Py_ssize_t size) {
+    Py_ssize_t cap;
+    char *buf;
+
+    if (packer->len + size <= packer->cap) {
+        return 0;
+    }
+    cap = packer->cap ? packer->cap : 1024;
+    while (cap < packer->len + size) {
+        cap *= 2;
+    }
+    buf = PyMem_Realloc(packer->buf, cap);
+    if (buf == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    packer->buf = buf;
+    packer->cap = cap;
+    return 0;
+}
+
+
+static int packer_write(Packer *packer, const char *data, Py_ssize_t size) {
+    if (packer_reserve(packer, size) < 0) {
+        return -1;
+    }
+    memcpy(packer->buf + packer->len, data, size);
+    packer->len += size;
+    return 0;
+}
+
+
+static int packer_write_header(Packer *packer, char type, Py_ssize_t value) {
+    char header[32];
+    int size = PyOS_snprintf(header, sizeof(header), "%c%zd\r\n", type, value);
+    return packer_write(packer, header, size);
+}
+
+
+/* moves the buffered data into a new chunk */
+static int packer_flush(Packer *packer) {
+    PyObject *chunk;
+    int result;
+
+    if (packer->len == 0) {
+        return 0;
+    }
+    chunk = PyBytes_FromStringAndSize(packer->buf, packer->len);
+    if (chunk == NULL) {
+        return -1;
+    }
+    result = PyList_Append(packer->chunks, chunk);
+    Py_DECREF(chunk);
+    packer->len = 0;
+    return result;
+}
+
+
+static int packer_write_bulk(Packer *packer, PyObject *bytes) {
+    Py_ssize_t size = PyBytes_GET_SIZE(bytes);
+
+    if (packer_write_header(packer, '$', size) < 0) {
+        return -1;
+    }
+    if (size > PACK_LARGE_ARG) {
+        if (packer_flush(packer) < 0 || PyList_Append(packer->chunks, bytes) < 0) {
+            return -1;
+        }
+    } else if (packer_write(packer, PyBytes_AS_STRING(bytes), size) < 0) {
+        return -1;
+    }
+    return packer_write(packer, "\r\n", 2);
+}
+
+
+/* Returns a new reference to the bytes representation of ``value``, with the
+ * same rules as BaseConnection.encode() */
+static PyObject *encode_arg(PyObject *value, const char *encoding) {
+    PyObject *text, *result;
+
+    if (PyBytes_Check(value)) {
+        Py_INCREF(value);
+        return value;
+    }
+    if (PyLong_CheckExact(value)) {
+        int overflow;
+        long long number = PyLong_AsLongLongAndOverflow(value, &overflow);
+        if (!overflow && !(number == -1 && PyErr_Occurred())) {
+            char digits[32];
+            int size = PyOS_snprintf(digits, sizeof(digits), "%lld", number);
+            return PyBytes_FromStringAndSize(digits, size);
+        }
+        PyErr_Clear();
+    }
+
+    if (PyUnicode_Check(value)) {
+        Py_INCREF(value);
+        text = value;
+    } else if (PyFloat_Check(value)) {
+        text = PyObject_Repr(value);
+    } else {
+        text = PyObject_Str(value);
+    }
+    if (text == NULL) {
+        return NULL;
+    }
+
+    if (PyLong_Check(value) || PyFloat_Check(value)) {
+        result = PyUnicode_AsLatin1String(text);
+    } else {
+        result = PyUnicode_AsEncodedString(text, encoding, "strict");
+    }
+    Py_DECREF(text);
+    return result;
+}
+
+
+static int pack_args(Packer *packer, PyObject *args, const char *encoding) {
+    PyObject *seq, *command, *words = NULL;
+    PyObject **items;
+    Py_ssize_t nargs, nwords, i;
+    int result = -1;
+
+    seq = PySequence_Fast(args, "command arguments must be a sequence");
+    if (seq == NULL) {
+        return -1;
+    }
+    nargs = PySequence_Fast_GET_SIZE(seq);
+    items = PySequence_Fast_ITEMS(seq);
+    if (nargs == 0) {
+        PyErr_SetString(PyExc_ValueError, "empty command");
+        goto done;
+    }
+
+    /* the command name may include literal arguments, e.g. 'CONFIG GET',
+     * which the server expects as separate arguments */
+    command = items[0];
+    if (PyUnicode_Check(command) && PyUnicode_FindChar(
+            command, ' ', 0, PyUnicode_GET_LENGTH(command), 1) >= 0) {
+        words = PyObject_CallMethod(command, "split", NULL);
+    } else {
+        words = PyList_New(1);
+        if (words != NULL) {
+            Py_INCREF(command);
+            PyList_SET_ITEM(words, 0, command);
+        }
+    }
+    if (words == NULL) {
+        goto done;
+    }
+    nwords = PyList_GET_SIZE(words);
+
+    if (packer_write_header(packer, '*', nwords + nargs - 1) < 0) {
+        goto done;
+    }
+    for (i = 0; i < nwords + nargs - 1; i++) {
+        PyObject *arg, *encoded;
+        if (i < nwords) {
+            arg = PyList_GET_ITEM(words, i);
+            encoded = PyUnicode_Check(arg) ? PyUnicode_AsLatin1String(arg)
+                                           : encode_arg(arg, encoding);
+        } else {
+            arg = items[i - nwords + 1];
+            encoded = encode_arg(arg, encoding);
+        }
+        if (encoded == NULL) {
+            goto done;
+        }
+        if (packer_write_bulk(packer, encoded) < 0) {
+            Py_DECREF(encoded);
+            goto done;
+        }
+        Py_DECREF(encoded);
+    }
+    result = 0;
+
+done:
+    Py_XDECREF(words);
+    Py_DECREF(seq);
+    return result;
+}
+
+
+static PyObject *pack_finish(Packer *packer, int failed) {
+    if (!failed && packer_flush(packer) < 0) {
+        failed = 1;
+    }
+    PyMem_Free(packer->buf);
+    if (failed) {
+        Py_DECREF(packer->chunks);
+        return NULL;
+    }
+    return packer->chunks;
+}
+
+
+static PyObject* pack_command(PyObject* self, PyObject* args) {
+    PyObject *command;
+    const char *encoding = "utf-8";
+    Packer packer = {NULL, 0, 0, NULL};
+
+    if (!PyArg_ParseTuple(args, "O|s", &command, &encoding)) {
+        return NULL;
+    }
+    if ((packer.chunks = PyList_New(0)) == NULL) {
+        return NULL;
+    }
+    return pack_finish(&packer, pack_args(&packer, command, encoding) < 0);
+}
+
+
+static PyObject* pack_commands(PyObject* self, PyObject* args) {
+    PyObject *commands, *iterator, *command;
+    const char *encoding = "utf-8";
+    Packer packer = {NULL, 0, 0, NULL};
+    int failed = 0;
+
+    if (!PyArg_ParseTuple(args, "O|s", &commands, &encoding)) {
+        return NULL;
+    }
+    if ((iterator = PyObject_GetIter(commands)) == NULL) {
+        return NULL;
+    }
+    if ((packer.chunks = PyList_New(0)) == NULL) {
+        Py_DECREF(iterator);
+        return NULL;
+    }
+    while ((command = PyIter_Next(iterator)) != NULL) {
+        failed = pack_args(&packer, command, encoding) < 0;
+        Py_DECREF(command);
+        if (failed) {
+            break;
+        }
+    }
+    Py_DECREF(iterator);
+    if (PyErr_Occurred()) {
+        failed = 1;
+    }
+    return pack_finish(&packer, failed);
+}
+
+
+/* array.array, which hash_slots() returns the slots in */
+static PyObject *array_type = NULL;
+
+
+/* Hashes every key of a sequence to its slot, with the same encoding rules
+ * as NodeManager.encode(), and returns the slots in an array('H') */
+static PyObject* hash_slots(PyObject* self, PyObject* args) {
+    PyObject *keys, *seq, *buffer = NULL, *slots = NULL, *appended;
+    unsigned short *data;
+    Py_ssize_t count, i;
+
+    if (!PyArg_ParseTuple(args, "O", &keys)) {
+        return NULL;
+    }
+    seq = PySequence_Fast(keys, "keys must be a sequence");
+    if (seq == NULL) {
+        return NULL;
+    }
+    count = PySequence_Fast_GET_SIZE(seq);
+    buffer = PyBytes_FromStringAndSize(NULL, count * sizeof(unsigned short));
+    if (buffer == NULL) {
+        goto done;
+    }
+    data = (unsigned short *)PyBytes_AS_STRING(buffer);
+
+    for (i = 0; i < count; i++) {
+        PyObject *key = PySequence_Fast_GET_ITEM(seq, i);
+        const char *bytes;
+        Py_ssize_t size;
+
+        if (PyBytes_Check(key)) {
+            data[i] = _hash_slot(PyBytes_AS_STRING(key), (int)PyBytes_GET_SIZE(key));
+        } else if (PyUnicode_Check(key)) {
+            bytes = PyUnicode_AsUTF8AndSize(key, &size);
+            if (bytes == NULL) {
+                goto done;
+            }
+            data[i] = _hash_slot((char *)bytes, (int)size);
+        } else {
+            PyObject *encoded = encode_arg(key, "utf-8");
+            if (encoded == NULL) {
+                goto done;
+            }
+            data[i] = _hash_slot(PyBytes_AS_STRING(encoded), (int)PyBytes_GET_SIZE(encoded));
+            Py_DECREF(encoded);
+        }
+    }
+
+    slots = PyObject_CallFunction(array_type, "s", "H");
+    if (slots == NULL) {
+        goto done;
+    }
+    appended = PyObject_CallMethod(slots, "frombytes", "O", buffer);
+    if (appended == NULL) {
+        Py_CLEAR(slots);
+        goto done;
+    }
+    Py_DECREF(appended);
+
+done:
+    Py_XDECREF(buffer);
+    Py_DECREF(seq);
+    return slots;
+}
+
 
 static PyMethodDef methods[] = {
     {"crc16", crc16, METH_VARARGS, "crc16 used to hash key to slot"},
     {"hash_slot", hash_slot, METH_VARARGS, "hash key to a redis cluster slot"},
+    {"hash_slots", hash_slots, METH_VARARGS,
+     "hash a sequence of keys to an array of redis cluster slots"},
+    {"pack_command", pack_command, METH_VARARGS,
+     "pack a command into a list of RESP encoded chunks"},
+    {"pack_commands", pack_commands, METH_VARARGS,
+     "pack a sequence of commands into a list of RESP encoded chunks"},
     {NULL, NULL, 0, NULL}
 };
 
@@ -142,5 +875,29 @@ static struct PyModuleDef speedupsmodule = {
 
 PyMODINIT_FUNC
 PyInit_speedups(void) {
-    return PyModule_Create(&speedupsmodule);
+    PyObject *module, *array_module;
+
+    if (PyType_Ready(&ReaderType) < 0) {
+        return NULL;
+    }
+    array_module = PyImport_ImportModule("array");
+    if (array_module == NULL) {
+        return NULL;
+    }
+    array_type = PyObject_GetAttrString(array_module, "array");
+    Py_DECREF(array_module);
+    if (array_type == NULL) {
+        return NULL;
+    }
+    module = PyModule_Create(&speedupsmodule);
+    if (module == NULL) {
+        return NULL;
+    }
+    Py_INCREF(&ReaderType);
+    if (PyModule_AddObject(module, "Reader", (PyObject *)&ReaderType) < 0) {
+        Py_DECREF(&ReaderType);
+        Py_DECREF(module);
+        return NULL;
+    }
+    return module;
 }
@@ -1,2 +1,26 @@
+from array import array
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+
 def crc16(data: bytes) -> int: ...
 def hash_slot(key: bytes) -> int: ...
+def hash_slots(keys: Iterable[Union[str, bytes, int, float]]) -> array: ...
+def pack_command(args: Sequence[Any], encoding: str = ...) -> List[bytes]: ...
+def pack_commands(commands: Iterable[Sequence[Any]],
+                  encoding: str = ...) -> List[bytes]: ...
+
+
+class Reader:
+    def __init__(self, protocolError: Optional[Callable[[str], Exception]] = ...,
+                 replyError: Optional[Callable[[str], Exception]] = ...,
+                 encoding: Optional[str] = ..., errors: Optional[str] = ...) -> None: ...
+    def feed(self, data: bytes) -> None: ...
+    def gets(self) -> Any: ...
+    def len(self) -> int: ...
+    def has_data(self) -> bool: ...
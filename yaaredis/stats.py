@@ -0,0 +1,76 @@
+class PoolStats:
+    """
+    Counters of the connections of a pool, or of the connections to one node
+    for cluster pools
+    """
+    # pylint: disable=too-many-instance-attributes
+    __slots__ = ('created', 'discarded', 'idle_closed', 'checkouts', 'waits',
+                 'timeouts', 'wait_time', 'max_wait_time')
+
+    def __init__(self):
+        self.created = 0
+        # connections closed on release because of a reply left unread
+        self.discarded = 0
+        self.idle_closed = 0
+        self.checkouts = 0
+        # checkouts that had to wait for a connection to be released, and
+        # the seconds they waited for (timeouts included)
+        self.waits = 0
+        self.timeouts = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def record(self, event, value):
+        """Updates the counters for an event, see register_stats_callback()"""
+        if event == 'checkout':
+            self.checkouts += 1
+            if value:
+                self.record_wait(value)
+        elif event == 'timeout':
+            self.timeouts += 1
+            self.record_wait(value)
+        else:
+            setattr(self, event, getattr(self, event) + value)
+
+    def record_wait(self, wait_time):
+        self.waits += 1
+        self.wait_time += wait_time
+        if wait_time > self.max_wait_time:
+            self.max_wait_time = wait_time
+
+    def snapshot(self, in_use, idle):
+        stats = {name: getattr(self, name) for name in self.__slots__}
+        stats['in_use'] = in_use
+        stats['idle'] = idle
+        return stats
+
+
+class PoolStatsMixin:
+    """
+    Counts the events of a connection pool and notifies the stats callbacks
+    of them. The pool keeps its PoolStats in ``_stats``, or a mapping of the
+    PoolStats of every node for cluster pools.
+    """
+
+    def register_stats_callback(self, callback):
+        """
+        Registers a callback called as ``callback(event, node_name, value)``
+        on every change to the pool counters. ``event`` is one of:
+
+        - ``'created'``, ``'discarded'`` or ``'idle_closed'``, with the number
+          of connections as value
+        - ``'checkout'`` or ``'timeout'``, with the seconds waited for a
+          connection as value
+
+        ``node_name`` is None but for cluster pools.
+        """
+        self._stats_callbacks.append(callback)
+
+    def clear_stats_callbacks(self):
+        self._stats_callbacks = []
+
+    def _record(self, event, node_name, value):
+        stats = self._stats if node_name is None else self._stats[node_name]
+        stats.record(event, value)
+        for callback in self._stats_callbacks:
+            callback(event, node_name, value)
@@ -1,3 +1,4 @@
+from array import array
 from functools import wraps
 
 from .exceptions import ClusterDownError
@@ -8,6 +9,7 @@ _C_EXTENSION_SPEEDUP = False
 try:
     from .speedups import crc16  # pylint: disable=no-name-in-module,unused-import
     from .speedups import hash_slot  # pylint: disable=no-name-in-module,unused-import
+    from .speedups import hash_slots  # pylint: disable=no-name-in-module,unused-import
 
     _C_EXTENSION_SPEEDUP = True
 except Exception:
@@ -22,6 +24,62 @@ def nativestr(x):
     return x if isinstance(x, str) else x.decode('utf-8', 'replace')
 
 
+class Token(bytes):
+    """
+    A literal argument of a command, e.g., an option keyword like ``LIMIT``.
+
+    Tokens are bytes, so they are sent as they are. They also carry their
+    serialized RESP bulk string, which the pure Python packer writes out
+    without encoding them again. Use ``Token.get_token`` rather than
+    creating new instances.
+    """
+    _cache = {}
+
+    def __new__(cls, value):
+        token = super().__new__(cls, b(value))
+        token.serialized = b'$%d\r\n%s\r\n' % (len(token), token)
+        return token
+
+    @classmethod
+    def get_token(cls, value):
+        'Gets a cached token object or creates a new one if not already cached'
+        try:
+            return cls._cache[value]
+        except KeyError:
+            token = cls._cache[value] = cls(value)
+            return token
+
+
+# number of command names whose serialized words are kept by command_header()
+COMMAND_HEADER_CACHE_SIZE = 1024
+_command_words = {}
+
+
+def command_header(command, nargs):
+    """
+    Returns the serialized ``*<argc>\\r\\n$<len>\\r\\n<command>\\r\\n`` header of
+    a command called with ``nargs`` arguments.
+
+    The command name might include literal arguments, e.g., 'CONFIG GET'.
+    The Redis server expects these arguments to be sent separately, so they
+    are split off and serialized as arguments of their own.
+    """
+    # only the words of the command are cached, as variadic commands are
+    # called with any number of arguments
+    cached = _command_words.get(command)
+    if cached is None:
+        if ' ' in command:
+            words = [b(word) for word in command.split()]
+        else:
+            words = [b(command)]
+        cached = (len(words), b''.join(
+            b'$%d\r\n%s\r\n' % (len(word), word) for word in words))
+        if len(_command_words) < COMMAND_HEADER_CACHE_SIZE:
+            _command_words[command] = cached
+    count, serialized = cached
+    return b'*%d\r\n' % (count + nargs) + serialized
+
+
 class dummy:
     """
     Instances of this class can be used as an attribute container.
@@ -133,8 +191,7 @@ def clusterdown_wrapper(func):
 
     If the cluster reports it is down it is assumed that:
      - connection_pool was disconnected
-     - connection_pool was reset
-     - cluster_down set to True, which will trigger node_manager rebuild
+     - connection_pool was reset, which will trigger node_manager rebuild
 
     It will try 3 times to rerun the command and raises ClusterDownException if it continues to fail.
     """
@@ -212,6 +269,18 @@ if not _C_EXTENSION_SPEEDUP:
     hash_slot = _hash_slot
 
 
+def _hash_slots(keys):
+    # the keys are encoded like NodeManager.encode() does
+    return array('H', [
+        hash_slot(key if isinstance(key, bytes) else
+                  (repr(key) if isinstance(key, float) else str(key)).encode())
+        for key in keys])
+
+
+if not _C_EXTENSION_SPEEDUP:
+    hash_slots = _hash_slots
+
+
 class NodeFlag:
     BLOCKED = 'blocked'
     ALL_NODES = 'all-nodes'